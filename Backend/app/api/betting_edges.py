@@ -1,15 +1,41 @@
 """
 Betting edges REST endpoint.
-Populated in Phase 3+ (Backend Core – Stats API).
+GET /api/betting-edges/{tournament_id}  – model vs. sportsbook edges per golfer/book/market
+
+Each row pairs a projected probability with a sportsbook price: implied,
+no-vig and cross-book consensus probabilities, edge (model minus implied)
+and expected value per unit staked, sorted by edge. ``min_edge``, ``books``,
+``markets`` and ``top`` filter the cached, vectorized edge board; 503 when
+the Stats API cannot supply projections or odds.
 """
 
-from fastapi import APIRouter
+import logging
+from typing import List, Optional
+
+from fastapi import APIRouter, HTTPException, Query, status
+
+from app.services.betting_edge_engine import get_edge_board
+
+logger = logging.getLogger("caddystats.betting_edges")
 
 router = APIRouter(prefix="/betting-edges", tags=["betting-edges"])
 
 
 @router.get("/{tournament_id}")
-async def get_betting_edges(tournament_id: str) -> dict:
-    """Return betting edge data for the given tournament."""
-    # TODO: delegate to stat_service
-    return {"tournament_id": tournament_id, "data": []}
+async def get_betting_edges(
+    tournament_id: str,
+    min_edge: Optional[float] = Query(default=None, description="Minimum edge (probability points)"),
+    books: Optional[List[str]] = Query(default=None),
+    markets: Optional[List[str]] = Query(default=None),
+    top: Optional[int] = Query(default=None, ge=1, le=1000),
+) -> dict:
+    """Return the tournament's edge rows, largest edge first."""
+    try:
+        board = await get_edge_board(tournament_id)
+    except Exception:
+        logger.warning("Betting edges unavailable for tournament %s", tournament_id)
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Stats API unavailable")
+    return {
+        "tournament_id": tournament_id,
+        "data": board.query(min_edge=min_edge, books=books, markets=markets, top=top),
+    }
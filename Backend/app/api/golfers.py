@@ -0,0 +1,32 @@
+"""
+Golfer directory REST endpoint.
+GET /api/golfers/search  – name (prefix / fuzzy), country and OWGR range lookup
+"""
+
+import logging
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Query, status
+
+from app.services.golfer_directory import directory
+
+logger = logging.getLogger("caddystats.golfer_directory")
+
+router = APIRouter(prefix="/golfers", tags=["golfers"])
+
+
+@router.get("/search")
+async def search_golfers(
+    q: Optional[str] = Query(default=None, max_length=100, description="Partial or misspelt name"),
+    country: Optional[str] = Query(default=None),
+    owgr_min: Optional[int] = Query(default=None, ge=1),
+    owgr_max: Optional[int] = Query(default=None, ge=1),
+    limit: int = Query(default=20, ge=1, le=200),
+) -> dict:
+    """Search the in-memory golfer index; no upstream call per keystroke."""
+    try:
+        results = await directory.search(q, country=country, owgr_min=owgr_min, owgr_max=owgr_max, limit=limit)
+    except Exception:
+        logger.warning("Golfer directory unavailable")
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Golfer directory unavailable")
+    return {"data": results}
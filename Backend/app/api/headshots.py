@@ -0,0 +1,43 @@
+"""
+Player headshot proxy.
+GET /api/headshots/{golfer_id}?w=  – cached (optionally resized) headshot with ETag and long-lived caching
+"""
+
+import logging
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Query, Request, Response, status
+
+from app.core.config import settings
+from app.services.headshot_cache import HeadshotNotFound, headshots
+
+logger = logging.getLogger("caddystats.headshots")
+
+router = APIRouter(prefix="/headshots", tags=["headshots"])
+
+
+def _cache_headers(etag: str) -> dict:
+    return {"ETag": etag, "Cache-Control": f"public, max-age={settings.headshot_max_age}, immutable"}
+
+
+@router.get("/{golfer_id}")
+async def get_headshot(
+    golfer_id: str,
+    request: Request,
+    w: Optional[int] = Query(default=None, ge=1, le=2048, description="Width in px; snaps to a cached size"),
+) -> Response:
+    """Serve a player's headshot from the on-disk cache, fetching it upstream once."""
+    if_none_match = request.headers.get("if-none-match")
+    try:
+        if if_none_match and if_none_match == headshots.etag(golfer_id, w):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=_cache_headers(if_none_match))
+        headshot = await headshots.get(golfer_id, w)
+    except HeadshotNotFound:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Headshot not found")
+    except Exception as exc:
+        logger.warning("Headshot fetch failed for %s: %s: %s", golfer_id, type(exc).__name__, exc)
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Headshot unavailable")
+    headers = _cache_headers(headshot.etag)
+    if if_none_match == headshot.etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=headshot.body, media_type=headshot.content_type, headers=headers)
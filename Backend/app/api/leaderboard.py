@@ -0,0 +1,116 @@
+"""
+Leaderboard REST endpoints for polling clients.
+GET /api/leaderboard/{tournament_id}/delta            – changes since the client's ETag
+GET /api/leaderboard/{tournament_id}/history          – archived board at a point in time
+GET /api/leaderboard/{tournament_id}/history/changes  – NDJSON stream of changes in a window
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+from dataclasses import asdict
+from datetime import datetime, timezone
+from typing import List, Optional
+
+from fastapi import APIRouter, Header, HTTPException, Query, status
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+
+from app.services import stat_service
+from app.services.leaderboard_archive import archive
+
+logger = logging.getLogger("caddystats.leaderboard")
+
+router = APIRouter(prefix="/leaderboard", tags=["leaderboard"])
+
+
+def _quote(etag: str) -> str:
+    return f'"{etag}"'
+
+
+def parse_etags(header: Optional[str]) -> List[str]:
+    """Opaque tags of an If-None-Match header; weak validators match like strong ones."""
+    tags = []
+    for part in (header or "").split(","):
+        tag = part.strip()
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        tag = tag.strip('"')
+        if tag:
+            tags.append(tag)
+    return tags
+
+
+def _epoch(value: datetime) -> float:
+    # Naive timestamps are taken as UTC
+    return (value if value.tzinfo else value.replace(tzinfo=timezone.utc)).timestamp()
+
+
+@router.get("/{tournament_id}/delta")
+async def get_leaderboard_delta(
+    tournament_id: str,
+    since: Optional[str] = Query(default=None, description="ETag of the last version seen"),
+    if_none_match: Optional[str] = Header(default=None),
+):
+    """
+    Return row-level leaderboard changes since *since* (or If-None-Match).
+
+    Responds 304 when the client is current, otherwise a compact list of
+    changed rows and removed players (or the full board when the client's
+    version is unknown).
+    """
+    try:
+        delta = await stat_service.get_leaderboard_delta(tournament_id, since or parse_etags(if_none_match))
+    except Exception:
+        logger.warning("Leaderboard unavailable for tournament %s", tournament_id)
+        delta = None
+    if delta is None:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Leaderboard unavailable")
+
+    headers = {"ETag": _quote(delta.etag), "Cache-Control": "no-cache"}
+    if delta.not_modified:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return JSONResponse(
+        content={
+            "tournament_id": delta.tournament_id,
+            "version": delta.version,
+            "etag": delta.etag,
+            "full": delta.full,
+            "changed": [asdict(c) for c in delta.changed],
+            "removed": delta.removed,
+        },
+        headers=headers,
+    )
+
+
+@router.get("/{tournament_id}/history")
+async def get_leaderboard_at(
+    tournament_id: str,
+    at: datetime = Query(description="Point in time (ISO 8601 or epoch seconds)"),
+) -> dict:
+    """Return the archived leaderboard as it stood at *at*."""
+    board = await archive.board_at(tournament_id, _epoch(at))
+    if board is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No archived leaderboard at that time")
+    recorded_at, rows = board
+    return {"tournament_id": tournament_id, "recorded_at": recorded_at, "data": rows}
+
+
+@router.get("/{tournament_id}/history/changes")
+async def stream_leaderboard_changes(
+    tournament_id: str,
+    start: datetime = Query(description="Window start (ISO 8601 or epoch seconds)"),
+    end: Optional[datetime] = Query(default=None, description="Window end; defaults to now"),
+):
+    """
+    Stream archived changes between *start* and *end* as NDJSON.
+
+    The first line is the full board at *start* (``"full": true``), each
+    following line one recorded change (changed rows and removed players).
+    """
+    t1 = _epoch(start)
+    t2 = _epoch(end) if end is not None else datetime.now(timezone.utc).timestamp()
+    if t2 < t1:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="end must not precede start")
+    lines = (json.dumps(change, separators=(",", ":")) + "\n" for change in archive.iter_changes(tournament_id, t1, t2))
+    return StreamingResponse(lines, media_type="application/x-ndjson")
@@ -0,0 +1,59 @@
+"""
+Odds movement REST endpoints.
+GET /api/odds/{tournament_id}/movement   – line movement since open per golfer/book/market
+GET /api/odds/{tournament_id}/sparkline  – OHLC buckets of implied probability for one line
+
+History is kept in memory per worker and is lost on restart; "open" is the
+first price this worker saw (``tracked_since``). Tournaments tracked by the
+live poller are recorded on every poll, others only when their odds are
+requested.
+"""
+
+from datetime import datetime, timezone
+from typing import Optional
+
+from fastapi import APIRouter, Query
+
+from app.services.odds_history import odds_history
+
+router = APIRouter(prefix="/odds", tags=["odds"])
+
+
+@router.get("/{tournament_id}/movement")
+async def get_line_movement(
+    tournament_id: str,
+    market: Optional[str] = Query(default=None),
+    book: Optional[str] = Query(default=None),
+    limit: Optional[int] = Query(default=None, ge=1, le=5000),
+) -> dict:
+    """Return odds and implied probability now vs. at open (first seen by this worker), largest moves first."""
+    rows = odds_history.movement(tournament_id, market=market, book=book)
+    return {
+        "tournament_id": tournament_id,
+        "tracked_since": odds_history.tracked_since(tournament_id),
+        "data": rows[:limit] if limit else rows,
+    }
+
+
+@router.get("/{tournament_id}/sparkline")
+async def get_sparkline(
+    tournament_id: str,
+    golfer_id: str = Query(alias="golferId"),
+    book: str = Query(),
+    market: str = Query(default="win"),
+    resolution: str = Query(default="5m", pattern="^(raw|5m|1h)$"),
+    since: Optional[datetime] = Query(default=None),
+) -> dict:
+    """Return precomputed OHLC buckets (or recent raw ticks) for one line."""
+    since_ts = None
+    if since is not None:
+        since_ts = (since if since.tzinfo else since.replace(tzinfo=timezone.utc)).timestamp()
+    points = odds_history.sparkline(tournament_id, golfer_id, book, market, resolution=resolution, since=since_ts)
+    return {
+        "tournament_id": tournament_id,
+        "golferId": golfer_id,
+        "book": book,
+        "market": market,
+        "resolution": resolution,
+        "data": points,
+    }
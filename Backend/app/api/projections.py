@@ -0,0 +1,64 @@
+"""
+Projections REST endpoint.
+GET /api/projections/{tournament_id}  – streamed per-golfer model projections
+"""
+
+import json
+import logging
+from typing import Iterator, List, Optional
+
+from fastapi import APIRouter, Header, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+
+from app.services import stat_service, stats_api_client
+
+logger = logging.getLogger("caddystats.projections")
+
+router = APIRouter(prefix="/projections", tags=["projections"])
+
+# Rows per streamed chunk: small enough for a fast first byte, large enough
+# to keep per-write overhead low on full fields
+_CHUNK_ROWS = 64
+
+NDJSON = "application/x-ndjson"
+
+
+def _ndjson(rows: List[dict]) -> Iterator[str]:
+    for start in range(0, len(rows), _CHUNK_ROWS):
+        yield "".join(json.dumps(r, separators=(",", ":")) + "\n" for r in rows[start:start + _CHUNK_ROWS])
+
+
+def _json_array(rows: List[dict]) -> Iterator[str]:
+    yield "["
+    for start in range(0, len(rows), _CHUNK_ROWS):
+        chunk = ",".join(json.dumps(r, separators=(",", ":")) for r in rows[start:start + _CHUNK_ROWS])
+        yield ("," if start else "") + chunk
+    yield "]"
+
+
+@router.get("/{tournament_id}")
+async def get_projections(
+    tournament_id: str,
+    fields: Optional[str] = Query(default=None, description="Comma-separated fields to return, e.g. golferId,winProb"),
+    sort: Optional[str] = Query(default=None, description="Field to sort by; prefix with '-' for descending"),
+    limit: Optional[int] = Query(default=None, ge=1, le=5000),
+    format: Optional[str] = Query(default=None, pattern="^(json|ndjson)$"),
+    accept: Optional[str] = Header(default=None),
+):
+    """
+    Stream projections for a tournament as a JSON array (default) or NDJSON.
+
+    NDJSON is selected with ``format=ndjson`` or ``Accept: application/x-ndjson``.
+    """
+    try:
+        result = await stats_api_client.fetch("projections", tournament_id)
+    except Exception:
+        logger.warning("Projections unavailable for tournament %s", tournament_id)
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Stats API unavailable")
+
+    selected = [f.strip() for f in fields.split(",") if f.strip()] if fields else None
+    rows = stat_service.select_projections(result.data, fields=selected, sort=sort, limit=limit)
+    headers = {"X-Stale": "true"} if result.stale else None
+    if format == "ndjson" or (format is None and accept and NDJSON in accept):
+        return StreamingResponse(_ndjson(rows), media_type=NDJSON, headers=headers)
+    return StreamingResponse(_json_array(rows), media_type="application/json", headers=headers)
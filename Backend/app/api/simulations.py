@@ -0,0 +1,38 @@
+"""
+Tournament simulation REST endpoint.
+GET /api/simulations/{tournament_id}  – Monte Carlo finish probabilities
+"""
+
+import logging
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Query, status
+
+from app.core.config import settings
+from app.services.tournament_simulator import get_simulation
+
+logger = logging.getLogger("caddystats.simulator")
+
+router = APIRouter(prefix="/simulations", tags=["simulations"])
+
+
+@router.get("/{tournament_id}")
+async def get_tournament_simulation(
+    tournament_id: str,
+    runs: Optional[int] = Query(default=None, ge=1, le=settings.sim_max_runs),
+    seed: int = Query(default=0, ge=0),
+    distribution: bool = Query(default=False, description="Include finish-position distributions"),
+) -> dict:
+    """Simulate the tournament from its current projections."""
+    try:
+        result = await get_simulation(tournament_id, runs=runs, seed=seed)
+    except Exception:
+        logger.warning("Simulation unavailable for tournament %s", tournament_id)
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Stats API unavailable")
+    return {
+        "tournament_id": tournament_id,
+        "version": result.version,
+        "runs": result.runs,
+        "seed": result.seed,
+        "data": result.rows(include_distribution=distribution),
+    }
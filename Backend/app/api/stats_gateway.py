@@ -0,0 +1,41 @@
+"""
+Stats API gateway diagnostics.
+GET /api/stats-gateway/metrics  – pool, cache, coalescing, revalidation, breaker and headshot cache statistics
+GET /api/stats-gateway/live     – live-tournament poller freshness and directory index age
+"""
+
+from fastapi import APIRouter
+
+from app.services import stats_api_client, stats_models
+from app.services.golfer_directory import directory
+from app.services.headshot_cache import headshots
+from app.services.leaderboard_archive import archive
+from app.services.leaderboard_hub import hub
+from app.services.live_poller import poller
+from app.services.odds_history import odds_history
+from app.services.stats_cache import cache
+
+router = APIRouter(prefix="/stats-gateway", tags=["stats-gateway"])
+
+
+@router.get("/metrics")
+async def get_gateway_metrics() -> dict:
+    """Return a snapshot of Stats API gateway metrics for this worker."""
+    return {
+        "pool": stats_api_client.get_pool_stats(),
+        "cache": cache.stats(),
+        "coalescing": stats_api_client.get_coalescing_stats(),
+        "conditional": stats_api_client.get_conditional_stats(),
+        "parsing": stats_models.get_parse_stats(),
+        "breakers": stats_api_client.get_breaker_stats(),
+        "subscriptions": hub.stats(),
+        "archive": archive.stats(),
+        "odds_history": odds_history.stats(),
+        "headshots": headshots.stats(),
+    }
+
+
+@router.get("/live")
+async def get_live_freshness() -> dict:
+    """Return per-tournament freshness of data kept hot by the live poller."""
+    return {**poller.freshness(), "golfer_directory": directory.stats()}
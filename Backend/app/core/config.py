@@ -1,3 +1,5 @@
+from typing import Optional
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -22,6 +24,114 @@ class Settings(BaseSettings):
     # External Stats API (no local stats DB)
     stats_api_url: str = "http://localhost:9000"
     stats_api_timeout: int = 10
+    stats_api_connect_timeout: float = 3.0
+
+    # Shared Stats API connection pool (one client per worker)
+    stats_api_max_connections: int = 100
+    stats_api_max_keepalive_connections: int = 20
+    stats_api_keepalive_expiry: float = 30.0
+    stats_api_http2: bool = False  # requires the optional 'h2' package
+    stats_api_conditional_requests: bool = True  # send If-None-Match / If-Modified-Since
+
+    # Per-endpoint read timeouts in seconds (fall back to stats_api_timeout)
+    stats_api_leaderboard_timeout: float = 5.0
+    stats_api_featured_edges_timeout: float = 5.0
+    stats_api_tournament_card_timeout: float = 10.0
+    stats_api_projections_timeout: float = 10.0
+    stats_api_odds_timeout: float = 5.0
+    stats_api_golfers_timeout: float = 10.0
+
+    # Optional Stats API batch endpoint for tournament cards, e.g.
+    # "/tournaments/cards?ids={ids}" returning {tournament_id: card}
+    stats_api_batch_cards_path: Optional[str] = None
+
+    # Stale-while-revalidate cache for Stats API responses (TTLs in seconds)
+    stats_cache_enabled: bool = True
+    stats_cache_max_entries: int = 1024
+    stats_cache_max_stale: float = 300.0
+    stats_cache_leaderboard_ttl: float = 5.0
+    stats_cache_featured_edges_ttl: float = 60.0
+    stats_cache_tournament_card_ttl: float = 300.0
+    stats_cache_projections_ttl: float = 300.0
+    stats_cache_odds_ttl: float = 30.0
+    stats_cache_golfers_ttl: float = 3600.0
+    stats_cache_backend_url: Optional[str] = None  # e.g. redis://redis:6379/0, or "local"
+
+    # Stat embed hydration in post content (resolved copies cached per post version)
+    embed_max_concurrency: int = 8
+    embed_cache_max_entries: int = 512
+    embed_cache_max_stale: float = 120.0
+    stats_cache_embeds_ttl: float = 30.0
+
+    # Per-endpoint circuit breaker for the Stats API
+    stats_breaker_failure_threshold: int = 5
+    stats_breaker_slow_call_threshold: float = 2.0  # seconds; slower calls count as failures
+    stats_breaker_reset_timeout: float = 30.0  # seconds open before a half-open probe
+
+    # Background poller for live tournaments (intervals in seconds)
+    stats_live_poller_enabled: bool = True
+    stats_live_tournaments: list[str] = []
+    stats_live_poll_min_interval: float = 5.0
+    stats_live_poll_max_interval: float = 60.0
+    stats_live_poll_backoff: float = 1.5
+    stats_live_max_age: float = 180.0  # older hot data is ignored by reads
+    stats_leaderboard_history_size: int = 20  # versions kept per tournament for deltas
+    stats_leaderboard_max_tournaments: int = 64  # boards kept in memory per worker
+
+    # Betting analytics
+    betting_vig_method: str = "multiplicative"  # multiplicative | additive | power | shin
+    betting_board_cache_max_entries: int = 64  # edge boards kept per worker
+
+    # Monte Carlo tournament simulator
+    sim_default_runs: int = 20000
+    sim_max_runs: int = 200000
+    sim_chunk_size: int = 2000  # runs per chunk; bounds peak memory
+    sim_round_sd: float = 2.8  # strokes, per round
+    sim_cut_size: int = 65  # top N and ties after 36 holes
+    sim_process_workers: int = 0  # 0 disables the process pool
+    sim_process_threshold: int = 50000  # runs at which the pool is used
+    sim_cache_max_entries: int = 64
+    sim_calibration_iterations: int = 8  # fits to winProb/top10Prob/makeCutProb; 0 disables
+    sim_calibration_runs: int = 2000  # runs per pilot simulation
+
+    # Compressed leaderboard snapshot archive (segment files + time index)
+    leaderboard_archive_enabled: bool = False
+    leaderboard_archive_path: str = "./leaderboard_archive"
+    leaderboard_archive_block_records: int = 60  # snapshots per compressed block
+    leaderboard_archive_flush_interval: float = 300.0  # seconds before a partial block is written
+    leaderboard_archive_segment_bytes: int = 8 * 1024 * 1024
+
+    # Odds movement time series (retention in seconds; hourly buckets live as long as their tournament)
+    odds_history_enabled: bool = True
+    odds_history_batch_size: int = 500  # ticks per ingested batch
+    odds_history_flush_interval: float = 5.0
+    odds_history_raw_retention: float = 21600.0
+    odds_history_5m_retention: float = 172800.0
+    odds_history_max_tournaments: int = 32  # tournaments kept in memory per worker
+
+    # Golfer directory search index (rebuilt from the Stats API golfer list)
+    golfer_directory_enabled: bool = True
+    golfer_directory_refresh_interval: float = 3600.0
+
+    # Player headshot proxy (on-disk LRU of originals and resized variants)
+    headshot_source_url: str = "http://localhost:9000/golfers/{golfer_id}/headshot"
+    headshot_cache_path: str = "./headshot_cache"
+    headshot_cache_max_bytes: int = 256 * 1024 * 1024
+    headshot_sizes: list[int] = [48, 96, 192]  # widths in px
+    headshot_fetch_timeout: float = 10.0
+    headshot_max_age: int = 2592000  # Cache-Control max-age in seconds
+
+    # GraphQL automatic persisted queries and parsed-document cache (per worker)
+    graphql_apq_enabled: bool = True
+    graphql_document_cache_size: int = 1000
+    graphql_persisted_queries_path: Optional[str] = None  # JSON manifest {sha256: query}
+    graphql_persisted_only: bool = False  # run manifest operations only (production)
+
+    # GraphQL query budgets (static cost analysis before execution)
+    graphql_max_depth: int = 12
+    graphql_max_introspection_depth: int = 20  # __schema / __type nesting; GraphiQL needs 15
+    graphql_max_cost: int = 1000
+    graphql_stats_field_cost: int = 20  # weight of each Stats API gateway field
 
     # Auth
     jwt_secret: str = "change_me"
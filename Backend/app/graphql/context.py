@@ -2,10 +2,14 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import Optional, Set, Tuple
+from typing import TYPE_CHECKING, Optional, Set, Tuple
 import base64
 
 from starlette.requests import Request
+from strawberry.fastapi import BaseContext
+
+if TYPE_CHECKING:
+    from app.graphql.loaders import ContentLoaders, StatsLoaders
 
 
 @dataclass(frozen=True)
@@ -16,9 +20,14 @@ class Viewer:
 
 
 @dataclass
-class GQLContext:
+class GQLContext(BaseContext):
+    # BaseContext lets GraphQLRouter accept it; the router fills in
+    # background_tasks/response after get_context returns
     request: Optional[Request] = None
     viewer: Optional[Viewer] = None
+    # Request-scoped DataLoaders, created lazily (see app.graphql.loaders)
+    stats_loaders: Optional["StatsLoaders"] = None
+    content_loaders: Optional["ContentLoaders"] = None
 
 
 def require_auth(ctx: GQLContext) -> Viewer:
@@ -34,13 +43,13 @@ def require_perm(ctx: GQLContext, perm: str) -> Viewer:
     return viewer
 
 
-# Cursor = base64("created_at_iso|uuid")
-def encode_cursor(created_at_iso: str, row_id: str) -> str:
-    raw = f"{created_at_iso}|{row_id}".encode("utf-8")
+# Cursor = base64("sort_value|uuid"); the sort value may itself contain "|"
+def encode_cursor(sort_value: str, row_id: str) -> str:
+    raw = f"{sort_value}|{row_id}".encode("utf-8")
     return base64.b64encode(raw).decode("utf-8")
 
 
 def decode_cursor(cursor: str) -> Tuple[str, str]:
     raw = base64.b64decode(cursor.encode("utf-8")).decode("utf-8")
-    created_at_iso, row_id = raw.split("|", 1)
-    return created_at_iso, row_id
+    sort_value, row_id = raw.rsplit("|", 1)
+    return sort_value, row_id
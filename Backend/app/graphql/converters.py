@@ -1,9 +1,19 @@
 """
 Converter helpers: SQLAlchemy ORM objects → Strawberry GraphQL types.
+
+Only columns are copied; relationships are resolved on demand through the
+request-scoped loaders in ``app.graphql.loaders``, so converters never
+touch lazy-loaded attributes. Content and product converters also accept rows loaded
+with only some columns (see ``app.graphql.planner``); deferred columns
+become ``None`` and are never resolved because they were not selected.
 """
 
 from __future__ import annotations
 
+from typing import Any, Callable
+
+from sqlalchemy import inspect as sa_inspect
+
 from app.graphql.types import (
     AuthPayload,
     Block as GqlBlock,
@@ -27,6 +37,12 @@ from app.graphql.types import (
 from app.models import website_content as orm
 
 
+def _loaded(obj: Any) -> Callable[[str], Any]:
+    """Column getter that returns None for deferred columns instead of loading them."""
+    unloaded = sa_inspect(obj).unloaded
+    return lambda name: None if name in unloaded else getattr(obj, name)
+
+
 def orm_permission_to_gql(p: orm.Permission) -> GqlPermission:
     return GqlPermission(
         id=p.id,
@@ -39,28 +55,17 @@ def orm_permission_to_gql(p: orm.Permission) -> GqlPermission:
 
 
 def orm_role_to_gql(r: orm.Role) -> GqlRole:
-    permissions = [
-        orm_permission_to_gql(rp.permission)
-        for rp in (r.role_permissions or [])
-        if rp.permission
-    ]
     return GqlRole(
         id=r.id,
         key=r.key,
         name=r.name,
         description=r.description,
-        permissions=permissions,
         created_at=r.created_at,
         updated_at=r.updated_at,
     )
 
 
 def orm_user_to_gql(u: orm.User) -> GqlUser:
-    roles = [
-        orm_role_to_gql(ur.role)
-        for ur in (u.user_roles or [])
-        if ur.role
-    ]
     return GqlUser(
         id=u.id,
         email=u.email,
@@ -69,7 +74,6 @@ def orm_user_to_gql(u: orm.User) -> GqlUser:
         avatar_url=u.avatar_url,
         is_active=u.is_active,
         is_verified=u.is_verified,
-        roles=roles,
         created_at=u.created_at,
         updated_at=u.updated_at,
     )
@@ -118,7 +122,7 @@ def orm_comment_to_gql(c: orm.Comment) -> GqlComment:
     return GqlComment(
         id=c.id,
         post_id=c.post_id,
-        author=orm_user_to_gql(c.author) if getattr(c, "author", None) else None,
+        author_id=c.author_id,
         body=c.body,
         status=c.status,
         is_deleted=c.is_deleted,
@@ -128,74 +132,72 @@ def orm_comment_to_gql(c: orm.Comment) -> GqlComment:
 
 
 def orm_post_to_gql(p: orm.Post) -> GqlPost:
-    tags = [orm_tag_to_gql(pt.tag) for pt in (p.post_tags or []) if pt.tag]
-    categories = [orm_category_to_gql(pc.category) for pc in (p.post_categories or []) if pc.category]
-    comments = [orm_comment_to_gql(c) for c in (p.comments or []) if not c.is_deleted]
+    col = _loaded(p)
     return GqlPost(
         id=p.id,
-        author=orm_user_to_gql(p.author),
-        seo=orm_seo_to_gql(p.seo) if p.seo else None,
-        slug=p.slug,
-        title=p.title,
-        excerpt=p.excerpt,
-        featured_image_url=p.featured_image_url,
-        status=p.status,
-        published_at=p.published_at,
-        archived_at=p.archived_at,
-        content_jsonb=p.content_jsonb,
-        tags=tags,
-        categories=categories,
-        comments=comments,
-        is_deleted=p.is_deleted,
-        created_at=p.created_at,
-        updated_at=p.updated_at,
+        author_id=col("author_id"),
+        seo_id=col("seo_id"),
+        slug=col("slug"),
+        title=col("title"),
+        excerpt=col("excerpt"),
+        featured_image_url=col("featured_image_url"),
+        status=col("status"),
+        published_at=col("published_at"),
+        archived_at=col("archived_at"),
+        content_jsonb=col("content_jsonb"),
+        is_deleted=col("is_deleted"),
+        created_at=col("created_at"),
+        updated_at=col("updated_at"),
     )
 
 
 def orm_page_to_gql(p: orm.Page) -> GqlPage:
+    col = _loaded(p)
     return GqlPage(
         id=p.id,
-        author=orm_user_to_gql(p.author),
-        seo=orm_seo_to_gql(p.seo) if p.seo else None,
-        slug=p.slug,
-        title=p.title,
-        status=p.status,
-        published_at=p.published_at,
-        archived_at=p.archived_at,
-        content_jsonb=p.content_jsonb,
-        is_deleted=p.is_deleted,
-        created_at=p.created_at,
-        updated_at=p.updated_at,
+        author_id=col("author_id"),
+        seo_id=col("seo_id"),
+        slug=col("slug"),
+        title=col("title"),
+        status=col("status"),
+        published_at=col("published_at"),
+        archived_at=col("archived_at"),
+        content_jsonb=col("content_jsonb"),
+        is_deleted=col("is_deleted"),
+        created_at=col("created_at"),
+        updated_at=col("updated_at"),
     )
 
 
 def orm_template_to_gql(t: orm.Template) -> GqlTemplate:
+    col = _loaded(t)
     return GqlTemplate(
         id=t.id,
-        author=orm_user_to_gql(t.author),
-        seo=orm_seo_to_gql(t.seo) if t.seo else None,
-        slug=t.slug,
-        name=t.name,
-        description=t.description,
-        status=t.status,
-        content_jsonb=t.content_jsonb,
-        created_at=t.created_at,
-        updated_at=t.updated_at,
+        author_id=col("author_id"),
+        seo_id=col("seo_id"),
+        slug=col("slug"),
+        name=col("name"),
+        description=col("description"),
+        status=col("status"),
+        content_jsonb=col("content_jsonb"),
+        created_at=col("created_at"),
+        updated_at=col("updated_at"),
     )
 
 
 def orm_product_to_gql(p: orm.Product) -> GqlProduct:
+    col = _loaded(p)
     return GqlProduct(
         id=p.id,
-        slug=p.slug,
-        name=p.name,
-        description=p.description,
-        product_type=p.product_type,
-        price_cents=p.price_cents,
-        currency=p.currency,
-        status=p.status,
-        created_at=p.created_at,
-        updated_at=p.updated_at,
+        slug=col("slug"),
+        name=col("name"),
+        description=col("description"),
+        product_type=col("product_type"),
+        price_cents=col("price_cents"),
+        currency=col("currency"),
+        status=col("status"),
+        created_at=col("created_at"),
+        updated_at=col("updated_at"),
     )
 
 
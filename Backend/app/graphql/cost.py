@@ -0,0 +1,209 @@
+"""
+Static query cost and depth analysis.
+
+Before an operation executes its selection set is walked against the
+schema and scored: scalar fields are free and every object field costs 1,
+unless the field is weighted (``_FIELD_COSTS``, or
+``graphql_stats_field_cost`` for Stats API gateway fields, scalars such as
+``Post.resolvedContent`` included), and the selections under a list are
+multiplied by the number of items it can return: the ``first`` argument
+(clamped like the resolvers clamp it) for paginated fields, otherwise
+``DEFAULT_LIST_SIZE``.
+
+Operations deeper than ``graphql_max_depth`` or costlier than
+``graphql_max_cost`` are rejected without running a resolver. The score is
+reported in every response under ``extensions.cost``.
+
+Introspection fields cost nothing, but ``__schema`` / ``__type`` selections
+are walked like any other and their nesting is held to
+``graphql_max_introspection_depth`` (the standard introspection query used
+by GraphiQL and codegen is 15 levels deep, beyond ``graphql_max_depth``).
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, Iterator, Optional
+
+from graphql import (
+    DocumentNode,
+    FieldNode,
+    FragmentDefinitionNode,
+    FragmentSpreadNode,
+    GraphQLError,
+    GraphQLList,
+    GraphQLNamedType,
+    GraphQLSchema,
+    OperationDefinitionNode,
+    SelectionSetNode,
+    SchemaMetaFieldDef,
+    TypeMetaFieldDef,
+    get_named_type,
+    get_nullable_type,
+    is_composite_type,
+)
+from graphql.execution.values import get_argument_values
+from strawberry.extensions import SchemaExtension
+
+from app.core.config import settings
+from app.graphql.pagination import MAX_PAGE_SIZE
+
+# Assumed length of lists without a ``first`` argument (tags, comments, roles, ...)
+DEFAULT_LIST_SIZE = 10
+
+# Fields served by the Stats API gateway; they cost graphql_stats_field_cost
+_STATS_FIELDS = frozenset({
+    "Query.leaderboard",
+    "Query.leaderboardDelta",
+    "Query.featuredEdges",
+    "Query.tournamentCard",
+    "Post.resolvedContent",  # hydrates stat embeds
+})
+
+# Other weighted fields; unlisted composite fields cost 1, unlisted scalars 0
+_FIELD_COSTS: Dict[str, int] = {
+    "Query.searchPosts": 5,
+    "Query.searchProducts": 5,
+}
+
+# Introspection entry points, which are not among the root type's fields
+_META_FIELDS = {"__schema": SchemaMetaFieldDef, "__type": TypeMetaFieldDef}
+
+
+@dataclass
+class Cost:
+    cost: int = 0
+    depth: int = 0
+    introspection_depth: int = 0
+
+
+class CostAnalyzer:
+    """Scores one operation of a validated document."""
+
+    def __init__(self, schema: GraphQLSchema, stats_field_cost: int) -> None:
+        self.schema = schema
+        self.stats_field_cost = stats_field_cost
+
+    def analyze(
+        self,
+        document: DocumentNode,
+        operation_name: Optional[str] = None,
+        variables: Optional[dict] = None,
+    ) -> Cost:
+        operation = _operation(document, operation_name)
+        root = self.schema.get_root_type(operation.operation) if operation else None
+        if root is None:
+            return Cost()
+        self._fragments = {d.name.value: d for d in document.definitions if isinstance(d, FragmentDefinitionNode)}
+        self._variables = variables or {}
+        return self._selection_set(operation.selection_set, root)
+
+    def _fields(self, selection_set: SelectionSetNode, parent: GraphQLNamedType) -> Iterator:
+        """(field node, parent type) pairs with fragments flattened (validation rules out cycles)."""
+        for selection in selection_set.selections:
+            if isinstance(selection, FieldNode):
+                yield selection, parent
+                continue
+            if isinstance(selection, FragmentSpreadNode):
+                fragment = self._fragments.get(selection.name.value)
+                if fragment is None:
+                    continue
+            else:
+                fragment = selection
+            condition = fragment.type_condition
+            inner = self.schema.get_type(condition.name.value) if condition else parent
+            yield from self._fields(fragment.selection_set, inner)
+
+    def _selection_set(self, selection_set: SelectionSetNode, parent: GraphQLNamedType) -> Cost:
+        total = Cost()
+        for node, parent_type in self._fields(selection_set, parent):
+            name = node.name.value
+            field = _META_FIELDS.get(name) or getattr(parent_type, "fields", {}).get(name)
+            if field is None:
+                if name == "__typename":
+                    total.depth = max(total.depth, 1)
+                continue
+            return_type = get_named_type(field.type)
+            if not is_composite_type(return_type) or node.selection_set is None:
+                total.cost += self._weight(parent_type.name, name, default=0)
+                total.depth = max(total.depth, 1)
+                continue
+            children = self._selection_set(node.selection_set, return_type)
+            cost = self._weight(parent_type.name, name) + self._multiplier(parent_type, field, node) * children.cost
+            total.cost += cost
+            total.introspection_depth = max(total.introspection_depth, children.introspection_depth)
+            if name in _META_FIELDS:
+                total.introspection_depth = max(total.introspection_depth, children.depth + 1)
+            else:
+                total.depth = max(total.depth, children.depth + 1)
+        return total
+
+    def _weight(self, type_name: str, field_name: str, default: int = 1) -> int:
+        if type_name.startswith("__") or field_name.startswith("__"):
+            return 0  # introspection is free, but still counts towards depth
+        key = f"{type_name}.{field_name}"
+        return self.stats_field_cost if key in _STATS_FIELDS else _FIELD_COSTS.get(key, default)
+
+    def _multiplier(self, parent: GraphQLNamedType, field, node: FieldNode) -> int:
+        if "first" in field.args:
+            try:
+                first = get_argument_values(field, node, self._variables).get("first")
+            except GraphQLError:
+                first = None
+            return max(1, min(first, MAX_PAGE_SIZE)) if isinstance(first, int) else MAX_PAGE_SIZE
+        if isinstance(get_nullable_type(field.type), GraphQLList):
+            # Connection edges are already counted by the parent's ``first``
+            return 1 if parent.name.endswith("Connection") else DEFAULT_LIST_SIZE
+        return 1
+
+
+def _operation(document: DocumentNode, name: Optional[str]) -> Optional[OperationDefinitionNode]:
+    operations = [d for d in document.definitions if isinstance(d, OperationDefinitionNode)]
+    if name is None:
+        return operations[0] if len(operations) == 1 else None
+    return next((op for op in operations if op.name and op.name.value == name), None)
+
+
+class QueryCost(SchemaExtension):
+    """Reject operations over the depth or cost budget before they execute."""
+
+    def __init__(
+        self,
+        max_depth: Optional[int] = None,
+        max_cost: Optional[int] = None,
+        stats_field_cost: Optional[int] = None,
+        max_introspection_depth: Optional[int] = None,
+    ) -> None:
+        self.max_depth = max_depth if max_depth is not None else settings.graphql_max_depth
+        self.max_introspection_depth = (
+            max_introspection_depth if max_introspection_depth is not None else settings.graphql_max_introspection_depth
+        )
+        self.max_cost = max_cost if max_cost is not None else settings.graphql_max_cost
+        self.stats_field_cost = stats_field_cost if stats_field_cost is not None else settings.graphql_stats_field_cost
+
+    def on_execute(self) -> Iterator[None]:
+        ctx = self.execution_context
+        analyzer = CostAnalyzer(ctx.schema._schema, self.stats_field_cost)
+        cost = analyzer.analyze(ctx.graphql_document, ctx.operation_name, ctx.variables)
+        ctx.extensions_results["cost"] = {
+            "requestedQueryCost": cost.cost,
+            "maximumAvailable": self.max_cost,
+            "depth": cost.depth,
+            "maximumDepth": self.max_depth,
+        }
+        if cost.depth > self.max_depth:
+            raise GraphQLError(
+                f"Query depth {cost.depth} exceeds the maximum of {self.max_depth}",
+                extensions={"code": "QUERY_TOO_DEEP"},
+            )
+        if cost.introspection_depth > self.max_introspection_depth:
+            raise GraphQLError(
+                f"Introspection depth {cost.introspection_depth} exceeds the maximum of {self.max_introspection_depth}",
+                extensions={"code": "QUERY_TOO_DEEP"},
+            )
+        if cost.cost > self.max_cost:
+            raise GraphQLError(
+                f"Query cost {cost.cost} exceeds the maximum of {self.max_cost}",
+                extensions={"code": "QUERY_TOO_EXPENSIVE"},
+            )
+        yield
@@ -0,0 +1,187 @@
+"""
+Request-scoped DataLoaders.
+
+Loaders live on the GraphQL context for the duration of one operation, so
+identical keys are loaded once and loads issued in the same tick are
+gathered into a single batch.
+
+Content relationships (authors, roles and permissions, SEO, tags,
+categories, comments) are loaded with one ``IN (...)`` query per
+relationship per batch, on a short-lived session in a worker thread, instead
+of being joined into the parent query.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import uuid
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence, Union
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from strawberry.dataloader import DataLoader
+from strawberry.types import Info
+
+from app.db.session import SessionLocal
+from app.graphql import converters
+from app.graphql.types import SEO, Category, Comment, Permission, Role, Tag, User
+from app.models import website_content as orm
+from app.services import stats_api_client
+from app.services.stats_api_client import StatsResult
+
+
+def _stats_batch(endpoint: str):
+    async def load(tournament_ids: List[str]) -> List[Union[StatsResult, BaseException]]:
+        return await stats_api_client.fetch_many(endpoint, tournament_ids)
+    return load
+
+
+@dataclass
+class StatsLoaders:
+    """Stats API loaders keyed by tournament id; values are StatsResult."""
+
+    tournament_card: DataLoader[str, StatsResult]
+    leaderboard: DataLoader[str, StatsResult]
+    featured_edges: DataLoader[str, StatsResult]
+
+
+def make_stats_loaders() -> StatsLoaders:
+    return StatsLoaders(
+        tournament_card=DataLoader(load_fn=_stats_batch("tournament_card")),
+        leaderboard=DataLoader(load_fn=_stats_batch("leaderboard")),
+        featured_edges=DataLoader(load_fn=_stats_batch("featured_edges")),
+    )
+
+
+def get_stats_loaders(info: Info) -> StatsLoaders:
+    """Return the operation's Stats loaders, creating them on first use."""
+    ctx = info.context
+    if ctx is None:
+        return make_stats_loaders()
+    if ctx.stats_loaders is None:
+        ctx.stats_loaders = make_stats_loaders()
+    return ctx.stats_loaders
+
+
+# ---------------------------------------------------------------------------
+# Content relationships
+# ---------------------------------------------------------------------------
+
+
+def _batch(query: Callable[[Session, List[Any]], List[Any]]):
+    """Run a sync batch query on its own session, off the event loop."""
+
+    def run(keys: List[Any]) -> List[Any]:
+        db = SessionLocal()
+        try:
+            return query(db, keys)
+        finally:
+            db.close()
+
+    async def load(keys: List[Any]) -> List[Any]:
+        return await asyncio.to_thread(run, list(keys))
+
+    return load
+
+
+def _by_key(keys: Sequence[Any], pairs) -> List[list]:
+    grouped: Dict[Any, list] = defaultdict(list)
+    for key, value in pairs:
+        grouped[key].append(value)
+    return [grouped.get(key, []) for key in keys]
+
+
+def _load_users(db: Session, ids: List[uuid.UUID]) -> List[Optional[User]]:
+    rows = {u.id: u for u in db.scalars(select(orm.User).where(orm.User.id.in_(ids)))}
+    return [converters.orm_user_to_gql(rows[i]) if i in rows else None for i in ids]
+
+
+def _load_user_roles(db: Session, user_ids: List[uuid.UUID]) -> List[List[Role]]:
+    stmt = (
+        select(orm.UserRole.user_id, orm.Role)
+        .join(orm.Role, orm.Role.id == orm.UserRole.role_id)
+        .where(orm.UserRole.user_id.in_(user_ids))
+        .order_by(orm.Role.key)
+    )
+    return _by_key(user_ids, ((uid, converters.orm_role_to_gql(r)) for uid, r in db.execute(stmt)))
+
+
+def _load_role_permissions(db: Session, role_ids: List[uuid.UUID]) -> List[List[Permission]]:
+    stmt = (
+        select(orm.RolePermission.role_id, orm.Permission)
+        .join(orm.Permission, orm.Permission.id == orm.RolePermission.permission_id)
+        .where(orm.RolePermission.role_id.in_(role_ids))
+        .order_by(orm.Permission.key)
+    )
+    return _by_key(role_ids, ((rid, converters.orm_permission_to_gql(p)) for rid, p in db.execute(stmt)))
+
+
+def _load_seo(db: Session, ids: List[uuid.UUID]) -> List[Optional[SEO]]:
+    rows = {s.id: s for s in db.scalars(select(orm.SEO).where(orm.SEO.id.in_(ids)))}
+    return [converters.orm_seo_to_gql(rows[i]) if i in rows else None for i in ids]
+
+
+def _load_post_tags(db: Session, post_ids: List[uuid.UUID]) -> List[List[Tag]]:
+    stmt = (
+        select(orm.PostTag.post_id, orm.Tag)
+        .join(orm.Tag, orm.Tag.id == orm.PostTag.tag_id)
+        .where(orm.PostTag.post_id.in_(post_ids))
+        .order_by(orm.Tag.name)
+    )
+    return _by_key(post_ids, ((pid, converters.orm_tag_to_gql(t)) for pid, t in db.execute(stmt)))
+
+
+def _load_post_categories(db: Session, post_ids: List[uuid.UUID]) -> List[List[Category]]:
+    stmt = (
+        select(orm.PostCategory.post_id, orm.Category)
+        .join(orm.Category, orm.Category.id == orm.PostCategory.category_id)
+        .where(orm.PostCategory.post_id.in_(post_ids))
+        .order_by(orm.Category.name)
+    )
+    return _by_key(post_ids, ((pid, converters.orm_category_to_gql(c)) for pid, c in db.execute(stmt)))
+
+
+def _load_post_comments(db: Session, post_ids: List[uuid.UUID]) -> List[List[Comment]]:
+    stmt = (
+        select(orm.Comment)
+        .where(orm.Comment.post_id.in_(post_ids), orm.Comment.is_deleted == False)
+        .order_by(orm.Comment.created_at)
+    )
+    return _by_key(post_ids, ((c.post_id, converters.orm_comment_to_gql(c)) for c in db.scalars(stmt)))
+
+
+@dataclass
+class ContentLoaders:
+    """Content relationship loaders; list loaders are keyed by the parent id."""
+
+    users: DataLoader[uuid.UUID, Optional[User]]
+    user_roles: DataLoader[uuid.UUID, List[Role]]
+    role_permissions: DataLoader[uuid.UUID, List[Permission]]
+    seo: DataLoader[uuid.UUID, Optional[SEO]]
+    post_tags: DataLoader[uuid.UUID, List[Tag]]
+    post_categories: DataLoader[uuid.UUID, List[Category]]
+    post_comments: DataLoader[uuid.UUID, List[Comment]]
+
+
+def make_content_loaders() -> ContentLoaders:
+    return ContentLoaders(
+        users=DataLoader(load_fn=_batch(_load_users)),
+        user_roles=DataLoader(load_fn=_batch(_load_user_roles)),
+        role_permissions=DataLoader(load_fn=_batch(_load_role_permissions)),
+        seo=DataLoader(load_fn=_batch(_load_seo)),
+        post_tags=DataLoader(load_fn=_batch(_load_post_tags)),
+        post_categories=DataLoader(load_fn=_batch(_load_post_categories)),
+        post_comments=DataLoader(load_fn=_batch(_load_post_comments)),
+    )
+
+
+def get_content_loaders(info: Info) -> ContentLoaders:
+    """Return the operation's content loaders, creating them on first use."""
+    ctx = info.context
+    if ctx is None:
+        return make_content_loaders()
+    if ctx.content_loaders is None:
+        ctx.content_loaders = make_content_loaders()
+    return ctx.content_loaders
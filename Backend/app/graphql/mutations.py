@@ -14,7 +14,6 @@ from typing import Optional
 
 import strawberry
 from passlib.context import CryptContext
-from sqlalchemy.orm import joinedload
 from strawberry.types import Info
 
 from app.auth.jwt_handler import (
@@ -65,7 +64,6 @@ from app.models.website_content import (
     Purchase as OrmPurchase,
     Revision as OrmRevision,
     Role,
-    RolePermission,
     Template as OrmTemplate,
     User as OrmUser,
     UserRole,
@@ -81,48 +79,10 @@ _ENTITY_POST = "post"
 _ENTITY_PAGE = "page"
 _ENTITY_TEMPLATE = "template"
 
-_USER_EAGER = [
-    joinedload(OrmUser.user_roles)
-    .joinedload(UserRole.role)
-    .joinedload(Role.role_permissions)
-    .joinedload(RolePermission.permission)
-]
-
-_POST_EAGER = [
-    joinedload(OrmPost.author)
-    .joinedload(OrmUser.user_roles)
-    .joinedload(UserRole.role)
-    .joinedload(Role.role_permissions)
-    .joinedload(RolePermission.permission),
-    joinedload(OrmPost.seo),
-    joinedload(OrmPost.post_tags).joinedload(OrmPostTag.tag),
-    joinedload(OrmPost.post_categories).joinedload(OrmPostCategory.category),
-    joinedload(OrmPost.comments),
-]
-
-_PAGE_EAGER = [
-    joinedload(OrmPage.author)
-    .joinedload(OrmUser.user_roles)
-    .joinedload(UserRole.role)
-    .joinedload(Role.role_permissions)
-    .joinedload(RolePermission.permission),
-    joinedload(OrmPage.seo),
-]
-
-_TEMPLATE_EAGER = [
-    joinedload(OrmTemplate.author)
-    .joinedload(OrmUser.user_roles)
-    .joinedload(UserRole.role)
-    .joinedload(Role.role_permissions)
-    .joinedload(RolePermission.permission),
-    joinedload(OrmTemplate.seo),
-]
-
 
 def _reload_post(db, post_id) -> OrmPost:
     return (
         db.query(OrmPost)
-        .options(*_POST_EAGER)
         .filter(OrmPost.id == post_id)
         .first()
     )
@@ -131,7 +91,6 @@ def _reload_post(db, post_id) -> OrmPost:
 def _reload_page(db, page_id) -> OrmPage:
     return (
         db.query(OrmPage)
-        .options(*_PAGE_EAGER)
         .filter(OrmPage.id == page_id)
         .first()
     )
@@ -140,7 +99,6 @@ def _reload_page(db, page_id) -> OrmPage:
 def _reload_template(db, template_id) -> OrmTemplate:
     return (
         db.query(OrmTemplate)
-        .options(*_TEMPLATE_EAGER)
         .filter(OrmTemplate.id == template_id)
         .first()
     )
@@ -195,13 +153,6 @@ class Mutation:
 
             db.commit()
             db.refresh(user)
-
-            user = (
-                db.query(OrmUser)
-                .options(*_USER_EAGER)
-                .filter(OrmUser.id == user.id)
-                .first()
-            )
             return _build_auth_payload(db, user)
         finally:
             db.close()
@@ -212,7 +163,6 @@ class Mutation:
         try:
             user = (
                 db.query(OrmUser)
-                .options(*_USER_EAGER)
                 .filter(OrmUser.email == email.lower(), OrmUser.is_deleted == False)
                 .first()
             )
@@ -236,7 +186,6 @@ class Mutation:
         try:
             user = (
                 db.query(OrmUser)
-                .options(*_USER_EAGER)
                 .filter(OrmUser.id == user_id, OrmUser.is_active == True, OrmUser.is_deleted == False)
                 .first()
             )
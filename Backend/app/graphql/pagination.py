@@ -0,0 +1,142 @@
+"""
+Keyset (cursor) pagination for list resolvers.
+
+Lists are ordered by ``(sort key, id)`` and a page after a cursor is read
+with a row comparison against the last row of the previous page, so every
+page costs the same index range scan no matter how deep it is. Matching
+composite indexes live in ``Database/migrations/0019_keyset_pagination_indexes.sql``.
+
+Cursors are ``encode_cursor('["field", value]', id)``; a cursor minted for
+one sort field is rejected for another. NULL sort values (``published_at``
+on drafts) sort last in both directions.
+
+``totalCount`` is the Postgres planner's row estimate for the filtered
+query (``EXPLAIN``), computed only when selected; no ``COUNT(*)`` is run.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import uuid
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import and_, or_, tuple_
+from sqlalchemy.orm import Query
+from strawberry.types import Info
+
+from app.db.session import SessionLocal
+from app.graphql.context import decode_cursor, encode_cursor
+from app.graphql.planner import load_only_for
+from app.graphql.types import Connection, Edge, PageInfo, SortInput
+
+logger = logging.getLogger("caddystats.pagination")
+
+MAX_PAGE_SIZE = 100
+
+
+def _dump(value: Any) -> Any:
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def _load(column, value: Any) -> Any:
+    if value is None:
+        return None
+    if column.type.python_type is datetime:
+        return datetime.fromisoformat(value)
+    return column.type.python_type(value)
+
+
+def make_cursor(field: str, value: Any, row_id: Any) -> str:
+    return encode_cursor(json.dumps([field, _dump(value)]), str(row_id))
+
+
+def read_cursor(cursor: str, field: str, column) -> Tuple[Any, uuid.UUID]:
+    """(sort value, id) from *cursor*; raises ValueError if it is malformed or for another sort."""
+    try:
+        raw, row_id = decode_cursor(cursor)
+        cursor_field, value = json.loads(raw)
+        if cursor_field != field:
+            raise ValueError(f"cursor is for sort field {cursor_field!r}")
+        return _load(column, value), uuid.UUID(row_id)
+    except ValueError:
+        raise
+    except Exception as exc:
+        raise ValueError("malformed cursor") from exc
+
+
+def _after(column, id_column, value: Any, row_id: uuid.UUID, descending: bool):
+    """Rows strictly after (value, row_id) in ``column, id`` order with NULLs last."""
+    if value is None:
+        return and_(column.is_(None), id_column < row_id if descending else id_column > row_id)
+    key, bound = tuple_(column, id_column), tuple_(value, row_id)
+    clause = key < bound if descending else key > bound
+    return or_(clause, column.is_(None)) if column.expression.nullable else clause
+
+
+def estimate_rows(query: Query) -> Optional[int]:
+    """Planner estimate of the rows *query* returns (Postgres only)."""
+    statement = query.statement
+    db = SessionLocal()
+    try:
+        bind = db.get_bind()
+        if bind.dialect.name != "postgresql":
+            return None
+        compiled = statement.compile(dialect=bind.dialect, compile_kwargs={"render_postcompile": True})
+        plan = db.connection().exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params).scalar()
+        plan = json.loads(plan) if isinstance(plan, str) else plan
+        return int(plan[0]["Plan"]["Plan Rows"])
+    except Exception as exc:
+        logger.warning("Row estimate failed: %s: %s", type(exc).__name__, exc)
+        return None
+    finally:
+        db.close()
+
+
+def paginate(
+    info: Info,
+    query: Query,
+    model,
+    sort_fields: Dict[str, str],
+    sort: Optional[SortInput],
+    first: int,
+    after: Optional[str],
+    convert: Callable[[Any], Any],
+) -> Connection:
+    """Run one keyset page of *query* and wrap it in a Connection.
+
+    *sort_fields* maps the public sort names (``CREATED_AT``, ...) to column
+    attributes of *model*; unknown names fall back to ``CREATED_AT``.
+    """
+    field = sort_fields.get((sort.field if sort else "CREATED_AT").upper(), sort_fields["CREATED_AT"])
+    descending = not (sort and sort.direction.upper() == "ASC")
+    column, id_column = getattr(model, field), model.id
+    first = max(1, min(first, MAX_PAGE_SIZE))
+
+    page = query.options(*load_only_for(info, model, "edges", "node", extra=(field,)))
+    if after:
+        try:
+            value, row_id = read_cursor(after, field, column)
+        except ValueError as exc:
+            raise Exception(f"Invalid cursor: {exc}")
+        page = page.filter(_after(column, id_column, value, row_id, descending))
+    order = column.desc() if descending else column.asc()
+    if column.expression.nullable:
+        order = order.nulls_last()  # NOT NULL keys keep a plain ORDER BY the index can serve
+    page = page.order_by(order, id_column.desc() if descending else id_column.asc())
+
+    rows: List[Any] = page.limit(first + 1).all()
+    has_next = len(rows) > first
+    rows = rows[:first]
+    edges = [Edge(cursor=make_cursor(field, getattr(r, field), r.id), node=convert(r)) for r in rows]
+    return Connection(
+        edges=edges,
+        page_info=PageInfo(
+            has_next_page=has_next,
+            has_previous_page=after is not None,
+            start_cursor=edges[0].cursor if edges else None,
+            end_cursor=edges[-1].cursor if edges else None,
+        ),
+        estimate=lambda: estimate_rows(query),
+    )
@@ -0,0 +1,214 @@
+"""
+Automatic persisted queries and a parsed-document cache.
+
+Clients send ``extensions.persistedQuery = {"version": 1, "sha256Hash": ...}``
+instead of the query text. On a miss the server answers
+``PersistedQueryNotFound`` and the client retries once with both the hash
+and the text, which registers it. Any operation (persisted or not) is keyed
+by the SHA-256 of its text, and the parsed and validated document is kept in
+a per-worker LRU of ``graphql_document_cache_size`` entries, so hot
+operations skip parsing and validation entirely.
+
+With ``graphql_persisted_only`` the server only runs operations listed in the
+``graphql_persisted_queries_path`` manifest (a JSON object of
+``{sha256: query}`` or a list of query strings); clients cannot register new
+ones. Manifest queries never expire, only their parsed documents do.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+from collections import OrderedDict
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from graphql import DocumentNode, GraphQLError, parse
+from strawberry.extensions import SchemaExtension
+from strawberry.schema.schema import validate_document
+
+from app.core.config import settings
+
+logger = logging.getLogger("caddystats.persisted_queries")
+
+APQ_VERSION = 1
+
+
+def query_hash(query: str) -> str:
+    return hashlib.sha256(query.encode("utf-8")).hexdigest()
+
+
+def _error(message: str, code: str) -> GraphQLError:
+    return GraphQLError(message, extensions={"code": code})
+
+
+class DocumentCache:
+    """Registered query texts plus an LRU of their parsed, validated documents."""
+
+    def __init__(
+        self,
+        max_entries: int,
+        apq_enabled: bool = True,
+        persisted_only: bool = False,
+        manifest_path: Optional[str] = None,
+    ) -> None:
+        self.max_entries = max_entries
+        self.apq_enabled = apq_enabled
+        self.persisted_only = persisted_only
+        self.manifest_path = manifest_path
+        self._manifest: Optional[Dict[str, str]] = None
+        self._queries: "OrderedDict[str, str]" = OrderedDict()  # client-registered texts
+        self._documents: "OrderedDict[str, DocumentNode]" = OrderedDict()
+        self._counters: Dict[str, int] = {"hits": 0, "misses": 0, "registered": 0, "not_found": 0, "rejected": 0}
+
+    # -- manifest ------------------------------------------------------------
+
+    @property
+    def manifest(self) -> Dict[str, str]:
+        if self._manifest is None:
+            self._manifest = self._load_manifest()
+        return self._manifest
+
+    def _load_manifest(self) -> Dict[str, str]:
+        if not self.manifest_path:
+            return {}
+        try:
+            with open(self.manifest_path, encoding="utf-8") as fh:
+                raw = json.load(fh)
+        except (OSError, ValueError) as exc:
+            logger.warning("Persisted query manifest unreadable: %s: %s", type(exc).__name__, exc)
+            return {}
+        queries = raw.values() if isinstance(raw, dict) else raw if isinstance(raw, list) else []
+        manifest = {query_hash(q): q for q in queries if isinstance(q, str)}
+        if isinstance(raw, dict):
+            for digest in set(raw) - set(manifest):
+                logger.warning("Persisted query %s does not match its text; skipped", digest)
+        logger.info("Loaded %d persisted queries", len(manifest))
+        return manifest
+
+    def load(self, queries: List[str]) -> None:
+        """Replace the manifest with *queries* (deploy scripts and tests)."""
+        self._manifest = {query_hash(q): q for q in queries}
+        self._documents.clear()
+
+    # -- lookups -------------------------------------------------------------
+
+    def resolve(self, digest: Optional[str], query: Optional[str]) -> str:
+        """Query text for a request; raises the APQ error the client should see."""
+        if digest is None:
+            digest = query_hash(query or "")
+        elif not self.apq_enabled:
+            raise _error("PersistedQueryNotSupported", "PERSISTED_QUERY_NOT_SUPPORTED")
+        elif query is not None and query_hash(query) != digest:
+            raise _error("provided sha does not match query", "BAD_REQUEST")
+
+        if self.persisted_only:
+            if digest not in self.manifest:
+                self._counters["rejected"] += 1
+                raise _error("PersistedQueryNotAllowed", "PERSISTED_QUERY_NOT_ALLOWED")
+            return self.manifest[digest]
+        if query is not None:
+            return query
+        query = self.manifest.get(digest) or self._queries.get(digest)
+        if query is None:
+            self._counters["not_found"] += 1
+            raise _error("PersistedQueryNotFound", "PERSISTED_QUERY_NOT_FOUND")
+        if digest in self._queries:
+            self._queries.move_to_end(digest)
+        return query
+
+    def register(self, digest: str, query: str) -> None:
+        if digest not in self._queries and digest not in self.manifest:
+            self._counters["registered"] += 1
+            self._queries[digest] = query
+            self._bound(self._queries)
+
+    def document(self, digest: str) -> Optional[DocumentNode]:
+        document = self._documents.get(digest)
+        if document is None:
+            self._counters["misses"] += 1
+            return None
+        self._counters["hits"] += 1
+        self._documents.move_to_end(digest)
+        return document
+
+    def store(self, digest: str, document: DocumentNode) -> None:
+        self._documents[digest] = document
+        self._bound(self._documents)
+
+    def _bound(self, entries: OrderedDict) -> None:
+        while len(entries) > self.max_entries:
+            entries.popitem(last=False)
+
+    def stats(self) -> dict:
+        return {
+            **self._counters,
+            "documents": len(self._documents),
+            "registered_queries": len(self._queries),
+            "manifest_queries": len(self.manifest),
+            "max_entries": self.max_entries,
+            "persisted_only": self.persisted_only,
+        }
+
+
+class PersistedQueries(SchemaExtension):
+    """Resolve persisted query hashes and serve cached, pre-validated documents.
+
+    Everything happens before Strawberry's own parse step: on a hit the
+    document and an empty error list are put on the execution context, which
+    makes Strawberry skip both parsing and validation.
+    """
+
+    def __init__(self, cache: Optional["DocumentCache"] = None) -> None:
+        self.cache = cache or documents
+
+    def _persisted_hash(self) -> Tuple[bool, Optional[str]]:
+        persisted = (self.execution_context.operation_extensions or {}).get("persistedQuery")
+        if persisted is None:
+            return False, None
+        if (
+            not isinstance(persisted, dict)
+            or persisted.get("version") != APQ_VERSION
+            or not isinstance(persisted.get("sha256Hash"), str)
+        ):
+            raise _error("Unsupported persisted query", "BAD_REQUEST")
+        return True, persisted["sha256Hash"].lower()
+
+    def on_operation(self) -> Iterator[None]:
+        ctx = self.execution_context
+        is_persisted, digest = self._persisted_hash()
+        if not is_persisted and not ctx.query:
+            yield  # Strawberry reports the missing query
+            return
+
+        query = self.cache.resolve(digest, ctx.query)
+        digest = digest or query_hash(query)
+        ctx.query = query
+
+        document = self.cache.document(digest)
+        if document is None:
+            try:
+                document = parse(query)
+            except GraphQLError:
+                yield  # let Strawberry parse again and report the syntax error
+                return
+            errors = validate_document(ctx.schema._schema, document, ctx.validation_rules)
+            if errors:
+                ctx.graphql_document, ctx.pre_execution_errors = document, errors
+                yield
+                return
+            self.cache.store(digest, document)
+            if is_persisted:
+                self.cache.register(digest, query)
+
+        ctx.graphql_document = document
+        ctx.pre_execution_errors = []  # already validated
+        yield
+
+
+documents = DocumentCache(
+    max_entries=settings.graphql_document_cache_size,
+    apq_enabled=settings.graphql_apq_enabled,
+    persisted_only=settings.graphql_persisted_only,
+    manifest_path=settings.graphql_persisted_queries_path,
+)
@@ -0,0 +1,69 @@
+"""
+Selection-set-aware query planning for content resolvers.
+
+Resolvers pass their ``Info`` and ORM model to :func:`load_only_for` and get
+loader options that fetch only the columns behind the selected GraphQL
+fields. Relationships are never joined here; they are resolved on demand by
+the request-scoped loaders in ``app.graphql.loaders``, so unselected
+relationships cost nothing.
+
+Unselected columns are deferred with ``raiseload`` so an accidental access
+fails loudly instead of issuing one lazy query per row; the converters skip
+deferred columns.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Iterable, List, Set, Tuple
+
+from sqlalchemy import inspect as sa_inspect
+from sqlalchemy.orm import load_only
+from strawberry.types import Info
+from strawberry.types.nodes import SelectedField
+from strawberry.utils.str_converters import to_snake_case
+
+# GraphQL field -> ORM columns it needs besides a same-named column
+_FIELD_COLUMNS: Dict[str, Tuple[str, ...]] = {
+    "author": ("author_id",),
+    "seo": ("seo_id",),
+    "resolved_content": ("content_jsonb", "updated_at"),
+}
+
+# Always loaded: loaders key relationships by the primary key
+_ALWAYS = ("id",)
+
+
+def _walk(selections: Iterable) -> Iterable:
+    """Field selections, with fragments flattened (``@skip``/``@include`` ignored)."""
+    for selection in selections:
+        if isinstance(selection, SelectedField):
+            yield selection
+        else:
+            yield from _walk(selection.selections)
+
+
+def selected_fields(info: Info, *path: str) -> Set[str]:
+    """Python names of the fields selected on the resolver's result, or at *path* below it."""
+    current = list(_walk(info.selected_fields))
+    for step in path:
+        current = [child for f in current for child in _walk(f.selections) if child.name == step]
+    fields: Set[str] = set()
+    for field in current:
+        for child in _walk(field.selections):
+            fields.add(to_snake_case(child.name))
+    return fields
+
+
+def columns_for(model, fields: Iterable[str]) -> List[str]:
+    """ORM column attributes of *model* needed to serve *fields*."""
+    available = set(sa_inspect(model).column_attrs.keys())
+    wanted = set(_ALWAYS)
+    for field in fields:
+        wanted.update(_FIELD_COLUMNS.get(field, (field,)))
+    return sorted(wanted & available)
+
+
+def load_only_for(info: Info, model, *path: str, extra: Iterable[str] = ()) -> list:
+    """Loader options that fetch only the selected columns of *model* (plus *extra*)."""
+    columns = columns_for(model, selected_fields(info, *path) | set(extra))
+    return [load_only(*(getattr(model, c) for c in columns), raiseload=True)]
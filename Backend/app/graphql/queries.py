@@ -12,11 +12,15 @@ import uuid
 from typing import List, Optional
 
 import strawberry
+from sqlalchemy import select
 from sqlalchemy.orm import joinedload
 from strawberry.types import Info
 
 from app.db.session import SessionLocal
 from app.graphql.context import GQLContext, require_perm
+from app.graphql.loaders import get_stats_loaders
+from app.graphql.pagination import paginate
+from app.graphql.planner import load_only_for
 from app.graphql.converters import (
     orm_nav_menu_to_gql,
     orm_page_to_gql,
@@ -27,8 +31,10 @@ from app.graphql.converters import (
 )
 from app.graphql.types import (
     Category,
+    Connection,
     Event,
     FeaturedEdge,
+    LeaderboardDelta,
     LeaderboardEntry,
     MediaAsset,
     NavMenu,
@@ -50,44 +56,23 @@ from app.models.website_content import (
     PostCategory as OrmPostCategory,
     PostTag as OrmPostTag,
     Product as OrmProduct,
-    Role,
-    RolePermission,
     Template as OrmTemplate,
     User as OrmUser,
-    UserRole,
 )
+from app.services import stats_models
 
 logger = logging.getLogger("caddystats.queries")
 
-_POST_EAGER = [
-    joinedload(OrmPost.author)
-    .joinedload(OrmUser.user_roles)
-    .joinedload(UserRole.role)
-    .joinedload(Role.role_permissions)
-    .joinedload(RolePermission.permission),
-    joinedload(OrmPost.seo),
-    joinedload(OrmPost.post_tags).joinedload(OrmPostTag.tag),
-    joinedload(OrmPost.post_categories).joinedload(OrmPostCategory.category),
-    joinedload(OrmPost.comments),
-]
-
-_PAGE_EAGER = [
-    joinedload(OrmPage.author)
-    .joinedload(OrmUser.user_roles)
-    .joinedload(UserRole.role)
-    .joinedload(Role.role_permissions)
-    .joinedload(RolePermission.permission),
-    joinedload(OrmPage.seo),
-]
-
-_TEMPLATE_EAGER = [
-    joinedload(OrmTemplate.author)
-    .joinedload(OrmUser.user_roles)
-    .joinedload(UserRole.role)
-    .joinedload(Role.role_permissions)
-    .joinedload(RolePermission.permission),
-    joinedload(OrmTemplate.seo),
-]
+# Public sort names -> keyset sort columns (each backed by a (column, id) index)
+_POST_SORTS = {
+    "CREATED_AT": "created_at",
+    "UPDATED_AT": "updated_at",
+    "PUBLISHED_AT": "published_at",
+    "TITLE": "title",
+}
+_PAGE_SORTS = _POST_SORTS
+_TEMPLATE_SORTS = {"CREATED_AT": "created_at", "UPDATED_AT": "updated_at", "NAME": "name"}
+_PRODUCT_SORTS = {"CREATED_AT": "created_at", "UPDATED_AT": "updated_at", "NAME": "name", "PRICE": "price_cents"}
 
 
 @strawberry.type
@@ -104,12 +89,6 @@ class Query:
         try:
             user = (
                 db.query(OrmUser)
-                .options(
-                    joinedload(OrmUser.user_roles)
-                    .joinedload(UserRole.role)
-                    .joinedload(Role.role_permissions)
-                    .joinedload(RolePermission.permission)
-                )
                 .filter(
                     OrmUser.id == info.context.viewer.user_id,
                     OrmUser.is_deleted == False,
@@ -131,12 +110,6 @@ class Query:
         try:
             rows = (
                 db.query(OrmUser)
-                .options(
-                    joinedload(OrmUser.user_roles)
-                    .joinedload(UserRole.role)
-                    .joinedload(Role.role_permissions)
-                    .joinedload(RolePermission.permission)
-                )
                 .filter(OrmUser.is_deleted == False)
                 .order_by(OrmUser.created_at.desc())
                 .all()
@@ -149,7 +122,7 @@ class Query:
     # Posts
     # ------------------------------------------------------------------
 
-    @strawberry.field(description="Paginated list of posts.")
+    @strawberry.field(description="Keyset-paginated list of posts.")
     def posts(
         self,
         info: Info,
@@ -157,46 +130,25 @@ class Query:
         sort: Optional[SortInput] = None,
         first: int = 20,
         after: Optional[str] = None,
-    ) -> List[Post]:
+    ) -> Connection[Post]:
         db = SessionLocal()
         try:
-            q = (
-                db.query(OrmPost)
-                .options(*_POST_EAGER)
-                .filter(OrmPost.is_deleted == False)
-            )
+            q = db.query(OrmPost).filter(OrmPost.is_deleted == False)
             if filter:
                 if filter.status:
                     q = q.filter(OrmPost.status == filter.status)
                 if filter.author_id:
                     q = q.filter(OrmPost.author_id == filter.author_id)
+                # Semi-joins: a post matching several tags/categories appears once
                 if filter.tag_ids:
-                    q = q.join(OrmPost.post_tags).filter(
-                        OrmPostTag.tag_id.in_(filter.tag_ids)
-                    )
+                    q = q.filter(OrmPost.id.in_(
+                        select(OrmPostTag.post_id).where(OrmPostTag.tag_id.in_(filter.tag_ids))
+                    ))
                 if filter.category_ids:
-                    q = q.join(OrmPost.post_categories).filter(
-                        OrmPostCategory.category_id.in_(filter.category_ids)
-                    )
-
-            sort_field = OrmPost.created_at
-            if sort:
-                field_map = {
-                    "CREATED_AT": OrmPost.created_at,
-                    "UPDATED_AT": OrmPost.updated_at,
-                    "PUBLISHED_AT": OrmPost.published_at,
-                    "TITLE": OrmPost.title,
-                }
-                sort_field = field_map.get(sort.field.upper(), OrmPost.created_at)
-
-            if sort and sort.direction.upper() == "ASC":
-                q = q.order_by(sort_field.asc())
-            else:
-                q = q.order_by(sort_field.desc())
-
-            first = max(1, min(first, 100))
-            rows = q.limit(first).all()
-            return [orm_post_to_gql(p) for p in rows]
+                    q = q.filter(OrmPost.id.in_(
+                        select(OrmPostCategory.post_id).where(OrmPostCategory.category_id.in_(filter.category_ids))
+                    ))
+            return paginate(info, q, OrmPost, _POST_SORTS, sort, first, after, orm_post_to_gql)
         finally:
             db.close()
 
@@ -206,7 +158,7 @@ class Query:
         try:
             p = (
                 db.query(OrmPost)
-                .options(*_POST_EAGER)
+                .options(*load_only_for(info, OrmPost))
                 .filter(OrmPost.slug == slug, OrmPost.is_deleted == False)
                 .first()
             )
@@ -227,7 +179,7 @@ class Query:
             first = max(1, min(first, 100))
             rows = (
                 db.query(OrmPost)
-                .options(*_POST_EAGER)
+                .options(*load_only_for(info, OrmPost))
                 .filter(
                     OrmPost.is_deleted == False,
                     OrmPost.search_vector.op("@@")(
@@ -248,25 +200,18 @@ class Query:
     # Pages
     # ------------------------------------------------------------------
 
-    @strawberry.field(description="Paginated list of pages.")
+    @strawberry.field(description="Keyset-paginated list of pages.")
     def pages(
         self,
         info: Info,
+        sort: Optional[SortInput] = None,
         first: int = 20,
         after: Optional[str] = None,
-    ) -> List[Page]:
+    ) -> Connection[Page]:
         db = SessionLocal()
         try:
-            first = max(1, min(first, 100))
-            rows = (
-                db.query(OrmPage)
-                .options(*_PAGE_EAGER)
-                .filter(OrmPage.is_deleted == False)
-                .order_by(OrmPage.created_at.desc())
-                .limit(first)
-                .all()
-            )
-            return [orm_page_to_gql(p) for p in rows]
+            q = db.query(OrmPage).filter(OrmPage.is_deleted == False)
+            return paginate(info, q, OrmPage, _PAGE_SORTS, sort, first, after, orm_page_to_gql)
         finally:
             db.close()
 
@@ -276,7 +221,7 @@ class Query:
         try:
             p = (
                 db.query(OrmPage)
-                .options(*_PAGE_EAGER)
+                .options(*load_only_for(info, OrmPage))
                 .filter(OrmPage.slug == slug, OrmPage.is_deleted == False)
                 .first()
             )
@@ -288,24 +233,18 @@ class Query:
     # Templates
     # ------------------------------------------------------------------
 
-    @strawberry.field(description="Paginated list of templates.")
+    @strawberry.field(description="Keyset-paginated list of templates.")
     def templates(
         self,
         info: Info,
+        sort: Optional[SortInput] = None,
         first: int = 20,
         after: Optional[str] = None,
-    ) -> List[Template]:
+    ) -> Connection[Template]:
         db = SessionLocal()
         try:
-            first = max(1, min(first, 100))
-            rows = (
-                db.query(OrmTemplate)
-                .options(*_TEMPLATE_EAGER)
-                .order_by(OrmTemplate.created_at.desc())
-                .limit(first)
-                .all()
-            )
-            return [orm_template_to_gql(t) for t in rows]
+            q = db.query(OrmTemplate)
+            return paginate(info, q, OrmTemplate, _TEMPLATE_SORTS, sort, first, after, orm_template_to_gql)
         finally:
             db.close()
 
@@ -315,7 +254,7 @@ class Query:
         try:
             t = (
                 db.query(OrmTemplate)
-                .options(*_TEMPLATE_EAGER)
+                .options(*load_only_for(info, OrmTemplate))
                 .filter(OrmTemplate.slug == slug)
                 .first()
             )
@@ -327,7 +266,7 @@ class Query:
     # Products
     # ------------------------------------------------------------------
 
-    @strawberry.field(description="Paginated list of products.")
+    @strawberry.field(description="Keyset-paginated list of products.")
     def products(
         self,
         info: Info,
@@ -335,18 +274,16 @@ class Query:
         sort: Optional[SortInput] = None,
         first: int = 20,
         after: Optional[str] = None,
-    ) -> List[Product]:
+    ) -> Connection[Product]:
         db = SessionLocal()
         try:
-            first = max(1, min(first, 100))
             q = db.query(OrmProduct)
             if filter:
                 if filter.status:
                     q = q.filter(OrmProduct.status == filter.status)
                 if filter.product_type:
                     q = q.filter(OrmProduct.product_type == filter.product_type)
-            q = q.order_by(OrmProduct.created_at.desc()).limit(first)
-            return [orm_product_to_gql(p) for p in q.all()]
+            return paginate(info, q, OrmProduct, _PRODUCT_SORTS, sort, first, after, orm_product_to_gql)
         finally:
             db.close()
 
@@ -414,20 +351,28 @@ class Query:
         info: Info,
         tournament_id: str,
     ) -> List[LeaderboardEntry]:
-        from app.services import stats_api_client
         try:
-            data = await stats_api_client.get_leaderboard(tournament_id)
-            return [
-                LeaderboardEntry(
-                    position=entry.get("position", 0),
-                    player_name=entry.get("playerName", ""),
-                    score=entry.get("score"),
-                    raw=entry,
-                )
-                for entry in (data if isinstance(data, list) else [])
-            ]
+            result = await get_stats_loaders(info).leaderboard.load(tournament_id)
         except Exception:
+            logger.warning("Leaderboard unavailable for tournament %s", tournament_id)
             return []
+        return stats_models.parse_leaderboard(tournament_id, result.data, stale=result.stale)
+
+    @strawberry.field(
+        description="Leaderboard changes since the given ETag (notModified when current)."
+    )
+    async def leaderboard_delta(
+        self,
+        info: Info,
+        tournament_id: str,
+        since: Optional[str] = None,
+    ) -> Optional[LeaderboardDelta]:
+        from app.services import stat_service
+        try:
+            return await stat_service.get_leaderboard_delta(tournament_id, since)
+        except Exception:
+            logger.warning("Leaderboard delta unavailable for tournament %s", tournament_id)
+            return None
 
     @strawberry.field(description="Featured player edges for a tournament (proxied from Stats API).")
     async def featured_edges(
@@ -435,15 +380,12 @@ class Query:
         info: Info,
         tournament_id: str,
     ) -> List[FeaturedEdge]:
-        from app.services import stats_api_client
         try:
-            data = await stats_api_client.get_featured_edges(tournament_id)
-            return [
-                FeaturedEdge(player_name=e.get("playerName", ""), raw=e)
-                for e in (data if isinstance(data, list) else [])
-            ]
+            result = await get_stats_loaders(info).featured_edges.load(tournament_id)
         except Exception:
+            logger.warning("Featured edges unavailable for tournament %s", tournament_id)
             return []
+        return stats_models.parse_featured_edges(tournament_id, result.data, stale=result.stale)
 
     @strawberry.field(description="Summary card for a tournament (proxied from Stats API).")
     async def tournament_card(
@@ -451,14 +393,9 @@ class Query:
         info: Info,
         tournament_id: str,
     ) -> Optional[TournamentCard]:
-        from app.services import stats_api_client
         try:
-            data = await stats_api_client.get_tournament_card(tournament_id)
-            return TournamentCard(
-                tournament_id=tournament_id,
-                name=data.get("name") if isinstance(data, dict) else None,
-                raw=data,
-            )
+            result = await get_stats_loaders(info).tournament_card.load(tournament_id)
         except Exception:
+            logger.warning("Tournament card unavailable for tournament %s", tournament_id)
             return None
-
+        return stats_models.parse_tournament_card(tournament_id, result.data, stale=result.stale)
@@ -2,8 +2,13 @@
 import strawberry
 from app.graphql.queries import Query
 from app.graphql.mutations import Mutation
+from app.graphql.subscriptions import Subscription
+from app.graphql.cost import QueryCost
+from app.graphql.persisted_queries import PersistedQueries
 
 schema = strawberry.Schema(
     query=Query,
     mutation=Mutation,
+    subscription=Subscription,
+    extensions=[PersistedQueries(), QueryCost()],
 )
@@ -0,0 +1,54 @@
+"""
+GraphQL Subscription resolvers.
+
+Live leaderboard updates are streamed over websockets as row-level diffs.
+Diffs are computed once per leaderboard change by the hub and the same
+update object is yielded to every subscriber.
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import AsyncGenerator
+
+import strawberry
+from strawberry.types import Info
+
+from app.graphql.types import LeaderboardUpdate
+from app.services import stats_api_client
+from app.services.leaderboard_hub import hub
+from app.services.live_poller import poller
+
+logger = logging.getLogger("caddystats.subscriptions")
+
+
+@strawberry.type
+class Subscription:
+    @strawberry.subscription(
+        description="Live leaderboard for a tournament: one full board, then changed rows only."
+    )
+    async def leaderboard_updates(
+        self,
+        info: Info,
+        tournament_id: str,
+    ) -> AsyncGenerator[LeaderboardUpdate, None]:
+        queue = hub.subscribe(tournament_id)
+        poller.retain(tournament_id)
+        try:
+            if not hub.has_board(tournament_id):
+                try:
+                    result = await stats_api_client.fetch("leaderboard", tournament_id)
+                    hub.publish(tournament_id, result.data)
+                except Exception:
+                    logger.warning("Initial leaderboard unavailable for tournament %s", tournament_id)
+            # The initial publish (if any) is already queued; skip straight to a snapshot
+            while not queue.empty():
+                queue.get_nowait()
+            snapshot = hub.snapshot(tournament_id)
+            if snapshot is not None:
+                yield snapshot
+            while True:
+                yield await queue.get()
+        finally:
+            hub.unsubscribe(tournament_id, queue)
+            poller.release(tournament_id)
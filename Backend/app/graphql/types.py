@@ -7,9 +7,18 @@ from __future__ import annotations
 
 import uuid
 from datetime import datetime
-from typing import Generic, List, Optional, TypeVar
+from typing import Callable, Generic, List, Optional, TypeVar
 
 import strawberry
+from strawberry.types import Info
+
+from app.services.headshot_cache import headshot_url
+
+
+def _loaders(info: Info):
+    # Imported lazily: the loaders build these types
+    from app.graphql.loaders import get_content_loaders
+    return get_content_loaders(info)
 
 
 # ---------------------------------------------------------------------------
@@ -37,7 +46,11 @@ class Edge(Generic[NodeType]):
 class Connection(Generic[NodeType]):
     edges: List[Edge[NodeType]]
     page_info: PageInfo
-    total_count: int
+    estimate: strawberry.Private[Optional[Callable[[], Optional[int]]]] = None
+
+    @strawberry.field(description="Planner row estimate for the filtered list (no COUNT(*)); null when unavailable.")
+    def total_count(self) -> Optional[int]:
+        return self.estimate() if self.estimate is not None else None
 
 
 # ---------------------------------------------------------------------------
@@ -60,10 +73,13 @@ class Role:
     key: str
     name: str
     description: Optional[str]
-    permissions: List[Permission]
     created_at: datetime
     updated_at: datetime
 
+    @strawberry.field
+    async def permissions(self, info: Info) -> List[Permission]:
+        return await _loaders(info).role_permissions.load(self.id)
+
 
 @strawberry.type
 class User:
@@ -74,10 +90,13 @@ class User:
     avatar_url: Optional[str]
     is_active: bool
     is_verified: bool
-    roles: List[Role]
     created_at: datetime
     updated_at: datetime
 
+    @strawberry.field
+    async def roles(self, info: Info) -> List[Role]:
+        return await _loaders(info).user_roles.load(self.id)
+
 
 @strawberry.type
 class AuthPayload:
@@ -163,19 +182,25 @@ class Revision:
 class Comment:
     id: uuid.UUID
     post_id: uuid.UUID
-    author: Optional[User]
     body: str
     status: str
     is_deleted: bool
     created_at: datetime
     updated_at: datetime
+    author_id: strawberry.Private[Optional[uuid.UUID]] = None
 
+    @strawberry.field
+    async def author(self, info: Info) -> Optional[User]:
+        return await _loaders(info).users.load(self.author_id) if self.author_id else None
+
+
+# Relationships (author, SEO, taxonomy, comments) are resolved through the
+# request-scoped loaders in ``app.graphql.loaders``: one IN query per
+# relationship per operation, and only when the field is selected.
 
 @strawberry.type
 class Post:
     id: uuid.UUID
-    author: User
-    seo: Optional[SEO]
     slug: str
     title: str
     excerpt: Optional[str]
@@ -184,19 +209,44 @@ class Post:
     published_at: Optional[datetime]
     archived_at: Optional[datetime]
     content_jsonb: strawberry.scalars.JSON
-    tags: List[Tag]
-    categories: List[Category]
-    comments: List[Comment]
     is_deleted: bool
     created_at: datetime
     updated_at: datetime
+    author_id: strawberry.Private[uuid.UUID]
+    seo_id: strawberry.Private[Optional[uuid.UUID]] = None
+
+    @strawberry.field
+    async def author(self, info: Info) -> User:
+        return await _loaders(info).users.load(self.author_id)
+
+    @strawberry.field
+    async def seo(self, info: Info) -> Optional[SEO]:
+        return await _loaders(info).seo.load(self.seo_id) if self.seo_id else None
+
+    @strawberry.field
+    async def tags(self, info: Info) -> List[Tag]:
+        return await _loaders(info).post_tags.load(self.id)
+
+    @strawberry.field
+    async def categories(self, info: Info) -> List[Category]:
+        return await _loaders(info).post_categories.load(self.id)
+
+    @strawberry.field
+    async def comments(self, info: Info) -> List[Comment]:
+        return await _loaders(info).post_comments.load(self.id)
+
+    @strawberry.field(description="content_jsonb with stat embeds hydrated from the Stats API.")
+    async def resolved_content(self) -> strawberry.scalars.JSON:
+        from app.services.embed_service import resolve_embeds
+        return await resolve_embeds(
+            self.content_jsonb,
+            cache_key=f"post:{self.id}:{self.updated_at.isoformat()}",
+        )
 
 
 @strawberry.type
 class Page:
     id: uuid.UUID
-    author: User
-    seo: Optional[SEO]
     slug: str
     title: str
     status: str
@@ -206,13 +256,21 @@ class Page:
     is_deleted: bool
     created_at: datetime
     updated_at: datetime
+    author_id: strawberry.Private[uuid.UUID]
+    seo_id: strawberry.Private[Optional[uuid.UUID]] = None
+
+    @strawberry.field
+    async def author(self, info: Info) -> User:
+        return await _loaders(info).users.load(self.author_id)
+
+    @strawberry.field
+    async def seo(self, info: Info) -> Optional[SEO]:
+        return await _loaders(info).seo.load(self.seo_id) if self.seo_id else None
 
 
 @strawberry.type
 class Template:
     id: uuid.UUID
-    author: User
-    seo: Optional[SEO]
     slug: str
     name: str
     description: Optional[str]
@@ -220,6 +278,16 @@ class Template:
     content_jsonb: strawberry.scalars.JSON
     created_at: datetime
     updated_at: datetime
+    author_id: strawberry.Private[uuid.UUID]
+    seo_id: strawberry.Private[Optional[uuid.UUID]] = None
+
+    @strawberry.field
+    async def author(self, info: Info) -> User:
+        return await _loaders(info).users.load(self.author_id)
+
+    @strawberry.field
+    async def seo(self, info: Info) -> Optional[SEO]:
+        return await _loaders(info).seo.load(self.seo_id) if self.seo_id else None
 
 
 # ---------------------------------------------------------------------------
@@ -337,25 +405,97 @@ class Event:
 # External Stats API gateway types (thin – no local DB)
 # ---------------------------------------------------------------------------
 
+# Resolvers return the parsed records from ``app.services.stats_models``;
+# ``raw`` (the upstream dict) is not kept on them but re-read through the
+# operation's Stats loaders (the same payload the record was parsed from)
+# when selected. ``stale`` is true when the Stats API is unavailable and the
+# last good payload is being served instead.
+
+async def _raw(info: Info, endpoint: str, tournament_id: str, index: Optional[int] = None):
+    from app.graphql.loaders import get_stats_loaders
+    from app.services.stats_models import raw_entry
+
+    result = await getattr(get_stats_loaders(info), endpoint).load(tournament_id)
+    return raw_entry(result.data, index)
+
+
 @strawberry.type
 class TournamentCard:
     tournament_id: str
     name: Optional[str]
-    raw: strawberry.scalars.JSON
+    season_year: Optional[int]
+    start_date: Optional[str]
+    end_date: Optional[str]
+    stale: bool = False
+
+    @strawberry.field
+    async def raw(self, info: Info) -> strawberry.scalars.JSON:
+        return await _raw(info, "tournament_card", self.tournament_id)
 
 
 @strawberry.type
 class LeaderboardEntry:
     position: int
+    player_id: Optional[str]
     player_name: str
     score: Optional[str]
-    raw: strawberry.scalars.JSON
+    total_score: Optional[int]
+    round_scores: List[int]
+    thru: Optional[str]
+    status: str
+    stale: bool = False
+    tournament_id: strawberry.Private[str] = ""
+    index: strawberry.Private[int] = 0
+
+    @strawberry.field
+    async def raw(self, info: Info) -> strawberry.scalars.JSON:
+        return await _raw(info, "leaderboard", self.tournament_id, self.index)
+
+    @strawberry.field(description="Same-origin, cached headshot URL (see /api/headshots)")
+    def headshot_url(self, width: Optional[int] = None) -> Optional[str]:
+        return headshot_url(self.player_id, width)
 
 
 @strawberry.type
 class FeaturedEdge:
+    player_id: Optional[str]
     player_name: str
-    raw: strawberry.scalars.JSON
+    stale: bool = False
+    tournament_id: strawberry.Private[str] = ""
+    index: strawberry.Private[int] = 0
+
+    @strawberry.field
+    async def raw(self, info: Info) -> strawberry.scalars.JSON:
+        return await _raw(info, "featured_edges", self.tournament_id, self.index)
+
+
+@strawberry.type
+class LeaderboardRowChange:
+    player_key: str
+    player_name: Optional[str]
+    position: Optional[int]
+    score: Optional[str]
+    thru: Optional[str]
+
+
+@strawberry.type
+class LeaderboardUpdate:
+    tournament_id: str
+    version: int
+    full: bool
+    changed: List[LeaderboardRowChange]
+    removed: List[str]
+
+
+@strawberry.type
+class LeaderboardDelta:
+    tournament_id: str
+    version: int
+    etag: str
+    not_modified: bool
+    full: bool
+    changed: List[LeaderboardRowChange]
+    removed: List[str]
 
 
 # ---------------------------------------------------------------------------
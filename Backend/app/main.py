@@ -1,3 +1,5 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from strawberry.fastapi import GraphQLRouter
@@ -11,16 +13,50 @@ from app.core.config import settings
 from app.graphql.schema import schema
 from app.api.graphql_router import get_context
 from app.api.auth import router as auth_router
+from app.api.betting_edges import router as betting_edges_router
+from app.api.golfers import router as golfers_router
+from app.api.headshots import router as headshots_router
+from app.api.leaderboard import router as leaderboard_router
 from app.api.media import router as media_router
+from app.api.odds import router as odds_router
+from app.api.projections import router as projections_router
+from app.api.simulations import router as simulations_router
+from app.api.stats_gateway import router as stats_gateway_router
 from app.db.content import content_engine
 from app.utils.logging import configure_logging
 from app.middleware.request_logging import RequestLoggingMiddleware
 from app.middleware.security_headers import SecurityHeadersMiddleware
 from app.middleware.metrics import MetricsMiddleware
 from app.middleware.rate_limit import apply_rate_limiting
+from app.services import stats_api_client, tournament_simulator
+from app.services.golfer_directory import directory as golfer_directory
+from app.services.headshot_cache import headshots
+from app.services.leaderboard_archive import archive as leaderboard_archive
+from app.services.live_poller import poller as live_poller
 
 configure_logging()
-app = FastAPI(title="Caddy Stats API", version="0.1.0")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Open shared resources for this worker and close them on shutdown."""
+    await stats_api_client.startup()
+    if settings.stats_live_poller_enabled:
+        live_poller.start()
+    if settings.golfer_directory_enabled:
+        golfer_directory.start()
+    try:
+        yield
+    finally:
+        await golfer_directory.stop()
+        await live_poller.stop()
+        await stats_api_client.shutdown()
+        await headshots.shutdown()
+        tournament_simulator.shutdown()
+        await leaderboard_archive.close()
+
+
+app = FastAPI(title="Caddy Stats API", version="0.1.0", lifespan=lifespan)
 app.add_exception_handler(StarletteHTTPException, http_exception_handler)
 app.add_exception_handler(Exception, unhandled_exception_handler)
 app.add_middleware(RequestLoggingMiddleware)
@@ -37,9 +73,17 @@ app.add_middleware(
 
 apply_rate_limiting(app)
 
-# Auth and media REST routes
+# Auth, media and Stats gateway REST routes
 app.include_router(auth_router, prefix="/api")
 app.include_router(media_router, prefix="/api")
+app.include_router(leaderboard_router, prefix="/api")
+app.include_router(betting_edges_router, prefix="/api")
+app.include_router(golfers_router, prefix="/api")
+app.include_router(headshots_router, prefix="/api")
+app.include_router(odds_router, prefix="/api")
+app.include_router(projections_router, prefix="/api")
+app.include_router(simulations_router, prefix="/api")
+app.include_router(stats_gateway_router, prefix="/api")
 
 # GraphQL endpoint with auth context
 if settings.app_env == "development":
@@ -0,0 +1,172 @@
+"""
+Vectorized betting edge engine.
+
+Replaces the row-by-row join in ``Database/views/betting_edge_view.sql``:
+projections and odds for a tournament are loaded once into NumPy arrays and
+edges (model probability − implied probability) and expected value are
+computed for every golfer × book × market in a single pass. Prices are
+normalized and de-vigged with :mod:`app.services.odds_normalization`, so
+each row also carries the no-vig and cross-book consensus probability. The
+computed board is cached per tournament until either input payload changes.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections import OrderedDict
+from typing import Any, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.core.config import settings
+from app.services import stats_api_client
+from app.services.odds_normalization import (
+    MARKET_PLACES,
+    consensus,
+    implied_probability,
+    price_of,
+    remove_vig,
+    to_decimal,
+)
+
+logger = logging.getLogger("caddystats.betting_edges")
+
+# Odds market -> projection field carrying the model probability
+MARKET_PROB_FIELDS = {
+    "win": "winProb",
+    "top5": "top5Prob",
+    "top10": "top10Prob",
+    "top20": "top20Prob",
+    "make_cut": "makeCutProb",
+}
+_MARKETS = list(MARKET_PROB_FIELDS)
+_MARKET_INDEX = {m: i for i, m in enumerate(_MARKETS)}
+
+
+_MARKET_TARGETS = np.array([MARKET_PLACES.get(m, np.nan) for m in _MARKETS])
+
+
+class EdgeBoard:
+    """Column arrays for every priced (golfer, book, market) with its edge."""
+
+    __slots__ = ("golfer_ids", "books", "markets", "golfer_idx", "book_idx", "market_idx",
+                 "odds", "model_prob", "implied_prob", "no_vig_prob", "consensus_prob", "edge", "ev")
+
+    def __init__(self, projections: Any, odds: Any, vig_method: str = "multiplicative") -> None:
+        proj_rows = [p for p in (projections if isinstance(projections, list) else []) if isinstance(p, dict)]
+        odds_rows = [
+            o for o in (odds if isinstance(odds, list) else [])
+            if isinstance(o, dict) and o.get("market") in _MARKET_INDEX and o.get("odds") is not None
+        ]
+
+        self.golfer_ids: List[str] = [str(p.get("golferId")) for p in proj_rows]
+        golfer_index = {gid: i for i, gid in enumerate(self.golfer_ids)}
+
+        # (golfer, market) model probability matrix; NaN where not projected
+        probs = np.full((len(proj_rows), len(_MARKETS)), np.nan)
+        for i, p in enumerate(proj_rows):
+            for j, market in enumerate(_MARKETS):
+                value = p.get(MARKET_PROB_FIELDS[market])
+                if value is not None:
+                    probs[i, j] = value
+
+        self.books: List[str] = sorted({str(o.get("book")) for o in odds_rows})
+        book_index = {b: i for i, b in enumerate(self.books)}
+        self.markets = _MARKETS
+
+        golfer_idx = np.fromiter((golfer_index.get(str(o.get("golferId")), -1) for o in odds_rows), np.int64, len(odds_rows))
+        prices = [price_of(o) for o in odds_rows]
+        odds = np.fromiter((v for v, _f in prices), np.float64, len(prices))
+        keep = (golfer_idx >= 0) & ~np.isnan(odds)  # unparseable prices are dropped
+        self.golfer_idx = golfer_idx[keep]
+        self.book_idx = np.fromiter((book_index[str(o.get("book"))] for o in odds_rows), np.int64, len(odds_rows))[keep]
+        self.market_idx = np.fromiter((_MARKET_INDEX[o["market"]] for o in odds_rows), np.int64, len(odds_rows))[keep]
+        self.odds = odds[keep]
+        formats = np.fromiter((f for _v, f in prices), np.int64, len(prices))[keep]
+
+        n_markets = len(_MARKETS)
+        self.implied_prob = implied_probability(self.odds, formats)
+        self.no_vig_prob = remove_vig(
+            self.implied_prob,
+            self.book_idx * n_markets + self.market_idx,
+            method=vig_method,
+            targets=np.tile(_MARKET_TARGETS, len(self.books)),
+        )
+        self.consensus_prob = consensus(
+            self.no_vig_prob, self.golfer_idx * n_markets + self.market_idx, len(self.golfer_ids) * n_markets
+        )
+        self.model_prob = probs[self.golfer_idx, self.market_idx] if len(proj_rows) else np.empty(0)
+        self.edge = self.model_prob - self.implied_prob
+        self.ev = self.model_prob * to_decimal(self.odds, formats) - 1.0
+
+    def __len__(self) -> int:
+        return int(self.edge.size)
+
+    def query(
+        self,
+        min_edge: Optional[float] = None,
+        books: Optional[Sequence[str]] = None,
+        markets: Optional[Sequence[str]] = None,
+        top: Optional[int] = None,
+    ) -> List[dict]:
+        """Filter by minimum edge, books and markets; return the top-N rows by edge."""
+        mask = ~np.isnan(self.edge)
+        if min_edge is not None:
+            mask &= self.edge >= min_edge
+        if books:
+            wanted = [i for i, b in enumerate(self.books) if b in set(books)]
+            mask &= np.isin(self.book_idx, wanted)
+        if markets:
+            mask &= np.isin(self.market_idx, [_MARKET_INDEX[m] for m in markets if m in _MARKET_INDEX])
+
+        rows = np.flatnonzero(mask)
+        edges = self.edge[rows]
+        if top is not None and 0 < top < rows.size:
+            part = np.argpartition(-edges, top - 1)[:top]
+            rows, edges = rows[part], edges[part]
+        rows = rows[np.argsort(-edges, kind="stable")]
+
+        return [
+            {
+                "golferId": self.golfer_ids[self.golfer_idx[i]],
+                "sportsbook": self.books[self.book_idx[i]],
+                "marketType": self.markets[self.market_idx[i]],
+                "odds": float(self.odds[i]),
+                "projectedProbability": round(float(self.model_prob[i]), 4),
+                "impliedProbability": round(float(self.implied_prob[i]), 4),
+                "noVigProbability": round(float(self.no_vig_prob[i]), 4),
+                "consensusProbability": round(float(self.consensus_prob[i]), 4),
+                "edge": round(float(self.edge[i]), 4),
+                "expectedValue": round(float(self.ev[i]), 4),
+            }
+            for i in rows
+        ]
+
+
+# tournament_id -> (projections payload, odds payload, board), least recently used first;
+# the payloads are the gateway's cached objects, kept only for identity checks
+_boards: "OrderedDict[str, Tuple[Any, Any, EdgeBoard]]" = OrderedDict()
+
+
+def build_board(tournament_id: str, projections: Any, odds: Any) -> EdgeBoard:
+    """Return the cached board if both input payloads are unchanged, else rebuild it."""
+    cached = _boards.get(tournament_id)
+    if cached is not None and cached[0] is projections and cached[1] is odds:
+        _boards.move_to_end(tournament_id)
+        return cached[2]
+    board = EdgeBoard(projections, odds, vig_method=settings.betting_vig_method)
+    _boards[tournament_id] = (projections, odds, board)
+    _boards.move_to_end(tournament_id)
+    while len(_boards) > settings.betting_board_cache_max_entries:
+        _boards.popitem(last=False)
+    return board
+
+
+async def get_edge_board(tournament_id: str) -> EdgeBoard:
+    """Load projections and odds through the Stats gateway and return the edge board."""
+    projections, odds = await asyncio.gather(
+        stats_api_client.get_projections(tournament_id),
+        stats_api_client.get_odds(tournament_id),
+    )
+    return build_board(tournament_id, projections, odds)
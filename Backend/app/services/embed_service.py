@@ -1,13 +1,115 @@
 """
 Embed service – resolves stat embeds inside post content blocks.
 Populated in Phase 5+ (Blog Editor System).
+
+A stat embed is a block of type ``stat_embed``::
+
+    {"type": "stat_embed", "endpoint": "leaderboard",
+     "tournamentId": "t1", "playerId": "p9"}
+
+``endpoint`` is one of the Stats gateway endpoints (leaderboard,
+featured_edges, tournament_card); ``playerId`` optionally narrows list
+payloads to one player's rows.
 """
 
+from __future__ import annotations
+
+import asyncio
+import copy
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.services import stats_api_client
+from app.services.stats_cache import StatsCache
+
+logger = logging.getLogger("caddystats.embeds")
+
+STAT_EMBED_TYPE = "stat_embed"
+_EMBED_ENDPOINTS = {"leaderboard", "featured_edges", "tournament_card"}
+
+EmbedKey = Tuple[str, str, Optional[str]]  # (endpoint, tournament_id, player_id)
+
+# Resolved content per post version; short TTL because embedded stats move
+_resolved = StatsCache(
+    max_entries=settings.embed_cache_max_entries,
+    max_stale=settings.embed_cache_max_stale,
+)
+
+
+def _embed_key(block: dict) -> Optional[EmbedKey]:
+    endpoint = block.get("endpoint")
+    tournament_id = block.get("tournamentId")
+    if endpoint not in _EMBED_ENDPOINTS or not tournament_id:
+        return None
+    player_id = block.get("playerId")
+    return endpoint, str(tournament_id), str(player_id) if player_id else None
+
 
-async def resolve_embeds(content_jsonb: list) -> list:
+def _collect(node: Any, found: List[Tuple[dict, EmbedKey]]) -> None:
+    """Single pass over the content tree collecting (block, key) for every stat embed."""
+    if isinstance(node, list):
+        for item in node:
+            _collect(item, found)
+    elif isinstance(node, dict):
+        if node.get("type") == STAT_EMBED_TYPE:
+            key = _embed_key(node)
+            if key is not None:
+                found.append((node, key))
+        for value in node.values():
+            if isinstance(value, (list, dict)):
+                _collect(value, found)
+
+
+def _for_player(data: Any, player_id: Optional[str]) -> Any:
+    if player_id is None or not isinstance(data, list):
+        return data
+    return [
+        row for row in data
+        if isinstance(row, dict) and str(row.get("playerId") or row.get("playerName")) == player_id
+    ]
+
+
+async def _hydrate(content_jsonb: Any) -> Any:
+    content = copy.deepcopy(content_jsonb)
+    embeds: List[Tuple[dict, EmbedKey]] = []
+    _collect(content, embeds)
+    if not embeds:
+        return content
+
+    # Player-scoped embeds share the tournament-level payload, so each
+    # (endpoint, tournament) pair is fetched exactly once.
+    sources = list(dict.fromkeys((endpoint, tid) for _block, (endpoint, tid, _p) in embeds))
+    semaphore = asyncio.Semaphore(settings.embed_max_concurrency)
+
+    async def load(endpoint: str, tournament_id: str):
+        async with semaphore:
+            return await stats_api_client.fetch(endpoint, tournament_id)
+
+    results = await asyncio.gather(*(load(e, t) for e, t in sources), return_exceptions=True)
+    fetched: Dict[Tuple[str, str], Any] = dict(zip(sources, results))
+
+    for block, (endpoint, tid, player_id) in embeds:
+        result = fetched[(endpoint, tid)]
+        if isinstance(result, BaseException):
+            logger.warning("Stat embed unavailable: %s/%s (%s)", endpoint, tid, type(result).__name__)
+            block["data"] = None
+            block["error"] = "unavailable"
+            continue
+        block["data"] = _for_player(result.data, player_id)
+        block["stale"] = result.stale
+    return content
+
+
+async def resolve_embeds(content_jsonb: Any, cache_key: Optional[str] = None) -> Any:
     """
     Walk a list of editor blocks and resolve any stat-embed blocks
     by fetching live data from the Stats API.
+
+    The input is not modified; a hydrated copy is returned. Pass a
+    *cache_key* that changes with the content (e.g. post id + updated_at)
+    to reuse the resolved copy across reads.
     """
-    # TODO: iterate blocks, detect embed type, fetch & inject data
-    return content_jsonb
+    if cache_key is None:
+        return await _hydrate(content_jsonb)
+    return await _resolved.get_or_fetch(cache_key, "embeds", lambda: _hydrate(content_jsonb))
@@ -0,0 +1,201 @@
+"""
+In-memory golfer directory search index.
+
+Built from the Stats API golfer list and refreshed every
+``golfer_directory_refresh_interval`` seconds. Each refresh builds a new
+immutable :class:`GolferIndex` off the event loop and swaps it in with a
+single reference assignment, so searches never see a half-built index and
+keystrokes never reach the upstream.
+
+Names are folded with :func:`app.utils.slugify.fold` (lowercase ASCII,
+accents stripped). A query first matches name-token prefixes (binary search
+over a sorted token list), then falls back to trigram similarity for typos;
+country and OWGR range filters are applied as NumPy masks.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import bisect
+import logging
+import re
+import time
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from app.core.config import settings
+from app.services import stats_api_client
+from app.utils.slugify import fold
+
+logger = logging.getLogger("caddystats.golfer_directory")
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+_UNRANKED = np.iinfo(np.int32).max
+
+
+def normalize(text: str) -> str:
+    return " ".join(_TOKEN.findall(fold(text or "")))
+
+
+def trigrams(text: str) -> set[str]:
+    padded = f"  {text} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+class GolferIndex:
+    """Immutable search structures over one golfer list."""
+
+    def __init__(self, golfers: Any) -> None:
+        rows = [g for g in (golfers if isinstance(golfers, list) else []) if isinstance(g, dict) and g.get("id")]
+        self.golfers: List[dict] = [
+            {"id": str(g["id"]), "name": g.get("name") or "", "country": g.get("country"), "owgrRank": g.get("owgrRank")}
+            for g in rows
+        ]
+        self.names = [normalize(g["name"]) for g in self.golfers]
+        self.countries = np.array([normalize(g["country"] or "") for g in self.golfers], dtype=object)
+        self.owgr = np.array(
+            [int(g["owgrRank"]) if isinstance(g["owgrRank"], (int, float)) else _UNRANKED for g in self.golfers],
+            dtype=np.int64,
+        )
+
+        # Sorted (token, golfer) pairs; each name token and the full name are prefix keys
+        pairs = set()
+        for i, name in enumerate(self.names):
+            for token in name.split():
+                pairs.add((token, i))
+            pairs.add((name, i))
+        pairs = sorted(pairs)
+        self._tokens = [t for t, _ in pairs]
+        self._token_golfer = np.array([i for _, i in pairs], dtype=np.int64)
+
+        postings: Dict[str, List[int]] = {}
+        for i, name in enumerate(self.names):
+            for gram in trigrams(name):
+                postings.setdefault(gram, []).append(i)
+        self._postings = {gram: np.array(ids, dtype=np.int64) for gram, ids in postings.items()}
+        self._gram_counts = np.array([len(trigrams(n)) for n in self.names], dtype=np.float64)
+
+    def __len__(self) -> int:
+        return len(self.golfers)
+
+    def _prefix_matches(self, query: str) -> np.ndarray:
+        """Golfers for which every query token prefixes some name token."""
+        hits: Optional[np.ndarray] = None
+        for token in query.split():
+            lo = bisect.bisect_left(self._tokens, token)
+            hi = bisect.bisect_left(self._tokens, token + "\x7f", lo)
+            found = np.unique(self._token_golfer[lo:hi])
+            hits = found if hits is None else np.intersect1d(hits, found, assume_unique=True)
+            if not hits.size:
+                break
+        return hits if hits is not None else np.empty(0, dtype=np.int64)
+
+    def _fuzzy_scores(self, query: str) -> np.ndarray:
+        grams = trigrams(query)
+        lists = [self._postings[g] for g in grams if g in self._postings]
+        if not lists:
+            return np.zeros(len(self.golfers))
+        shared = np.bincount(np.concatenate(lists), minlength=len(self.golfers))
+        # Dice coefficient over trigram sets
+        return 2.0 * shared / (len(grams) + self._gram_counts)
+
+    def search(
+        self,
+        query: Optional[str] = None,
+        country: Optional[str] = None,
+        owgr_min: Optional[int] = None,
+        owgr_max: Optional[int] = None,
+        limit: int = 20,
+        min_similarity: float = 0.35,
+    ) -> List[dict]:
+        """Prefix matches first (by OWGR), then fuzzy matches (by similarity)."""
+        n = len(self.golfers)
+        allowed = np.ones(n, dtype=bool)
+        if country:
+            wanted = normalize(country)
+            allowed &= self.countries == wanted
+        if owgr_min is not None:
+            allowed &= self.owgr >= owgr_min
+        if owgr_max is not None:
+            allowed &= self.owgr <= owgr_max
+
+        q = normalize(query or "")
+        if not q:
+            ranked = np.flatnonzero(allowed)
+            ranked = ranked[np.argsort(self.owgr[ranked], kind="stable")][:limit]
+            return [self.golfers[i] for i in ranked]
+
+        prefix = self._prefix_matches(q)
+        prefix = prefix[allowed[prefix]]
+        prefix = prefix[np.argsort(self.owgr[prefix], kind="stable")]
+        results = list(prefix[:limit])
+        if len(results) < limit:
+            scores = self._fuzzy_scores(q)
+            scores[~allowed] = 0.0
+            scores[prefix] = 0.0
+            candidates = np.flatnonzero(scores >= min_similarity)
+            candidates = candidates[np.lexsort((self.owgr[candidates], -scores[candidates]))]
+            results.extend(candidates[: limit - len(results)])
+        return [self.golfers[i] for i in results]
+
+
+class GolferDirectory:
+    """Holds the current index and refreshes it in the background."""
+
+    def __init__(self, refresh_interval: float) -> None:
+        self.refresh_interval = refresh_interval
+        self.index: Optional[GolferIndex] = None
+        self.built_at: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()
+
+    async def refresh(self) -> GolferIndex:
+        """Fetch the golfer list, build a new index off-loop and swap it in."""
+        golfers = await stats_api_client.get_golfers()
+        index = await asyncio.to_thread(GolferIndex, golfers)
+        self.index, self.built_at = index, time.time()
+        logger.info("Golfer directory index rebuilt (%d golfers)", len(index))
+        return index
+
+    async def get_index(self) -> GolferIndex:
+        index = self.index
+        if index is not None:
+            return index
+        async with self._lock:
+            return self.index if self.index is not None else await self.refresh()
+
+    async def search(self, query: Optional[str] = None, **filters: Any) -> List[dict]:
+        return (await self.get_index()).search(query, **filters)
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.refresh()
+            except Exception as exc:
+                # Keep serving the previous index
+                logger.warning("Golfer directory refresh failed: %s: %s", type(exc).__name__, exc)
+            await asyncio.sleep(self.refresh_interval)
+
+    def stats(self) -> dict:
+        return {
+            "golfers": len(self.index) if self.index is not None else None,
+            "built_at": self.built_at,
+            "running": self._task is not None and not self._task.done(),
+        }
+
+
+directory = GolferDirectory(refresh_interval=settings.golfer_directory_refresh_interval)
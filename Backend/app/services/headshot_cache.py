@@ -0,0 +1,303 @@
+"""
+Caching proxy for player headshots.
+
+Each headshot is fetched from ``headshot_source_url`` once and kept in an
+on-disk LRU cache under ``headshot_cache_path`` together with its resized
+variants. The cache is bounded by ``headshot_cache_max_bytes``; the least
+recently served files are evicted first. Requested widths snap up to the
+nearest configured size in ``headshot_sizes`` so a handful of variants cover
+every layout.
+
+Variants are resized with Pillow. Concurrent misses for the same image
+share one upstream fetch.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import bisect
+import hashlib
+import io
+import logging
+import os
+import re
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+from PIL import Image
+
+from app.core.config import settings
+from app.utils.singleflight import SingleFlight
+
+logger = logging.getLogger("caddystats.headshots")
+
+_SAFE_ID = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+
+# Leading bytes -> (content type, Pillow format)
+_SIGNATURES = (
+    (b"\x89PNG\r\n\x1a\n", "image/png", "PNG"),
+    (b"\xff\xd8\xff", "image/jpeg", "JPEG"),
+    (b"GIF8", "image/gif", "PNG"),
+    (b"RIFF", "image/webp", "WEBP"),
+)
+
+
+class HeadshotNotFound(LookupError):
+    """The origin has no headshot for this player."""
+
+
+@dataclass(frozen=True)
+class Headshot:
+    body: bytes
+    content_type: str
+    etag: str
+
+
+class _Entry:
+    __slots__ = ("size", "etag")
+
+    def __init__(self, size: int, etag: Optional[str] = None) -> None:
+        self.size = size
+        self.etag = etag
+
+
+def sniff(body: bytes) -> Tuple[str, str]:
+    """(content type, Pillow save format) for an image body."""
+    for magic, content_type, fmt in _SIGNATURES:
+        if body.startswith(magic) and (fmt != "WEBP" or body[8:12] == b"WEBP"):
+            return content_type, fmt
+    return "application/octet-stream", "PNG"
+
+
+def etag_for(body: bytes) -> str:
+    return '"%s"' % hashlib.sha1(body).hexdigest()[:16]
+
+
+def resize(body: bytes, width: int) -> Optional[bytes]:
+    """Downscale *body* to *width* pixels wide; None if it is already that small."""
+    _content_type, fmt = sniff(body)
+    with Image.open(io.BytesIO(body)) as img:
+        if img.width <= width:
+            return None
+        height = max(1, round(img.height * width / img.width))
+        out = img.convert("RGBA" if fmt in ("PNG", "WEBP") else "RGB").resize((width, height), Image.LANCZOS)
+        buf = io.BytesIO()
+        out.save(buf, format=fmt, optimize=True, **({"quality": 85} if fmt in ("JPEG", "WEBP") else {}))
+    return buf.getvalue()
+
+
+class HeadshotCache:
+    """On-disk LRU of original and resized headshots with a byte budget."""
+
+    def __init__(
+        self,
+        root: str,
+        source_url: str,
+        max_bytes: int,
+        sizes: List[int],
+        timeout: float = 10.0,
+    ) -> None:
+        self.root = root
+        self.source_url = source_url
+        self.max_bytes = max_bytes
+        self.sizes = sorted(set(sizes))
+        self.timeout = timeout
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._bytes = 0
+        self._loaded = False
+        self._client: Optional[httpx.AsyncClient] = None
+        self._transport: Optional[httpx.AsyncBaseTransport] = None
+        self._flight = SingleFlight()
+        self._counters: Dict[str, int] = {"hits": 0, "misses": 0, "fetches": 0, "resized": 0, "evictions": 0}
+
+    # -- lifecycle -----------------------------------------------------------
+
+    async def startup(self, transport: Optional[httpx.AsyncBaseTransport] = None) -> None:
+        """(Re)open the origin client; *transport* lets tests plug in a stand-in origin."""
+        await self.shutdown()
+        self._transport = transport
+
+    async def shutdown(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(timeout=self.timeout, follow_redirects=True, transport=self._transport)
+        return self._client
+
+    def _load(self) -> None:
+        """Index files left by a previous run, oldest access first."""
+        if self._loaded:
+            return
+        os.makedirs(self.root, exist_ok=True)
+        files = []
+        for name in os.listdir(self.root):
+            path = os.path.join(self.root, name)
+            if name.endswith(".tmp"):
+                os.remove(path)
+                continue
+            st = os.stat(path)
+            files.append((st.st_mtime, name, st.st_size))
+        for _mtime, name, size in sorted(files):
+            self._entries[name] = _Entry(size)
+            self._bytes += size
+        self._loaded = True
+        self._evict()
+
+    # -- storage -------------------------------------------------------------
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.root, name)
+
+    def _read(self, name: str) -> Optional[bytes]:
+        try:
+            with open(self._path(name), "rb") as fh:
+                body = fh.read()
+            os.utime(self._path(name))  # persist LRU order across restarts
+        except FileNotFoundError:
+            return None
+        return body
+
+    def _write_file(self, name: str, body: bytes) -> None:
+        tmp = self._path(name + ".tmp")
+        with open(tmp, "wb") as fh:
+            fh.write(body)
+        os.replace(tmp, self._path(name))
+
+    async def _store(self, name: str, body: bytes) -> None:
+        # File I/O off-loop; the index is only mutated on the loop
+        await asyncio.to_thread(self._write_file, name, body)
+        self._discard(name)
+        self._entries[name] = _Entry(len(body), etag_for(body))
+        self._bytes += len(body)
+        self._evict(keep=name)
+
+    def _discard(self, name: str) -> None:
+        entry = self._entries.pop(name, None)
+        if entry is not None:
+            self._bytes -= entry.size
+
+    def _evict(self, keep: Optional[str] = None) -> None:
+        while self._bytes > self.max_bytes and self._entries:
+            name = next(iter(self._entries))
+            if name == keep:
+                if len(self._entries) == 1:
+                    break
+                self._entries.move_to_end(name)
+                continue
+            self._discard(name)
+            self._counters["evictions"] += 1
+            try:
+                os.remove(self._path(name))
+            except FileNotFoundError:
+                pass
+
+    # -- lookups -------------------------------------------------------------
+
+    def width_for(self, requested: Optional[int]) -> Optional[int]:
+        """Snap a requested width up to a configured size; None serves the original."""
+        if not requested or not self.sizes:
+            return None
+        i = bisect.bisect_left(self.sizes, requested)
+        return self.sizes[i] if i < len(self.sizes) else None
+
+    def etag(self, golfer_id: str, width: Optional[int] = None) -> Optional[str]:
+        """ETag of a cached variant without touching the disk, if known."""
+        entry = self._entries.get(self._name(golfer_id, self.width_for(width)))
+        return entry.etag if entry is not None else None
+
+    @staticmethod
+    def _name(golfer_id: str, width: Optional[int]) -> str:
+        if not _SAFE_ID.match(golfer_id):
+            raise HeadshotNotFound(golfer_id)
+        return f"{golfer_id}-{width or 'orig'}"
+
+    async def get(self, golfer_id: str, width: Optional[int] = None) -> Headshot:
+        """Serve a headshot variant, fetching and resizing on first use."""
+        self._load()
+        width = self.width_for(width)
+        name = self._name(golfer_id, width)
+        if name in self._entries:
+            body = await asyncio.to_thread(self._read, name)
+            if body is not None:
+                self._counters["hits"] += 1
+                self._entries.move_to_end(name)
+                return self._headshot(name, body)
+            self._discard(name)
+        self._counters["misses"] += 1
+        body = await self._flight.do(name, lambda: self._build(golfer_id, width))
+        return self._headshot(name, body)
+
+    def _headshot(self, name: str, body: bytes) -> Headshot:
+        entry = self._entries.get(name)
+        etag = entry.etag if entry is not None and entry.etag else etag_for(body)
+        if entry is not None:
+            entry.etag = etag
+        return Headshot(body=body, content_type=sniff(body)[0], etag=etag)
+
+    async def _original(self, golfer_id: str) -> bytes:
+        name = self._name(golfer_id, None)
+        body = await asyncio.to_thread(self._read, name) if name in self._entries else None
+        if body is None:
+            self._discard(name)
+            body = await self._fetch(golfer_id)
+            await self._store(name, body)
+        else:
+            self._entries.move_to_end(name)
+        return body
+
+    async def _build(self, golfer_id: str, width: Optional[int]) -> bytes:
+        if width is None:
+            return await self._original(golfer_id)
+        original = await self._flight.do(self._name(golfer_id, None), lambda: self._original(golfer_id))
+        try:
+            body = await asyncio.to_thread(resize, original, width)
+        except Exception as exc:
+            # Undecodable image: serve the original at every width
+            logger.warning("Headshot resize failed for %s: %s: %s", golfer_id, type(exc).__name__, exc)
+            body = None
+        if body is None:
+            body = original
+        else:
+            self._counters["resized"] += 1
+        await self._store(self._name(golfer_id, width), body)
+        return body
+
+    async def _fetch(self, golfer_id: str) -> bytes:
+        url = self.source_url.format(golfer_id=golfer_id)
+        self._counters["fetches"] += 1
+        response = await self._get_client().get(url)
+        if response.status_code == 404:
+            raise HeadshotNotFound(golfer_id)
+        response.raise_for_status()
+        if not response.headers.get("content-type", "").startswith("image/"):
+            raise HeadshotNotFound(golfer_id)
+        return response.content
+
+    def stats(self) -> dict:
+        return {
+            **self._counters,
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+        }
+
+
+def headshot_url(golfer_id: Optional[str], width: Optional[int] = None) -> Optional[str]:
+    """Same-origin proxy URL for a player's headshot."""
+    if not golfer_id or not _SAFE_ID.match(golfer_id):
+        return None
+    return f"/api/headshots/{golfer_id}" + (f"?w={width}" if width else "")
+
+
+headshots = HeadshotCache(
+    root=settings.headshot_cache_path,
+    source_url=settings.headshot_source_url,
+    max_bytes=settings.headshot_cache_max_bytes,
+    sizes=settings.headshot_sizes,
+    timeout=settings.headshot_fetch_timeout,
+)
@@ -0,0 +1,309 @@
+"""
+Append-only, compressed archive of leaderboard snapshots.
+
+Every distinct leaderboard fetched through the Stats gateway is recorded
+per tournament. Consecutive snapshots are delta-encoded (changed rows and
+removed player keys) and buffered; a buffer is written out as one
+zlib-compressed block once it holds ``leaderboard_archive_block_records``
+snapshots or is ``leaderboard_archive_flush_interval`` seconds old. Each
+block starts with a full board, so any block can be replayed on its own.
+
+On disk a tournament is a directory of append-only segment files plus an
+``index.jsonl`` time index (one line per block: start, end, segment,
+offset, length). Reads binary-search the index and decompress only the
+blocks that overlap the requested time, never whole segments.
+
+Compression and file I/O run in worker threads, never on the event loop.
+Several uvicorn workers may share one archive directory: appends take an
+exclusive ``flock`` on the tournament's ``.lock`` file and re-read the
+index first, and readers pick up blocks appended by other workers by
+re-reading the index whenever it has grown. Each worker archives the boards
+it fetched itself, so blocks from different workers may interleave in time.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import bisect
+import json
+import logging
+import os
+import re
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from app.core.config import settings
+from app.services.leaderboard_diff import index_rows
+
+try:
+    import fcntl
+except ImportError:  # non-POSIX: single-worker use only
+    fcntl = None
+
+logger = logging.getLogger("caddystats.leaderboard_archive")
+
+Rows = Dict[str, dict]
+# A decoded block: (start, full board at start, [(ts, changed rows, removed keys), ...])
+Block = Tuple[float, Rows, List[Tuple[float, Rows, List[str]]]]
+
+
+@dataclass
+class _IndexEntry:
+    start: float
+    end: float
+    segment: str
+    offset: int
+    length: int
+
+
+@dataclass
+class _Pending:
+    start: float
+    base: Rows
+    deltas: List[Tuple[float, Rows, List[str]]] = field(default_factory=list)
+
+    @property
+    def end(self) -> float:
+        return self.deltas[-1][0] if self.deltas else self.start
+
+
+@dataclass
+class _Index:
+    entries: List[_IndexEntry]
+    size: int  # bytes of index.jsonl already read
+
+
+def _delta(old: Rows, new: Rows) -> Tuple[Rows, List[str]]:
+    changed = {key: row for key, row in new.items() if old.get(key) != row}
+    removed = [key for key in old if key not in new]
+    return changed, removed
+
+
+def _apply(rows: Rows, changed: Rows, removed: List[str]) -> Rows:
+    gone = set(removed)
+    rows = {key: row for key, row in rows.items() if key not in gone}
+    rows.update(changed)
+    return rows
+
+
+class LeaderboardArchive:
+    def __init__(
+        self,
+        root: str,
+        block_records: int = 60,
+        flush_interval: float = 300.0,
+        segment_bytes: int = 8 * 1024 * 1024,
+        enabled: bool = True,
+        block_cache_size: int = 32,
+    ) -> None:
+        self.root = root
+        self.block_records = block_records
+        self.flush_interval = flush_interval
+        self.segment_bytes = segment_bytes
+        self.enabled = enabled
+        self.block_cache_size = block_cache_size
+        self._last: Dict[str, Rows] = {}
+        self._pending: Dict[str, _Pending] = {}
+        self._index: Dict[str, _Index] = {}
+        # Guards _index and _blocks, which worker threads read and update
+        self._lock = threading.Lock()
+        self._blocks: "OrderedDict[Tuple[str, str, int], Block]" = OrderedDict()
+        self._counters = {"recorded": 0, "unchanged": 0, "blocks_written": 0, "bytes_written": 0, "blocks_read": 0}
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    async def record(self, tournament_id: str, data: Any, at: Optional[float] = None) -> bool:
+        """Buffer a snapshot; returns False if archiving is off or the board is unchanged."""
+        if not self.enabled:
+            return False
+        rows = index_rows(data)
+        at = time.time() if at is None else at
+        previous = self._last.get(tournament_id)
+        pending = self._pending.get(tournament_id)
+        if previous is not None and previous == rows:
+            self._counters["unchanged"] += 1
+            # A board that stopped moving still gets its buffer written on time
+            if pending is not None and at - pending.start >= self.flush_interval:
+                await self.flush(tournament_id)
+            return False
+        if pending is None:
+            self._pending[tournament_id] = pending = _Pending(start=at, base=rows)
+        else:
+            changed, removed = _delta(previous or {}, rows)
+            pending.deltas.append((at, changed, removed))
+        self._last[tournament_id] = rows
+        self._counters["recorded"] += 1
+        if len(pending.deltas) + 1 >= self.block_records or at - pending.start >= self.flush_interval:
+            await self.flush(tournament_id)
+        return True
+
+    async def flush(self, tournament_id: Optional[str] = None) -> None:
+        """Write buffered snapshots out as compressed blocks (all tournaments by default)."""
+        targets = [tournament_id] if tournament_id is not None else list(self._pending)
+        for tid in targets:
+            pending = self._pending.pop(tid, None)
+            if pending is not None:
+                try:
+                    await asyncio.to_thread(self._write_block, tid, pending)
+                except OSError:
+                    logger.warning("Leaderboard archive write failed for %s", tid, exc_info=True)
+
+    def _write_block(self, tournament_id: str, pending: _Pending) -> None:
+        payload = {"start": pending.start, "base": pending.base, "deltas": pending.deltas}
+        blob = zlib.compress(json.dumps(payload, separators=(",", ":")).encode("utf-8"), 6)
+        directory = self._dir(tournament_id)
+        os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, ".lock"), "a") as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            # Other workers may have appended since we last looked
+            entries = self._entries(tournament_id)
+            segment = max((e.segment for e in entries), default="segment-00000.seg")
+            path = os.path.join(directory, segment)
+            if os.path.exists(path) and os.path.getsize(path) >= self.segment_bytes:
+                segment = f"segment-{int(segment[8:13]) + 1:05d}.seg"
+                path = os.path.join(directory, segment)
+            with open(path, "ab") as fh:
+                offset = fh.tell()
+                fh.write(blob)
+            line = json.dumps([pending.start, pending.end, segment, offset, len(blob)]) + "\n"
+            with open(os.path.join(directory, "index.jsonl"), "a", encoding="utf-8") as fh:
+                fh.write(line)
+        self._entries(tournament_id)
+        with self._lock:
+            self._counters["blocks_written"] += 1
+            self._counters["bytes_written"] += len(blob)
+
+    async def close(self) -> None:
+        await self.flush()
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    async def board_at(self, tournament_id: str, at: float) -> Optional[Tuple[float, List[dict]]]:
+        """(recorded_at, rows) for the latest snapshot at or before *at*, or None."""
+        return await asyncio.to_thread(self._board_at, tournament_id, at)
+
+    def _board_at(self, tournament_id: str, at: float) -> Optional[Tuple[float, List[dict]]]:
+        block = next(self._iter_blocks(tournament_id, at, at), None)
+        if block is None:
+            return None
+        start, rows, deltas = block
+        recorded_at = start
+        for ts, changed, removed in deltas:
+            if ts > at:
+                break
+            rows = _apply(rows, changed, removed)
+            recorded_at = ts
+        return recorded_at, list(rows.values())
+
+    def iter_changes(self, tournament_id: str, start: float, end: float) -> Iterator[dict]:
+        """
+        Yield the board at *start* (``full``) and then every change up to *end*.
+
+        Blocks are decoded lazily, one at a time, as the iterator advances.
+        This reads files; iterate it off the event loop (Starlette runs sync
+        streaming iterators in its thread pool).
+        """
+        board = self._board_at(tournament_id, start)
+        rows: Rows = index_rows(board[1]) if board is not None else {}
+        if board is not None:
+            yield {"ts": board[0], "full": True, "changed": board[1], "removed": []}
+        for block_start, base, deltas in self._iter_blocks(tournament_id, start, end):
+            records = [(block_start, None, base)] + [(ts, (changed, removed), None) for ts, changed, removed in deltas]
+            for ts, delta, full in records:
+                if ts <= start or ts > end:
+                    continue
+                if delta is None:
+                    changed, removed = _delta(rows, full)
+                    rows = dict(full)
+                else:
+                    changed, removed = delta
+                    rows = _apply(rows, changed, removed)
+                if changed or removed:
+                    yield {"ts": ts, "full": False, "changed": list(changed.values()), "removed": removed}
+
+    def _iter_blocks(self, tournament_id: str, start: float, end: float) -> Iterator[Block]:
+        """Blocks overlapping [start, end], starting with the one that covers *start*."""
+        sources: List[Any] = list(self._entries(tournament_id))
+        pending = self._pending.get(tournament_id)
+        if pending is not None:
+            sources.append(pending)
+        first = max(0, bisect.bisect_right([s.start for s in sources], start) - 1)
+        for source in sources[first:]:
+            if source.start > end:
+                return
+            if isinstance(source, _Pending):
+                yield source.start, source.base, source.deltas
+            else:
+                yield self._read_block(tournament_id, source)
+
+    def _read_block(self, tournament_id: str, entry: _IndexEntry) -> Block:
+        key = (tournament_id, entry.segment, entry.offset)
+        with self._lock:
+            block = self._blocks.get(key)
+            if block is not None:
+                self._blocks.move_to_end(key)
+                return block
+        with open(os.path.join(self._dir(tournament_id), entry.segment), "rb") as fh:
+            fh.seek(entry.offset)
+            payload = json.loads(zlib.decompress(fh.read(entry.length)))
+        block = (payload["start"], payload["base"], [tuple(d) for d in payload["deltas"]])
+        with self._lock:
+            self._counters["blocks_read"] += 1
+            self._blocks[key] = block
+            while len(self._blocks) > self.block_cache_size:
+                self._blocks.popitem(last=False)
+        return block
+
+    # ------------------------------------------------------------------
+    # Index
+    # ------------------------------------------------------------------
+
+    def _dir(self, tournament_id: str) -> str:
+        return os.path.join(self.root, "t_" + re.sub(r"[^A-Za-z0-9_-]", "_", tournament_id))
+
+    def _entries(self, tournament_id: str) -> List[_IndexEntry]:
+        """Index entries by block start, re-reading lines other workers appended."""
+        path = os.path.join(self._dir(tournament_id), "index.jsonl")
+        try:
+            size = os.path.getsize(path)
+        except FileNotFoundError:
+            size = 0
+        with self._lock:
+            index = self._index.get(tournament_id)
+            if index is None or size < index.size:
+                index = self._index[tournament_id] = _Index([], 0)
+            if size > index.size:
+                with open(path, "rb") as fh:
+                    fh.seek(index.size)
+                    chunk = fh.read(size - index.size)
+                complete = chunk[: chunk.rfind(b"\n") + 1]  # skip a line still being written
+                added = [_IndexEntry(*json.loads(line)) for line in complete.splitlines() if line.strip()]
+                # A new list, so threads iterating the previous one are unaffected
+                index.entries = sorted(index.entries + added, key=lambda e: e.start)
+                index.size += len(complete)
+            return index.entries
+
+    def stats(self) -> dict:
+        return {
+            **self._counters,
+            "enabled": self.enabled,
+            "pending": {tid: len(p.deltas) + 1 for tid, p in self._pending.items()},
+        }
+
+
+archive = LeaderboardArchive(
+    root=settings.leaderboard_archive_path,
+    block_records=settings.leaderboard_archive_block_records,
+    flush_interval=settings.leaderboard_archive_flush_interval,
+    segment_bytes=settings.leaderboard_archive_segment_bytes,
+    enabled=settings.leaderboard_archive_enabled,
+)
@@ -0,0 +1,102 @@
+"""
+Row-level diffs between two Stats API leaderboard payloads.
+
+Rows are matched by player (``playerId``, falling back to ``playerName``)
+and compared on the fields that move during a round: position, score and
+thru. Attribute names match the ``LeaderboardUpdate`` GraphQL type so diff
+objects can be returned from resolvers as-is.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+TRACKED_FIELDS = ("position", "score", "thru")
+
+
+@dataclass(frozen=True)
+class RowChange:
+    player_key: str
+    player_name: Optional[str]
+    position: Optional[int]
+    score: Optional[str]
+    thru: Optional[str]
+
+
+@dataclass(frozen=True)
+class LeaderboardUpdate:
+    tournament_id: str
+    version: int
+    full: bool
+    changed: List[RowChange] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+
+
+@dataclass(frozen=True)
+class LeaderboardDelta:
+    """Changes since a client-supplied version (ETag) of a leaderboard."""
+
+    tournament_id: str
+    version: int
+    etag: str
+    not_modified: bool
+    full: bool = False
+    changed: List[RowChange] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+
+
+def player_key(entry: dict) -> str:
+    return str(entry.get("playerId") or entry.get("playerName") or "")
+
+
+def _as_str(value: Any) -> Optional[str]:
+    return None if value is None else str(value)
+
+
+def row_change(entry: dict) -> RowChange:
+    return RowChange(
+        player_key=player_key(entry),
+        player_name=entry.get("playerName"),
+        position=entry.get("position"),
+        score=_as_str(entry.get("score")),
+        thru=_as_str(entry.get("thru")),
+    )
+
+
+def index_rows(entries: Any) -> Dict[str, dict]:
+    """Map player key -> row for a leaderboard payload (non-list payloads are empty)."""
+    if not isinstance(entries, list):
+        return {}
+    return {player_key(e): e for e in entries if isinstance(e, dict)}
+
+
+def diff_rows(old: Dict[str, dict], new: Dict[str, dict]) -> tuple[List[RowChange], List[str]]:
+    """Return (changed rows, removed player keys) going from *old* to *new*."""
+    changed = [
+        row_change(row)
+        for key, row in new.items()
+        if key not in old or any(old[key].get(f) != row.get(f) for f in TRACKED_FIELDS)
+    ]
+    removed = [key for key in old if key not in new]
+    return changed, removed
+
+
+def full_update(tournament_id: str, version: int, rows: Dict[str, dict]) -> LeaderboardUpdate:
+    return LeaderboardUpdate(
+        tournament_id=tournament_id,
+        version=version,
+        full=True,
+        changed=[row_change(r) for r in rows.values()],
+    )
+
+
+def board_etag(rows: Dict[str, dict]) -> str:
+    """Content hash of the tracked fields; identical boards share an ETag across workers."""
+    canonical = sorted(
+        [key] + [_as_str(row.get(f)) for f in TRACKED_FIELDS] for key, row in rows.items()
+    )
+    digest = hashlib.sha1(json.dumps(canonical, separators=(",", ":")).encode("utf-8"))
+    return digest.hexdigest()[:16]
@@ -0,0 +1,174 @@
+"""
+Fan-out hub for live leaderboard diffs.
+
+Each published leaderboard is diffed once against the previous one for that
+tournament; the resulting immutable :class:`LeaderboardUpdate` is handed to
+every subscriber queue as the same object, so no per-client diffing or
+conversion happens. A subscriber that falls behind gets its queue replaced
+by a single full snapshot instead of an unbounded backlog.
+
+The hub also keeps a short ring buffer of recent versions per tournament so
+polling clients can ask for the changes since the ETag they last saw. At
+most ``max_tournaments`` boards are kept; the least recently published
+tournament without subscribers is forgotten first.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections import OrderedDict, deque
+from typing import Any, Deque, Dict, Optional, Sequence, Set, Tuple, Union
+
+from app.core.config import settings
+from app.services.leaderboard_diff import (
+    LeaderboardDelta,
+    LeaderboardUpdate,
+    board_etag,
+    diff_rows,
+    full_update,
+    index_rows,
+)
+
+logger = logging.getLogger("caddystats.leaderboard_hub")
+
+
+class LeaderboardHub:
+    def __init__(self, queue_size: int = 32, history_size: int = 20, max_tournaments: int = 64) -> None:
+        self.queue_size = queue_size
+        self.history_size = history_size
+        self.max_tournaments = max_tournaments
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = {}
+        # tournament -> latest rows, least recently published first
+        self._rows: "OrderedDict[str, Dict[str, dict]]" = OrderedDict()
+        self._versions: Dict[str, int] = {}
+        # tournament -> recent (version, etag, rows), oldest first
+        self._history: Dict[str, Deque[Tuple[int, str, Dict[str, dict]]]] = {}
+        self._counters = {"published": 0, "diffs_sent": 0, "resyncs": 0, "deltas": 0, "not_modified": 0, "evicted": 0}
+
+    def subscribe(self, tournament_id: str) -> asyncio.Queue:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers.setdefault(tournament_id, set()).add(queue)
+        return queue
+
+    def unsubscribe(self, tournament_id: str, queue: asyncio.Queue) -> None:
+        subscribers = self._subscribers.get(tournament_id)
+        if subscribers is not None:
+            subscribers.discard(queue)
+            if not subscribers:
+                del self._subscribers[tournament_id]
+
+    def subscriber_count(self, tournament_id: str) -> int:
+        return len(self._subscribers.get(tournament_id, ()))
+
+    def has_board(self, tournament_id: str) -> bool:
+        return tournament_id in self._rows
+
+    def snapshot(self, tournament_id: str) -> Optional[LeaderboardUpdate]:
+        """Full-board update for the latest published version, or None."""
+        rows = self._rows.get(tournament_id)
+        if rows is None:
+            return None
+        return full_update(tournament_id, self._versions[tournament_id], rows)
+
+    def publish(self, tournament_id: str, data: Any) -> Optional[LeaderboardUpdate]:
+        """Diff *data* against the last board and broadcast it; returns None if unchanged."""
+        new_rows = index_rows(data)
+        old_rows = self._rows.get(tournament_id)
+        if old_rows is None:
+            changed, removed = diff_rows({}, new_rows)
+        else:
+            changed, removed = diff_rows(old_rows, new_rows)
+            if not changed and not removed:
+                return None
+
+        version = self._versions.get(tournament_id, 0) + 1
+        self._versions[tournament_id] = version
+        self._rows[tournament_id] = new_rows
+        self._rows.move_to_end(tournament_id)
+        history = self._history.setdefault(tournament_id, deque(maxlen=self.history_size))
+        history.append((version, board_etag(new_rows), new_rows))
+        update = LeaderboardUpdate(
+            tournament_id=tournament_id,
+            version=version,
+            full=old_rows is None,
+            changed=changed,
+            removed=removed,
+        )
+        self._counters["published"] += 1
+        for queue in self._subscribers.get(tournament_id, ()):
+            self._deliver(queue, update)
+        self._evict()
+        return update
+
+    def forget(self, tournament_id: str) -> None:
+        """Drop the board, version and history kept for *tournament_id*."""
+        self._rows.pop(tournament_id, None)
+        self._versions.pop(tournament_id, None)
+        self._history.pop(tournament_id, None)
+
+    def _evict(self) -> None:
+        excess = len(self._rows) - self.max_tournaments
+        if excess <= 0:
+            return
+        # Boards with live subscribers are kept even over the limit
+        idle = [tid for tid in self._rows if tid not in self._subscribers][:excess]
+        for tournament_id in idle:
+            self.forget(tournament_id)
+            self._counters["evicted"] += 1
+
+    def current_etag(self, tournament_id: str) -> Optional[str]:
+        history = self._history.get(tournament_id)
+        return history[-1][1] if history else None
+
+    def delta_since(
+        self, tournament_id: str, since: Union[str, Sequence[str], None]
+    ) -> Optional[LeaderboardDelta]:
+        """
+        Changes from the version identified by ETag *since* to the latest one.
+
+        *since* may also be several ETags (an If-None-Match list; ``*``
+        matches any version). Returns ``not_modified`` when one of them is
+        current, a row-level diff from the newest one still in the ring
+        buffer, and the full board when none is known or all have aged out.
+        None if no board has been published.
+        """
+        history = self._history.get(tournament_id)
+        if not history:
+            return None
+        known = {since} if isinstance(since, str) else set(since or ())
+        version, etag, rows = history[-1]
+        if etag in known or "*" in known:
+            self._counters["not_modified"] += 1
+            return LeaderboardDelta(tournament_id, version, etag, not_modified=True)
+        self._counters["deltas"] += 1
+        base = next((old for _v, old_etag, old in reversed(history) if old_etag in known), None)
+        if base is None:
+            full = full_update(tournament_id, version, rows)
+            return LeaderboardDelta(tournament_id, version, etag, not_modified=False, full=True, changed=full.changed)
+        changed, removed = diff_rows(base, rows)
+        return LeaderboardDelta(tournament_id, version, etag, not_modified=False, changed=changed, removed=removed)
+
+    def _deliver(self, queue: asyncio.Queue, update: LeaderboardUpdate) -> None:
+        try:
+            queue.put_nowait(update)
+            self._counters["diffs_sent"] += 1
+        except asyncio.QueueFull:
+            # Slow consumer: drop its backlog and resync with one full board
+            while not queue.empty():
+                queue.get_nowait()
+            queue.put_nowait(self.snapshot(update.tournament_id))
+            self._counters["resyncs"] += 1
+
+    def stats(self) -> dict:
+        return {
+            **self._counters,
+            "subscribers": {tid: len(subs) for tid, subs in self._subscribers.items()},
+            "tournaments": len(self._rows),
+        }
+
+
+hub = LeaderboardHub(
+    history_size=settings.stats_leaderboard_history_size,
+    max_tournaments=settings.stats_leaderboard_max_tournaments,
+)
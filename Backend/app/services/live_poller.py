@@ -0,0 +1,211 @@
+"""
+Background poller that keeps live-tournament Stats API data hot in memory.
+
+For every tracked tournament the poller refreshes the leaderboard, featured
+edges, tournament card and odds into :data:`app.services.live_store.live_store`,
+so reads never wait on the upstream and upstream load scales with the
+number of live tournaments rather than with traffic. Polling odds also
+feeds the odds movement history (``app.services.odds_history``) on every
+poll, not only when a request happens to read odds.
+
+The poll interval adapts per tournament: it drops to
+``stats_live_poll_min_interval`` whenever the leaderboard changes and backs
+off towards ``stats_live_poll_max_interval`` while it stays the same (or
+while the upstream is failing). Leaderboard changes are also published to
+the subscription hub (``app.services.leaderboard_hub``).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import Dict, Iterable, Optional
+
+from app.core.config import settings
+from app.services import stats_api_client
+from app.services.leaderboard_hub import hub
+from app.services.live_store import LiveStore, live_store
+
+logger = logging.getLogger("caddystats.live_poller")
+
+LIVE_ENDPOINTS = ("leaderboard", "featured_edges", "tournament_card", "odds")
+
+
+class _TournamentState:
+    __slots__ = ("interval", "next_due", "polls", "changes", "errors", "last_error", "last_success")
+
+    def __init__(self, interval: float) -> None:
+        self.interval = interval
+        self.next_due = 0.0
+        self.polls = 0
+        self.changes = 0
+        self.errors = 0
+        self.last_error: Optional[str] = None
+        self.last_success: Optional[float] = None
+
+
+class LivePoller:
+    def __init__(
+        self,
+        store: LiveStore,
+        min_interval: float,
+        max_interval: float,
+        backoff: float = 1.5,
+    ) -> None:
+        self.store = store
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self._state: Dict[str, _TournamentState] = {}
+        self._pinned: set[str] = set()
+        self._retained: Dict[str, int] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._wake = asyncio.Event()
+
+    # ------------------------------------------------------------------
+    # Tracked tournaments
+    # ------------------------------------------------------------------
+
+    def track(self, tournament_id: str) -> None:
+        """Start polling *tournament_id* (no-op if already tracked)."""
+        if tournament_id not in self._state:
+            self._state[tournament_id] = _TournamentState(self.min_interval)
+            self._wake.set()
+
+    def untrack(self, tournament_id: str) -> None:
+        """Stop polling *tournament_id* and drop its hot data."""
+        if self._state.pop(tournament_id, None) is not None:
+            self.store.discard(tournament_id)
+
+    def set_tournaments(self, tournament_ids: Iterable[str]) -> None:
+        """Replace the configured set of live tournaments."""
+        self._pinned = set(tournament_ids)
+        for tid in list(self._state):
+            if tid not in self._pinned and not self._retained.get(tid):
+                self.untrack(tid)
+        for tid in self._pinned:
+            self.track(tid)
+
+    def retain(self, tournament_id: str) -> None:
+        """Poll *tournament_id* while at least one subscriber holds it."""
+        self._retained[tournament_id] = self._retained.get(tournament_id, 0) + 1
+        self.track(tournament_id)
+
+    def release(self, tournament_id: str) -> None:
+        remaining = self._retained.get(tournament_id, 0) - 1
+        if remaining > 0:
+            self._retained[tournament_id] = remaining
+            return
+        self._retained.pop(tournament_id, None)
+        if tournament_id not in self._pinned:
+            self.untrack(tournament_id)
+
+    @property
+    def tournaments(self) -> list[str]:
+        return sorted(self._state)
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._wake = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            now = time.monotonic()
+            due = [tid for tid, st in self._state.items() if st.next_due <= now]
+            if due:
+                await asyncio.gather(*(self.poll_once(tid) for tid in due))
+                continue
+            next_due = min((st.next_due for st in self._state.values()), default=None)
+            timeout = None if next_due is None else max(0.0, next_due - now)
+            self._wake.clear()
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    # ------------------------------------------------------------------
+    # Polling
+    # ------------------------------------------------------------------
+
+    async def poll_once(self, tournament_id: str) -> bool:
+        """Refresh every live endpoint for one tournament; returns True if the leaderboard changed."""
+        state = self._state.get(tournament_id)
+        if state is None:
+            return False
+        previous = self.store.get("leaderboard", tournament_id)
+        results = await asyncio.gather(
+            *(stats_api_client.refresh(endpoint, tournament_id) for endpoint in LIVE_ENDPOINTS),
+            return_exceptions=True,
+        )
+        state.polls += 1
+        changed = False
+        failed: Optional[BaseException] = None
+        for endpoint, result in zip(LIVE_ENDPOINTS, results):
+            if isinstance(result, BaseException):
+                failed = result
+                continue
+            if endpoint == "leaderboard":
+                # A 304 revalidation hands back the identical parsed object
+                changed = previous is None or (previous.data is not result and previous.data != result)
+                if changed:
+                    hub.publish(tournament_id, result)
+            self.store.put(endpoint, tournament_id, result)
+
+        if failed is not None:
+            state.errors += 1
+            state.last_error = f"{type(failed).__name__}: {failed}"
+            logger.warning("Live poll failed for tournament %s: %s", tournament_id, state.last_error)
+        else:
+            state.last_error = None
+            state.last_success = time.time()
+
+        if changed:
+            state.changes += 1
+            state.interval = self.min_interval
+        else:
+            state.interval = min(self.max_interval, state.interval * self.backoff)
+        state.next_due = time.monotonic() + state.interval
+        return changed
+
+    def freshness(self) -> dict:
+        """Per-tournament freshness report (data age per endpoint, poll interval, errors)."""
+        report = {}
+        for tid, st in self._state.items():
+            ages = {}
+            for endpoint in LIVE_ENDPOINTS:
+                snap = self.store.get(endpoint, tid)
+                ages[endpoint] = round(snap.age, 3) if snap is not None else None
+            report[tid] = {
+                "age_s": ages,
+                "interval_s": round(st.interval, 3),
+                "polls": st.polls,
+                "changes": st.changes,
+                "errors": st.errors,
+                "last_error": st.last_error,
+                "last_success": st.last_success,
+            }
+        return {"running": self._task is not None and not self._task.done(), "tournaments": report}
+
+
+poller = LivePoller(
+    live_store,
+    min_interval=settings.stats_live_poll_min_interval,
+    max_interval=settings.stats_live_poll_max_interval,
+    backoff=settings.stats_live_poll_backoff,
+)
+poller.set_tournaments(settings.stats_live_tournaments)
@@ -0,0 +1,46 @@
+"""
+In-process store of Stats API payloads kept hot by the live-tournament poller.
+
+The poller (``app.services.live_poller``) writes here; ``stats_api_client``
+reads here before touching its cache or the upstream.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Any, Dict, Optional, Tuple
+
+
+class LiveSnapshot:
+    __slots__ = ("data", "fetched_at")
+
+    def __init__(self, data: Any, fetched_at: float) -> None:
+        self.data = data
+        self.fetched_at = fetched_at
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.fetched_at
+
+
+class LiveStore:
+    def __init__(self) -> None:
+        self._data: Dict[Tuple[str, str], LiveSnapshot] = {}
+
+    def get(self, endpoint: str, tournament_id: str) -> Optional[LiveSnapshot]:
+        return self._data.get((endpoint, tournament_id))
+
+    def put(self, endpoint: str, tournament_id: str, data: Any) -> LiveSnapshot:
+        snapshot = LiveSnapshot(data, time.time())
+        self._data[(endpoint, tournament_id)] = snapshot
+        return snapshot
+
+    def discard(self, tournament_id: str) -> None:
+        for key in [k for k in self._data if k[1] == tournament_id]:
+            del self._data[key]
+
+    def clear(self) -> None:
+        self._data.clear()
+
+
+live_store = LiveStore()
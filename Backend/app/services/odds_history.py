@@ -0,0 +1,398 @@
+"""
+Odds movement time series per (golfer, book, market).
+
+Every odds payload fetched through the Stats gateway is compared against
+the last price per series; only changed prices become ticks. For
+tournaments tracked by the live poller odds are fetched on every poll, so
+their history has no gaps; other tournaments are only recorded when a
+request (e.g. ``/api/betting-edges``) fetches their odds. Ticks are
+buffered and ingested in batches into column arrays (timestamp, series,
+odds, implied probability), and each batch is folded into precomputed OHLC
+buckets at 5-minute and 1-hour resolution with NumPy group reductions.
+
+Retention is tiered: raw ticks are kept for ``odds_history_raw_retention``
+seconds, 5-minute buckets for ``odds_history_5m_retention`` and hourly
+buckets for as long as the tournament is kept. At most
+``odds_history_max_tournaments`` tournaments are kept; the one whose odds
+were least recently recorded is dropped first. "Movement since open" and sparkline
+queries read the per-series open/last prices and the buckets; only an
+explicit ``raw`` sparkline touches the (recent) raw ticks.
+
+History lives in process memory and is per worker: it is lost on restart
+and each uvicorn worker keeps its own. "Open" therefore means the first
+price this worker saw, reported as :meth:`OddsHistory.tracked_since`.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from collections import OrderedDict, defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.core.config import settings
+from app.services.odds_normalization import implied_probability, price_of
+
+logger = logging.getLogger("caddystats.odds_history")
+
+RESOLUTIONS = {"5m": 300, "1h": 3600}
+_COMPACT_EVERY = 60.0  # seconds between retention sweeps
+
+SeriesKey = Tuple[str, str, str]  # (golfer, book, market)
+
+
+class _Columns:
+    """Growable set of equal-length NumPy columns."""
+
+    def __init__(self, dtypes: Dict[str, Any], capacity: int = 1024) -> None:
+        self._data = {name: np.empty(capacity, dtype=dtype) for name, dtype in dtypes.items()}
+        self.size = 0
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self._data[name][: self.size]
+
+    def append(self, **columns: np.ndarray) -> np.ndarray:
+        """Append rows; returns their row indexes."""
+        n = len(next(iter(columns.values())))
+        needed = self.size + n
+        capacity = len(next(iter(self._data.values())))
+        if needed > capacity:
+            capacity = max(needed, capacity * 2)
+            for name, column in self._data.items():
+                grown = np.empty(capacity, dtype=column.dtype)
+                grown[: self.size] = column[: self.size]
+                self._data[name] = grown
+        for name, values in columns.items():
+            self._data[name][self.size : needed] = values
+        rows = np.arange(self.size, needed)
+        self.size = needed
+        return rows
+
+    def keep(self, mask: np.ndarray) -> None:
+        for name, column in self._data.items():
+            kept = column[: self.size][mask]
+            column[: kept.size] = kept
+        self.size = int(mask.sum())
+
+
+_TICK_COLUMNS = {"ts": np.float64, "series": np.int32, "odds": np.float64, "prob": np.float64}
+_BUCKET_COLUMNS = {
+    "start": np.float64, "series": np.int32, "count": np.int32,
+    "open": np.float64, "high": np.float64, "low": np.float64, "close": np.float64,
+    "odds_open": np.float64, "odds_close": np.float64,
+}
+
+
+class _Buckets:
+    """OHLC buckets of implied probability at one resolution."""
+
+    def __init__(self, width: int) -> None:
+        self.width = width
+        self.table = _Columns(_BUCKET_COLUMNS)
+        self._row: Dict[Tuple[int, float], int] = {}  # (series, bucket start) -> row
+        self._by_series: Dict[int, List[int]] = defaultdict(list)  # rows in time order
+
+    def ingest(self, ts: np.ndarray, series: np.ndarray, odds: np.ndarray, prob: np.ndarray) -> None:
+        start = np.floor(ts / self.width) * self.width
+        order = np.lexsort((ts, start, series))
+        ts, series, odds, prob, start = ts[order], series[order], odds[order], prob[order], start[order]
+        first = np.flatnonzero(np.r_[True, (series[1:] != series[:-1]) | (start[1:] != start[:-1])])
+        last = np.r_[first[1:], series.size] - 1
+        high = np.maximum.reduceat(prob, first)
+        low = np.minimum.reduceat(prob, first)
+        counts = last - first + 1
+
+        t = self.table
+        fresh = []
+        for g, i in enumerate(first):
+            key = (int(series[i]), float(start[i]))
+            row = self._row.get(key)
+            if row is None:
+                fresh.append(g)
+                continue
+            # Later ticks for a bucket that is already open
+            t["high"][row] = max(t["high"][row], high[g])
+            t["low"][row] = min(t["low"][row], low[g])
+            t["close"][row] = prob[last[g]]
+            t["odds_close"][row] = odds[last[g]]
+            t["count"][row] += counts[g]
+        if fresh:
+            f = np.array(fresh)
+            rows = t.append(
+                start=start[first[f]], series=series[first[f]], count=counts[f],
+                open=prob[first[f]], high=high[f], low=low[f], close=prob[last[f]],
+                odds_open=odds[first[f]], odds_close=odds[last[f]],
+            )
+            for g, row in zip(fresh, rows):
+                key = (int(series[first[g]]), float(start[first[g]]))
+                self._row[key] = int(row)
+                self._by_series[key[0]].append(int(row))
+
+    def drop_before(self, cutoff: float) -> None:
+        mask = self.table["start"] >= cutoff - self.width
+        if mask.all():
+            return
+        self.table.keep(mask)
+        self._reindex()
+
+    def _reindex(self) -> None:
+        self._row.clear()
+        self._by_series.clear()
+        order = np.lexsort((self.table["start"], self.table["series"]))
+        for row in order:
+            key = (int(self.table["series"][row]), float(self.table["start"][row]))
+            self._row[key] = int(row)
+            self._by_series[key[0]].append(int(row))
+
+    def points(self, series: int, since: Optional[float]) -> List[dict]:
+        t = self.table
+        rows = np.array(self._by_series.get(series, []), dtype=np.int64)
+        if since is not None and rows.size:
+            rows = rows[t["start"][rows] + self.width > since]
+        return [
+            {
+                "ts": float(t["start"][r]),
+                "open": round(float(t["open"][r]), 5),
+                "high": round(float(t["high"][r]), 5),
+                "low": round(float(t["low"][r]), 5),
+                "close": round(float(t["close"][r]), 5),
+                "oddsOpen": float(t["odds_open"][r]),
+                "oddsClose": float(t["odds_close"][r]),
+                "ticks": int(t["count"][r]),
+            }
+            for r in rows
+        ]
+
+
+class _TournamentOdds:
+    def __init__(self) -> None:
+        self.series: Dict[SeriesKey, int] = {}
+        self.keys: List[SeriesKey] = []
+        self.last: Dict[int, float] = {}  # series -> last odds value
+        # series -> (opened_at, open odds, open prob, updated_at, odds, prob)
+        self.lines: Dict[int, List[float]] = {}
+        self.ticks = _Columns(_TICK_COLUMNS)
+        self.buckets = {name: _Buckets(width) for name, width in RESOLUTIONS.items()}
+        self.pending: List[Tuple[float, int, float, int]] = []  # (ts, series, odds, format)
+        self.pending_since: Optional[float] = None
+        self.tracked_since: Optional[float] = None  # first payload this worker saw
+
+    def series_id(self, key: SeriesKey) -> int:
+        sid = self.series.get(key)
+        if sid is None:
+            sid = self.series[key] = len(self.keys)
+            self.keys.append(key)
+        return sid
+
+
+class OddsHistory:
+    def __init__(
+        self,
+        batch_size: int = 500,
+        flush_interval: float = 5.0,
+        raw_retention: float = 6 * 3600,
+        five_minute_retention: float = 48 * 3600,
+        max_tournaments: int = 32,
+        enabled: bool = True,
+    ) -> None:
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.raw_retention = raw_retention
+        self.five_minute_retention = five_minute_retention
+        self.max_tournaments = max_tournaments
+        self.enabled = enabled
+        # tournament -> history, least recently recorded first
+        self._tournaments: "OrderedDict[str, _TournamentOdds]" = OrderedDict()
+        self._last_compaction = 0.0
+        self._counters = {"payloads": 0, "ticks": 0, "unchanged": 0, "batches": 0, "evicted": 0}
+
+    # ------------------------------------------------------------------
+    # Ingestion
+    # ------------------------------------------------------------------
+
+    def record(self, tournament_id: str, data: Any, at: Optional[float] = None) -> int:
+        """Queue a tick for every price that moved; returns the number of ticks."""
+        if not self.enabled or not isinstance(data, list):
+            return 0
+        at = time.time() if at is None else at
+        state = self._tournaments.get(tournament_id)
+        if state is None:
+            state = self._tournaments[tournament_id] = _TournamentOdds()
+            state.tracked_since = at
+            self._evict()
+        else:
+            self._tournaments.move_to_end(tournament_id)
+        ticks = 0
+        for row in data:
+            if not isinstance(row, dict) or row.get("odds") is None:
+                continue
+            try:
+                value, fmt = price_of(row)
+            except (TypeError, ValueError, ArithmeticError):
+                continue
+            if np.isnan(value):
+                continue  # unparseable price
+            sid = state.series_id((str(row.get("golferId")), str(row.get("book")), str(row.get("market"))))
+            if state.last.get(sid) == value:
+                continue
+            state.last[sid] = value
+            state.pending.append((at, sid, value, fmt))
+            ticks += 1
+        self._counters["payloads"] += 1
+        self._counters["ticks"] += ticks
+        if not ticks:
+            self._counters["unchanged"] += 1
+        if state.pending and state.pending_since is None:
+            state.pending_since = at
+        if len(state.pending) >= self.batch_size or (
+            state.pending_since is not None and at - state.pending_since >= self.flush_interval
+        ):
+            self._flush(state)
+        return ticks
+
+    def _evict(self) -> None:
+        while len(self._tournaments) > self.max_tournaments:
+            self._tournaments.popitem(last=False)
+            self._counters["evicted"] += 1
+
+    def flush(self, tournament_id: Optional[str] = None) -> None:
+        if tournament_id is None:
+            targets = list(self._tournaments.values())
+        else:
+            targets = [s for s in (self._tournaments.get(tournament_id),) if s is not None]
+        for state in targets:
+            self._flush(state)
+
+    def _flush(self, state: _TournamentOdds) -> None:
+        if not state.pending:
+            return
+        ts, series, odds, formats = (np.array(c) for c in zip(*state.pending))
+        state.pending = []
+        state.pending_since = None
+        series = series.astype(np.int32)
+        prob = implied_probability(odds, formats)
+
+        state.ticks.append(ts=ts, series=series, odds=odds, prob=prob)
+        for buckets in state.buckets.values():
+            buckets.ingest(ts, series, odds, prob)
+        for t, sid, value, p in zip(ts.tolist(), series.tolist(), odds.tolist(), prob.tolist()):
+            line = state.lines.get(sid)
+            if line is None:
+                state.lines[sid] = [t, value, p, t, value, p]
+            else:
+                line[3:] = [t, value, p]
+        self._counters["batches"] += 1
+        # Retention is measured against the newest tick, not the wall clock
+        newest = float(ts.max())
+        if newest - self._last_compaction >= _COMPACT_EVERY:
+            self.compact(newest)
+
+    def compact(self, now: Optional[float] = None) -> None:
+        """Apply retention: drop old raw ticks and old 5-minute buckets."""
+        now = time.time() if now is None else now
+        self._last_compaction = now
+        for state in self._tournaments.values():
+            ticks = state.ticks["ts"] >= now - self.raw_retention
+            if not ticks.all():
+                state.ticks.keep(ticks)
+            state.buckets["5m"].drop_before(now - self.five_minute_retention)
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def tracked_since(self, tournament_id: str) -> Optional[float]:
+        """When this worker first recorded odds for *tournament_id* (None if never)."""
+        state = self._tournaments.get(tournament_id)
+        return state.tracked_since if state is not None else None
+
+    def movement(
+        self,
+        tournament_id: str,
+        market: Optional[str] = None,
+        book: Optional[str] = None,
+    ) -> List[dict]:
+        """Line movement since open per series, largest implied-probability move first."""
+        self.flush(tournament_id)
+        state = self._tournaments.get(tournament_id)
+        if state is None:
+            return []
+        rows = []
+        for sid, (opened_at, open_odds, open_prob, updated_at, odds, prob) in state.lines.items():
+            golfer, series_book, series_market = state.keys[sid]
+            if (market and series_market != market) or (book and series_book != book):
+                continue
+            rows.append({
+                "golferId": golfer,
+                "book": series_book,
+                "market": series_market,
+                "openedAt": opened_at,
+                "openOdds": open_odds,
+                "openProbability": round(open_prob, 5),
+                "updatedAt": updated_at,
+                "odds": odds,
+                "impliedProbability": round(prob, 5),
+                "probabilityChange": round(prob - open_prob, 5),
+            })
+        rows.sort(key=lambda r: abs(r["probabilityChange"]), reverse=True)
+        return rows
+
+    def sparkline(
+        self,
+        tournament_id: str,
+        golfer_id: str,
+        book: str,
+        market: str,
+        resolution: str = "5m",
+        since: Optional[float] = None,
+    ) -> List[dict]:
+        """
+        OHLC buckets of implied probability for one series.
+
+        *resolution* is ``5m`` or ``1h``; ``raw`` returns the individual
+        ticks still inside the raw retention window.
+        """
+        if resolution != "raw" and resolution not in RESOLUTIONS:
+            raise ValueError(f"Unknown resolution: {resolution!r}")
+        self.flush(tournament_id)
+        state = self._tournaments.get(tournament_id)
+        sid = state.series.get((golfer_id, book, market)) if state is not None else None
+        if sid is None:
+            return []
+        if resolution != "raw":
+            return state.buckets[resolution].points(sid, since)
+        ticks = state.ticks
+        mask = ticks["series"] == sid
+        if since is not None:
+            mask &= ticks["ts"] >= since
+        return [
+            {"ts": t, "odds": o, "probability": round(p, 5)}
+            for t, o, p in zip(ticks["ts"][mask].tolist(), ticks["odds"][mask].tolist(), ticks["prob"][mask].tolist())
+        ]
+
+    def stats(self) -> dict:
+        return {
+            **self._counters,
+            "enabled": self.enabled,
+            "tournaments": {
+                tid: {
+                    "series": len(s.keys),
+                    "raw_ticks": s.ticks.size,
+                    "buckets": {name: b.table.size for name, b in s.buckets.items()},
+                    "pending": len(s.pending),
+                }
+                for tid, s in self._tournaments.items()
+            },
+        }
+
+
+odds_history = OddsHistory(
+    batch_size=settings.odds_history_batch_size,
+    flush_interval=settings.odds_history_flush_interval,
+    raw_retention=settings.odds_history_raw_retention,
+    five_minute_retention=settings.odds_history_5m_retention,
+    max_tournaments=settings.odds_history_max_tournaments,
+    enabled=settings.odds_history_enabled,
+)
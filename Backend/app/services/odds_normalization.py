@@ -0,0 +1,208 @@
+"""
+Batch odds normalization and bookmaker-margin (vig) removal.
+
+All functions work on NumPy arrays covering a whole field at once:
+
+* ``to_decimal`` / ``implied_probability`` convert American, decimal and
+  fractional prices (mixed formats allowed via a per-row format code);
+* ``remove_vig`` strips the overround from every (book, market) group in a
+  single call using the multiplicative, additive, power or Shin method;
+* ``consensus`` averages no-vig probabilities across books per
+  (golfer, market).
+
+Multi-winner markets (top 5/10/20) sum to their number of places rather
+than 1; ``MARKET_PLACES`` gives that target. Groups without a target (e.g.
+one-sided make-cut prices) are passed through unchanged.
+"""
+
+from __future__ import annotations
+
+from typing import Optional, Tuple
+
+import numpy as np
+
+FORMATS = ("american", "decimal", "fractional")
+FORMAT_CODES = {name: i for i, name in enumerate(FORMATS)}
+
+METHODS = ("multiplicative", "additive", "power", "shin")
+
+# Market -> number of paying places, i.e. what fair probabilities sum to
+MARKET_PLACES = {"win": 1.0, "top5": 5.0, "top10": 10.0, "top20": 20.0}
+
+_SOLVER_ITERATIONS = 60
+
+
+def fractional_ratio(text: str) -> float:
+    """
+    Parse a fractional price such as ``"5/2"`` (or ``"evens"``) into its
+    ratio; NaN when it cannot be parsed or the denominator is zero.
+    """
+    value = str(text).strip().lower()
+    if value in ("evs", "evens"):
+        return 1.0
+    numerator, slash, denominator = value.partition("/")
+    try:
+        numerator_value = float(numerator)
+        denominator_value = float(denominator) if slash else 1.0
+    except ValueError:
+        return np.nan
+    if denominator_value == 0:
+        return np.nan
+    return numerator_value / denominator_value
+
+
+def price_of(row: dict) -> Tuple[float, int]:
+    """
+    (numeric price, format code) for an odds row; ``oddsFormat`` defaults to
+    American. Unparseable prices come back as NaN.
+    """
+    fmt = FORMAT_CODES.get(str(row.get("oddsFormat") or "american").lower(), FORMAT_CODES["american"])
+    value = row.get("odds")
+    if fmt == FORMAT_CODES["fractional"] and isinstance(value, str):
+        return fractional_ratio(value), fmt
+    try:
+        return float(value), fmt
+    except (TypeError, ValueError):
+        return np.nan, fmt
+
+
+def american_to_decimal(odds: np.ndarray) -> np.ndarray:
+    odds = np.asarray(odds, dtype=np.float64)
+    magnitude = np.maximum(np.abs(odds), 100.0)  # valid American odds are >= 100 in magnitude
+    return 1.0 + np.where(odds > 0, magnitude / 100.0, 100.0 / magnitude)
+
+
+def fractional_to_decimal(ratio: np.ndarray) -> np.ndarray:
+    return 1.0 + np.asarray(ratio, dtype=np.float64)
+
+
+def to_decimal(values: np.ndarray, formats: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Decimal odds for *values*. *formats* is an array of ``FORMAT_CODES``
+    (American when omitted); fractional values are ratios (``5/2`` -> 2.5).
+    """
+    values = np.asarray(values, dtype=np.float64)
+    if formats is None:
+        return american_to_decimal(values)
+    formats = np.asarray(formats)
+    return np.select(
+        [formats == FORMAT_CODES["american"], formats == FORMAT_CODES["fractional"]],
+        [american_to_decimal(values), fractional_to_decimal(values)],
+        default=values,
+    )
+
+
+def implied_probability(values: np.ndarray, formats: Optional[np.ndarray] = None) -> np.ndarray:
+    """Bookmaker implied probability (including margin) for each price."""
+    decimal = to_decimal(values, formats)
+    return np.where(decimal > 1.0, 1.0 / np.maximum(decimal, 1.0), np.nan)
+
+
+def _group_sum(values: np.ndarray, groups: np.ndarray, n_groups: int) -> np.ndarray:
+    return np.bincount(groups, weights=values, minlength=n_groups)
+
+
+def _bisect(residual, lo: np.ndarray, hi: np.ndarray) -> np.ndarray:
+    """Vectorized bisection for per-group roots of a decreasing *residual*."""
+    for _ in range(_SOLVER_ITERATIONS):
+        mid = (lo + hi) / 2.0
+        above = residual(mid) > 0
+        lo = np.where(above, mid, lo)
+        hi = np.where(above, hi, mid)
+    return (lo + hi) / 2.0
+
+
+def _power(p: np.ndarray, groups: np.ndarray, n_groups: int, targets: np.ndarray) -> np.ndarray:
+    # Solve sum(p ** k) == target per group; the sum decreases as k grows
+    def residual(k: np.ndarray) -> np.ndarray:
+        return _group_sum(p ** k[groups], groups, n_groups) - targets
+
+    lo = np.zeros(n_groups)
+    hi = np.ones(n_groups)
+    for _ in range(32):
+        short = residual(hi) > 0
+        if not short.any():
+            break
+        hi = np.where(short, hi * 2.0, hi)
+    k = _bisect(residual, lo, hi)
+    return p ** k[groups]
+
+
+def _shin(p: np.ndarray, groups: np.ndarray, n_groups: int, targets: np.ndarray) -> np.ndarray:
+    # Shin's insider-trading model on the unit-sum scale, rescaled to the target
+    scale = targets[groups]
+    q = p / scale
+    total = _group_sum(q, groups, n_groups)[groups]
+
+    def fair(z: np.ndarray) -> np.ndarray:
+        zg = z[groups]
+        return (np.sqrt(zg * zg + 4.0 * (1.0 - zg) * q * q / total) - zg) / (2.0 * (1.0 - zg))
+
+    def residual(z: np.ndarray) -> np.ndarray:
+        return _group_sum(fair(z), groups, n_groups) - 1.0
+
+    z = _bisect(residual, np.zeros(n_groups), np.full(n_groups, 0.999))
+    return fair(z) * scale
+
+
+def remove_vig(
+    implied: np.ndarray,
+    groups: np.ndarray,
+    method: str = "multiplicative",
+    targets: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """
+    Return fair probabilities with the margin removed per group.
+
+    *groups* assigns each price to a market book (an integer id per
+    book × market); *targets* gives each group's fair total (1 when
+    omitted, NaN to leave a group untouched). Groups priced at or under
+    their target are only rescaled.
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown vig removal method: {method!r}")
+    p = np.asarray(implied, dtype=np.float64)
+    groups = np.asarray(groups, dtype=np.int64)
+    if p.size == 0:
+        return p.copy()
+    if targets is None:
+        targets = np.ones(int(groups.max()) + 1)
+    targets = np.asarray(targets, dtype=np.float64)
+    n_groups = targets.size
+
+    valid = ~np.isnan(p)
+    p_valid = np.where(valid, p, 0.0)
+    totals = _group_sum(p_valid, groups, n_groups)
+    counts = np.bincount(groups, weights=valid.astype(np.float64), minlength=n_groups)
+    solvable = ~np.isnan(targets) & (totals > 0)
+    safe_targets = np.where(solvable, targets, 1.0)
+
+    if method == "multiplicative":
+        fair = p_valid * (safe_targets / np.where(totals > 0, totals, 1.0))[groups]
+    elif method == "additive":
+        margin = (totals - safe_targets) / np.maximum(counts, 1.0)
+        fair = np.clip(p_valid - margin[groups], 0.0, 1.0)
+    else:
+        solver = _power if method == "power" else _shin
+        with np.errstate(invalid="ignore", divide="ignore"):
+            fair = solver(np.clip(p_valid, 0.0, 1.0), groups, n_groups, safe_targets)
+        # Without an overround there is nothing to solve for; just rescale
+        flat = (totals <= safe_targets)[groups]
+        fair = np.where(flat, p_valid * (safe_targets / np.where(totals > 0, totals, 1.0))[groups], fair)
+
+    return np.where(valid & solvable[groups], fair, p)
+
+
+def consensus(probs: np.ndarray, keys: np.ndarray, n_keys: Optional[int] = None) -> np.ndarray:
+    """Mean probability across books per key (e.g. golfer × market), broadcast back per row."""
+    probs = np.asarray(probs, dtype=np.float64)
+    keys = np.asarray(keys, dtype=np.int64)
+    if probs.size == 0:
+        return probs.copy()
+    n_keys = int(keys.max()) + 1 if n_keys is None else n_keys
+    valid = ~np.isnan(probs)
+    sums = np.bincount(keys, weights=np.where(valid, probs, 0.0), minlength=n_keys)
+    counts = np.bincount(keys, weights=valid.astype(np.float64), minlength=n_keys)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        means = sums / counts
+    return means[keys]
@@ -3,7 +3,12 @@ Stat service – orchestrates calls to the external Stats API.
 Populated in Phase 3+ (Backend Core – Stats API).
 """
 
+import heapq
+from typing import Any, List, Optional, Sequence, Union
+
 from app.services import stats_api_client
+from app.services.leaderboard_diff import LeaderboardDelta
+from app.services.leaderboard_hub import hub
 
 
 async def get_leaderboard(tournament_id: str) -> dict:
@@ -13,5 +18,57 @@ async def get_leaderboard(tournament_id: str) -> dict:
 
 async def get_projections(tournament_id: str) -> dict:
     """Fetch projections from the Stats API."""
-    # TODO: replace with stats_api_client.get_projections once endpoint exists
-    return await stats_api_client.get_tournament_card(tournament_id)
+    return await stats_api_client.get_projections(tournament_id)
+
+
+def _sort_key(field: str, nulls_high: bool):
+    # Rows missing the field sort after all others in either direction
+    def key(row: dict):
+        value = row.get(field)
+        return (value is None) == nulls_high, value if value is not None else 0
+    return key
+
+
+def select_projections(
+    rows: Any,
+    fields: Optional[Sequence[str]] = None,
+    sort: Optional[str] = None,
+    limit: Optional[int] = None,
+) -> List[dict]:
+    """
+    Sort, limit and project a projections payload.
+
+    *sort* names a field, prefixed with ``-`` for descending order; with a
+    *limit* only the top rows are selected (heap, not a full sort). *fields*
+    keeps just the named keys of each row.
+    """
+    rows = [r for r in (rows if isinstance(rows, list) else []) if isinstance(r, dict)]
+    if sort:
+        descending = sort.startswith("-")
+        field = sort.lstrip("-+")
+        if descending:
+            key = _sort_key(field, nulls_high=False)
+            rows = heapq.nlargest(limit, rows, key=key) if limit else sorted(rows, key=key, reverse=True)
+        else:
+            key = _sort_key(field, nulls_high=True)
+            rows = heapq.nsmallest(limit, rows, key=key) if limit else sorted(rows, key=key)
+    elif limit:
+        rows = rows[:limit]
+    if fields:
+        rows = [{f: r[f] for f in fields if f in r} for r in rows]
+    return rows
+
+
+async def get_leaderboard_delta(
+    tournament_id: str, since: Union[str, Sequence[str], None]
+) -> Optional[LeaderboardDelta]:
+    """
+    Return leaderboard changes since ETag *since* (or any of several ETags).
+
+    The current board is read through the gateway (live store or cache) and
+    published to the hub, which versions it; the hub's ring buffer then
+    yields "not modified", a row-level diff, or the full board.
+    """
+    result = await stats_api_client.fetch("leaderboard", tournament_id)
+    hub.publish(tournament_id, result.data)
+    return hub.delta_since(tournament_id, since)
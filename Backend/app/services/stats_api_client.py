@@ -2,48 +2,436 @@
 Thin HTTP gateway to the external Stats API.
 
 No local golf-stats tables exist in this database. All stats data is
-fetched from the external Stats API and optionally cached (Redis layer TBD).
+fetched from the external Stats API and cached with stale-while-revalidate
+semantics (see ``app.services.stats_cache``).
+
+One pooled ``httpx.AsyncClient`` is shared per worker process. The FastAPI
+lifespan opens it with :func:`startup` and closes it with :func:`shutdown`;
+scripts and tests that never run the lifespan get a lazily created client
+on first use.
 """
 
+import asyncio
 import logging
-from typing import Any
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Union
+from urllib.parse import quote
 
 import httpx
 
 from app.core.config import settings
+from app.services.leaderboard_archive import archive
+from app.services.live_store import live_store
+from app.services.odds_history import odds_history
+from app.services.stats_cache import cache
+from app.utils.circuit_breaker import CircuitBreaker, CircuitOpenError
+from app.utils.singleflight import SingleFlight
 
 logger = logging.getLogger("caddystats.stats_api")
 
 _BASE = settings.stats_api_url.rstrip("/")
 _TIMEOUT = settings.stats_api_timeout
 
+# Logical endpoint name -> upstream path template
+_ENDPOINT_PATHS = {
+    "leaderboard": "/tournaments/{tournament_id}/leaderboard",
+    "featured_edges": "/tournaments/{tournament_id}/featured-edges",
+    "tournament_card": "/tournaments/{tournament_id}/card",
+    "projections": "/tournaments/{tournament_id}/projections",
+    "odds": "/tournaments/{tournament_id}/odds",
+    "golfers": "/golfers",
+}
+
+_client: Optional[httpx.AsyncClient] = None
+_http2_active = False
+
+# Counters used to derive connection reuse (requests per new TCP connection)
+_pool_counters = {"requests": 0, "connections_opened": 0}
+
+# Concurrent identical upstream requests share one in-flight call
+_flight = SingleFlight()
+
+# Per-endpoint circuit breakers and the last good payload per path
+_breakers: Dict[str, CircuitBreaker] = {}
+_last_good: "OrderedDict[str, tuple[float, Any]]" = OrderedDict()
+
+
+# Conditional requests: path -> (ETag, Last-Modified, parsed body, body size)
+_validators: "OrderedDict[str, tuple[Optional[str], Optional[str], Any, int]]" = OrderedDict()
+_conditional_counters = {
+    "responses_200": 0,
+    "responses_304": 0,
+    "bytes_received": 0,
+    "bytes_saved": 0,
+}
+
+
+@dataclass
+class StatsResult:
+    """Stats API payload plus a staleness marker for last-known-good fallbacks."""
+
+    data: Any
+    stale: bool = False
+    as_of: Optional[float] = None  # epoch seconds of the payload when stale
+
+
+# ---------------------------------------------------------------------------
+# Client lifecycle
+# ---------------------------------------------------------------------------
+
+
+def _http2_enabled() -> bool:
+    """HTTP/2 needs the optional ``h2`` package; fall back to HTTP/1.1 without it."""
+    if not settings.stats_api_http2:
+        return False
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        logger.warning("stats_api_http2 is enabled but 'h2' is not installed; using HTTP/1.1")
+        return False
+    return True
+
+
+def _build_client(transport: Optional[httpx.AsyncBaseTransport] = None) -> httpx.AsyncClient:
+    global _http2_active
+    _http2_active = _http2_enabled()
+    limits = httpx.Limits(
+        max_connections=settings.stats_api_max_connections,
+        max_keepalive_connections=settings.stats_api_max_keepalive_connections,
+        keepalive_expiry=settings.stats_api_keepalive_expiry,
+    )
+    timeout = httpx.Timeout(_TIMEOUT, connect=settings.stats_api_connect_timeout)
+    return httpx.AsyncClient(
+        base_url=_BASE,
+        limits=limits,
+        timeout=timeout,
+        http2=_http2_active,
+        transport=transport,
+    )
+
+
+async def startup(transport: Optional[httpx.AsyncBaseTransport] = None) -> None:
+    """Open the shared client. *transport* lets tests plug in a stand-in upstream."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+    _client = _build_client(transport)
+    logger.info("Stats API client started (base=%s, http2=%s)", _BASE, _http2_active)
+
+
+async def shutdown() -> None:
+    """Close the shared client and release pooled connections."""
+    global _client
+    await cache.close()
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+def _get_client() -> httpx.AsyncClient:
+    global _client
+    if _client is None:
+        _client = _build_client()
+    return _client
+
+
+async def _trace(event_name: str, info: dict) -> None:
+    """httpcore trace hook: count freshly opened TCP connections."""
+    if event_name == "connection.connect_tcp.complete":
+        _pool_counters["connections_opened"] += 1
+
+
+def get_pool_stats() -> dict:
+    """Return a snapshot of connection pool usage for the shared client."""
+    requests = _pool_counters["requests"]
+    opened = _pool_counters["connections_opened"]
+    stats = {
+        "requests": requests,
+        "connections_opened": opened,
+        "reuse_ratio": round(1 - opened / requests, 4) if requests else None,
+        "open_connections": 0,
+        "idle_connections": 0,
+        "http2": _http2_active,
+        "max_connections": settings.stats_api_max_connections,
+        "max_keepalive_connections": settings.stats_api_max_keepalive_connections,
+    }
+    pool = getattr(getattr(_client, "_transport", None), "_pool", None)
+    if pool is not None:
+        connections = list(getattr(pool, "connections", []))
+        stats["open_connections"] = len(connections)
+        stats["idle_connections"] = sum(1 for c in connections if c.is_idle())
+    return stats
+
+
+# ---------------------------------------------------------------------------
+# Requests
+# ---------------------------------------------------------------------------
+
+
+def get_coalescing_stats() -> dict:
+    """Return single-flight counters (calls vs. actual upstream executions)."""
+    return _flight.stats()
+
+
+def get_conditional_stats() -> dict:
+    """Return 200/304 counts and body bytes received vs. saved by revalidation."""
+    c = _conditional_counters
+    total = c["responses_200"] + c["responses_304"]
+    return {
+        **c,
+        "not_modified_rate": round(c["responses_304"] / total, 4) if total else None,
+        "validators": len(_validators),
+    }
+
+
+def _is_upstream_failure(exc: BaseException) -> bool:
+    """4xx responses are caller errors and must not trip the breaker."""
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code >= 500
+    return isinstance(exc, httpx.HTTPError)
+
+
+def _breaker_for(endpoint: Optional[str]) -> CircuitBreaker:
+    name = endpoint or "default"
+    breaker = _breakers.get(name)
+    if breaker is None:
+        breaker = CircuitBreaker(
+            name,
+            failure_threshold=settings.stats_breaker_failure_threshold,
+            reset_timeout=settings.stats_breaker_reset_timeout,
+            slow_call_threshold=settings.stats_breaker_slow_call_threshold,
+            is_failure=_is_upstream_failure,
+        )
+        _breakers[name] = breaker
+    return breaker
+
 
-async def _get(path: str) -> Any:
-    """Issue a GET request to the Stats API; raises on HTTP error."""
+def get_breaker_stats() -> dict:
+    """Return circuit breaker state per endpoint."""
+    return {name: b.snapshot() for name, b in _breakers.items()}
+
+
+def _timeout_for(endpoint: Optional[str]) -> httpx.Timeout:
+    read = getattr(settings, f"stats_api_{endpoint}_timeout", None) if endpoint else None
+    return httpx.Timeout(read or _TIMEOUT, connect=settings.stats_api_connect_timeout)
+
+
+async def _get(path: str, endpoint: Optional[str] = None) -> Any:
+    """
+    Issue a GET request to the Stats API; raises on HTTP error.
+
+    Concurrent calls for the same path are coalesced into one upstream
+    request whose result (or error) is shared by every caller. While the
+    endpoint's circuit is open this fails fast with CircuitOpenError.
+    """
+    breaker = _breaker_for(endpoint)
+    return await _flight.do(path, lambda: breaker.call(lambda: _request(path, endpoint)))
+
+
+def _conditional_headers(path: str) -> Dict[str, str]:
+    cached = _validators.get(path) if settings.stats_api_conditional_requests else None
+    if cached is None:
+        return {}
+    etag, last_modified, _data, _size = cached
+    headers = {}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+    return headers
+
+
+def _remember_validators(path: str, response: httpx.Response, data: Any) -> None:
+    etag = response.headers.get("etag")
+    last_modified = response.headers.get("last-modified")
+    if not (etag or last_modified):
+        _validators.pop(path, None)
+        return
+    _validators[path] = (etag, last_modified, data, len(response.content))
+    _validators.move_to_end(path)
+    while len(_validators) > settings.stats_cache_max_entries:
+        _validators.popitem(last=False)
+
+
+async def _request(path: str, endpoint: Optional[str]) -> Any:
     url = f"{_BASE}{path}"
-    async with httpx.AsyncClient(timeout=_TIMEOUT) as client:
-        try:
-            response = await client.get(url)
-            response.raise_for_status()
-            return response.json()
-        except httpx.TimeoutException:
-            logger.warning("Stats API timeout: %s", url)
+    client = _get_client()
+    _pool_counters["requests"] += 1
+    try:
+        response = await client.get(
+            path,
+            headers=_conditional_headers(path),
+            timeout=_timeout_for(endpoint),
+            extensions={"trace": _trace},
+        )
+        cached = _validators.get(path)
+        if response.status_code == 304 and cached is not None:
+            # Unchanged upstream: reuse the parsed object, skip download and JSON decode
+            _conditional_counters["responses_304"] += 1
+            _conditional_counters["bytes_saved"] += cached[3]
+            _validators.move_to_end(path)
+            return cached[2]
+        response.raise_for_status()
+        data = response.json()
+        _conditional_counters["responses_200"] += 1
+        _conditional_counters["bytes_received"] += len(response.content)
+        if settings.stats_api_conditional_requests:
+            _remember_validators(path, response, data)
+        return data
+    except httpx.TimeoutException:
+        logger.warning("Stats API timeout: %s", url)
+        raise
+    except httpx.HTTPStatusError as exc:
+        logger.warning("Stats API HTTP error %s: %s", exc.response.status_code, url)
+        raise
+
+
+def _remember_good(path: str, data: Any) -> None:
+    """Keep *data* as the last good payload for *path* (bounded LRU)."""
+    _last_good[path] = (time.time(), data)
+    _last_good.move_to_end(path)
+    while len(_last_good) > settings.stats_cache_max_entries:
+        _last_good.popitem(last=False)
+
+
+async def _get_and_remember(path: str, endpoint: str, tournament_id: str) -> Any:
+    data = await _get(path, endpoint)
+    _remember_good(path, data)
+    # Archiving and odds history are side effects; they never fail the fetch
+    try:
+        if endpoint == "leaderboard":
+            await archive.record(tournament_id, data)
+        elif endpoint == "odds":
+            odds_history.record(tournament_id, data)
+    except Exception:
+        logger.exception("Recording %s for %s failed", endpoint, tournament_id)
+    return data
+
+
+async def refresh(endpoint: str, tournament_id: str) -> Any:
+    """Fetch fresh data from the upstream (bypassing reads) and update the cache."""
+    path = _ENDPOINT_PATHS[endpoint].format(tournament_id=tournament_id)
+    data = await _get_and_remember(path, endpoint, tournament_id)
+    if settings.stats_cache_enabled:
+        await cache.put(path, data, cache.ttl_for(endpoint))
+    return data
+
+
+async def fetch(endpoint: str, tournament_id: str) -> StatsResult:
+    """
+    Fetch *endpoint* data for a tournament.
+
+    Data kept hot by the live-tournament poller is returned without any
+    upstream call. Otherwise the request goes through cache, coalescing and
+    circuit breaker. If the upstream fails (or the circuit is open) the last
+    good payload is returned with ``stale=True``; without one, the error
+    propagates.
+    """
+    snapshot = live_store.get(endpoint, tournament_id)
+    if snapshot is not None and snapshot.age <= settings.stats_live_max_age:
+        return StatsResult(data=snapshot.data)
+
+    path = _ENDPOINT_PATHS[endpoint].format(tournament_id=tournament_id)
+    try:
+        if not settings.stats_cache_enabled:
+            data = await _get_and_remember(path, endpoint, tournament_id)
+        else:
+            data = await cache.get_or_fetch(path, endpoint, lambda: _get_and_remember(path, endpoint, tournament_id))
+        return StatsResult(data=data)
+    except (httpx.HTTPError, CircuitOpenError) as exc:
+        if isinstance(exc, httpx.HTTPStatusError) and not _is_upstream_failure(exc):
             raise
-        except httpx.HTTPStatusError as exc:
-            logger.warning("Stats API HTTP error %s: %s", exc.response.status_code, url)
+        last = _last_good.get(path)
+        if last is None:
             raise
+        logger.warning("Serving last-known-good Stats API payload for %s (%s)", path, type(exc).__name__)
+        return StatsResult(data=last[1], stale=True, as_of=last[0])
+
+
+async def _fetch_cards_batch(tournament_ids: List[str]) -> Dict[str, StatsResult]:
+    """Fetch several tournament cards in one upstream call via the batch endpoint."""
+    ids = ",".join(quote(tid, safe="") for tid in tournament_ids)
+    path = settings.stats_api_batch_cards_path.format(ids=ids)
+    payload = await _get(path, "tournament_card")
+    results: Dict[str, StatsResult] = {}
+    for tid in tournament_ids:
+        if isinstance(payload, dict) and tid in payload:
+            card_path = _ENDPOINT_PATHS["tournament_card"].format(tournament_id=tid)
+            _remember_good(card_path, payload[tid])
+            if settings.stats_cache_enabled:
+                await cache.put(card_path, payload[tid], cache.ttl_for("tournament_card"))
+            results[tid] = StatsResult(data=payload[tid])
+    return results
+
+
+async def fetch_many(endpoint: str, tournament_ids: List[str]) -> List[Union[StatsResult, Exception]]:
+    """
+    Fetch *endpoint* data for several tournaments, in input order.
+
+    Duplicates are fetched once. Tournament cards not already hot or cached
+    are requested through the Stats API batch endpoint when
+    ``stats_api_batch_cards_path`` is configured; everything else is
+    fetched concurrently. Per-tournament failures are returned as exceptions.
+    """
+    unique = list(dict.fromkeys(tournament_ids))
+    found: Dict[str, Union[StatsResult, Exception]] = {}
+
+    if endpoint == "tournament_card" and settings.stats_api_batch_cards_path:
+        missing = []
+        for tid in unique:
+            snapshot = live_store.get(endpoint, tid)
+            cached = cache.peek(_ENDPOINT_PATHS[endpoint].format(tournament_id=tid), endpoint)
+            if snapshot is not None and snapshot.age <= settings.stats_live_max_age:
+                found[tid] = StatsResult(data=snapshot.data)
+            elif cached is not None:
+                found[tid] = StatsResult(data=cached)
+            else:
+                missing.append(tid)
+        if missing:
+            try:
+                found.update(await _fetch_cards_batch(missing))
+            except Exception:
+                logger.warning("Stats API batch card request failed; falling back to per-tournament requests")
+
+    remaining = [tid for tid in unique if tid not in found]
+    results = await asyncio.gather(*(fetch(endpoint, tid) for tid in remaining), return_exceptions=True)
+    found.update(zip(remaining, results))
+    return [found[tid] for tid in tournament_ids]
+
+
+async def get_tournament_cards(tournament_ids: List[str]) -> List[Any]:
+    """Return summary card metadata for several tournaments (None where unavailable)."""
+    results = await fetch_many("tournament_card", tournament_ids)
+    return [r.data if isinstance(r, StatsResult) else None for r in results]
 
 
 async def get_leaderboard(tournament_id: str) -> Any:
     """Return leaderboard data for the given tournament."""
-    return await _get(f"/tournaments/{tournament_id}/leaderboard")
+    return (await fetch("leaderboard", tournament_id)).data
 
 
 async def get_featured_edges(tournament_id: str) -> Any:
     """Return featured player edges (pairings/highlights) for the given tournament."""
-    return await _get(f"/tournaments/{tournament_id}/featured-edges")
+    return (await fetch("featured_edges", tournament_id)).data
 
 
 async def get_tournament_card(tournament_id: str) -> Any:
     """Return summary card metadata for the given tournament."""
-    return await _get(f"/tournaments/{tournament_id}/card")
+    return (await fetch("tournament_card", tournament_id)).data
+
+
+async def get_projections(tournament_id: str) -> Any:
+    """Return per-golfer model projections for the given tournament."""
+    return (await fetch("projections", tournament_id)).data
+
+
+async def get_odds(tournament_id: str) -> Any:
+    """Return sportsbook odds (golfer, book, market, American odds) for the given tournament."""
+    return (await fetch("odds", tournament_id)).data
+
+
+async def get_golfers() -> Any:
+    """Return the full golfer list (not tournament-scoped)."""
+    return (await fetch("golfers", "all")).data
@@ -0,0 +1,212 @@
+"""
+Stale-while-revalidate response cache for Stats API data.
+
+Entries are fresh for a per-endpoint TTL (see ``stats_cache_*_ttl`` in
+Settings). Once stale, an entry is still served immediately for up to
+``stats_cache_max_stale`` seconds while a background task refreshes it.
+The in-process layer is a bounded LRU; an optional shared backend (Redis
+when ``stats_cache_backend_url`` is set) lets workers share entries.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from app.core.config import settings
+
+logger = logging.getLogger("caddystats.stats_cache")
+
+Fetcher = Callable[[], Awaitable[Any]]
+
+
+class LocalBackend:
+    """In-process stand-in for a shared cache store (used in tests and dev)."""
+
+    def __init__(self) -> None:
+        self._data: Dict[str, Tuple[float, Any]] = {}
+
+    async def get(self, key: str) -> Optional[Tuple[float, Any]]:
+        return self._data.get(key)
+
+    async def set(self, key: str, stored_at: float, value: Any, ttl: float) -> None:
+        self._data[key] = (stored_at, value)
+
+    async def close(self) -> None:
+        self._data.clear()
+
+
+class RedisBackend:
+    """Shared cache backend on Redis; requires the optional ``redis`` package."""
+
+    def __init__(self, url: str) -> None:
+        import redis.asyncio as redis_asyncio
+
+        self._redis = redis_asyncio.from_url(url)
+
+    async def get(self, key: str) -> Optional[Tuple[float, Any]]:
+        raw = await self._redis.get(f"stats:{key}")
+        if raw is None:
+            return None
+        stored_at, value = json.loads(raw)
+        return stored_at, value
+
+    async def set(self, key: str, stored_at: float, value: Any, ttl: float) -> None:
+        await self._redis.set(f"stats:{key}", json.dumps([stored_at, value]), ex=max(1, int(ttl)))
+
+    async def close(self) -> None:
+        await self._redis.aclose()
+
+
+def _make_backend():
+    url = settings.stats_cache_backend_url
+    if not url:
+        return None
+    if url == "local":
+        return LocalBackend()
+    try:
+        return RedisBackend(url)
+    except ImportError:
+        logger.warning("stats_cache_backend_url is set but 'redis' is not installed; using in-process cache only")
+        return None
+
+
+class _Entry:
+    __slots__ = ("value", "stored_at")
+
+    def __init__(self, value: Any, stored_at: float) -> None:
+        self.value = value
+        self.stored_at = stored_at
+
+
+class StatsCache:
+    """Bounded LRU cache with per-endpoint TTLs and background revalidation."""
+
+    def __init__(self, max_entries: int, max_stale: float, backend=None) -> None:
+        self.max_entries = max_entries
+        self.max_stale = max_stale
+        self.backend = backend
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._refreshing: Dict[str, asyncio.Task] = {}
+        self._counters = {
+            "hits": 0,
+            "stale_hits": 0,
+            "misses": 0,
+            "shared_hits": 0,
+            "evictions": 0,
+            "refreshes": 0,
+            "refresh_errors": 0,
+        }
+
+    @staticmethod
+    def ttl_for(endpoint: str) -> float:
+        return float(getattr(settings, f"stats_cache_{endpoint}_ttl", 0) or 0)
+
+    async def get_or_fetch(self, key: str, endpoint: str, fetch: Fetcher) -> Any:
+        """Return the cached value for *key*, fetching or revalidating as needed."""
+        ttl = self.ttl_for(endpoint)
+        if ttl <= 0:
+            return await fetch()
+
+        entry = self._entries.get(key)
+        if entry is None and self.backend is not None:
+            shared = await self.backend.get(key)
+            if shared is not None:
+                self._counters["shared_hits"] += 1
+                entry = self._store_local(key, shared[1], shared[0])
+
+        if entry is not None:
+            age = time.time() - entry.stored_at
+            if age < ttl:
+                self._entries.move_to_end(key)
+                self._counters["hits"] += 1
+                return entry.value
+            if age < ttl + self.max_stale:
+                self._entries.move_to_end(key)
+                self._counters["stale_hits"] += 1
+                self._schedule_refresh(key, ttl, fetch)
+                return entry.value
+
+        self._counters["misses"] += 1
+        value = await fetch()
+        await self.put(key, value, ttl)
+        return value
+
+    def peek(self, key: str, endpoint: str) -> Optional[Any]:
+        """Return the local entry for *key* if it is still fresh, without fetching."""
+        entry = self._entries.get(key)
+        if entry is None or time.time() - entry.stored_at >= self.ttl_for(endpoint):
+            return None
+        self._entries.move_to_end(key)
+        self._counters["hits"] += 1
+        return entry.value
+
+    async def put(self, key: str, value: Any, ttl: float) -> None:
+        stored_at = time.time()
+        self._store_local(key, value, stored_at)
+        if self.backend is not None:
+            try:
+                await self.backend.set(key, stored_at, value, ttl + self.max_stale)
+            except Exception:
+                logger.warning("Shared stats cache write failed for %s", key, exc_info=True)
+
+    def _store_local(self, key: str, value: Any, stored_at: float) -> _Entry:
+        entry = _Entry(value, stored_at)
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._counters["evictions"] += 1
+        return entry
+
+    def _schedule_refresh(self, key: str, ttl: float, fetch: Fetcher) -> None:
+        if key in self._refreshing:
+            return
+        task = asyncio.create_task(self._refresh(key, ttl, fetch))
+        self._refreshing[key] = task
+        task.add_done_callback(lambda _t: self._refreshing.pop(key, None))
+
+    async def _refresh(self, key: str, ttl: float, fetch: Fetcher) -> None:
+        try:
+            value = await fetch()
+        except Exception:
+            # Keep serving the stale entry; the next read retries the refresh
+            self._counters["refresh_errors"] += 1
+            logger.warning("Background refresh failed for %s", key)
+            return
+        self._counters["refreshes"] += 1
+        await self.put(key, value, ttl)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    async def close(self) -> None:
+        """Cancel pending refreshes and release the shared backend."""
+        for task in list(self._refreshing.values()):
+            task.cancel()
+        self._refreshing.clear()
+        if self.backend is not None:
+            await self.backend.close()
+
+    def stats(self) -> dict:
+        c = self._counters
+        lookups = c["hits"] + c["stale_hits"] + c["misses"]
+        return {
+            **c,
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "hit_ratio": round((c["hits"] + c["stale_hits"]) / lookups, 4) if lookups else None,
+            "refreshing": len(self._refreshing),
+            "shared_backend": type(self.backend).__name__ if self.backend is not None else None,
+        }
+
+
+cache = StatsCache(
+    max_entries=settings.stats_cache_max_entries,
+    max_stale=settings.stats_cache_max_stale,
+    backend=_make_backend(),
+)
@@ -0,0 +1,183 @@
+"""
+Typed records for Stats API payloads.
+
+Upstream payloads are parsed once into slotted, immutable records shaped
+like ``Frontend/src/types/stats.ts`` (round scores, thru, status, ...).
+Attribute names match the GraphQL Stats types so records are returned from
+resolvers as-is. Records hold only the parsed fields plus their tournament
+and position in the payload; the upstream dict (``raw``) is looked up again
+through the gateway with :func:`raw_entry` only when a client selects it.
+
+Parsing is memoized per payload object: the gateway hands back the same
+parsed object until the upstream data changes, so repeated reads of a
+cached board reuse the same records. The memo holds the payload only for
+the identity check; it is the gateway's cached object, not a copy.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import re
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, List, Optional, Tuple
+
+from app.core.config import settings
+
+_POSITION = re.compile(r"\d+")
+
+
+@dataclass(frozen=True, slots=True)
+class LeaderboardRow:
+    position: int
+    player_id: Optional[str]
+    player_name: str
+    score: Optional[str]
+    total_score: Optional[int]
+    round_scores: Tuple[int, ...]
+    thru: Optional[str]
+    status: str
+    tournament_id: str
+    index: int  # position in the upstream payload, for raw_entry
+    stale: bool = False
+
+
+@dataclass(frozen=True, slots=True)
+class FeaturedEdgeRecord:
+    player_id: Optional[str]
+    player_name: str
+    tournament_id: str
+    index: int
+    stale: bool = False
+
+
+@dataclass(frozen=True, slots=True)
+class TournamentCardRecord:
+    tournament_id: str
+    name: Optional[str]
+    season_year: Optional[int]
+    start_date: Optional[str]
+    end_date: Optional[str]
+    stale: bool = False
+
+
+def _int(value: Any) -> Optional[int]:
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return int(value)
+    if isinstance(value, str):
+        text = value.strip().upper()
+        if text == "E":
+            return 0
+        try:
+            return int(text)
+        except ValueError:
+            return None
+    return None
+
+
+def _str(value: Any) -> Optional[str]:
+    return None if value is None else str(value)
+
+
+def _position(value: Any) -> int:
+    """Finishing position; tie markers such as ``"T3"`` parse to 3, unknown to 0."""
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value
+    match = _POSITION.search(str(value)) if value is not None else None
+    return int(match.group()) if match else 0
+
+
+def leaderboard_row(tournament_id: str, index: int, entry: dict) -> LeaderboardRow:
+    score = entry.get("score")
+    total = entry.get("totalScore")
+    return LeaderboardRow(
+        position=_position(entry.get("position")),
+        player_id=_str(entry.get("playerId")),
+        player_name=entry.get("playerName") or "",
+        score=_str(score),
+        total_score=_int(total if total is not None else score),
+        round_scores=tuple(s for s in map(_int, entry.get("roundScores") or ()) if s is not None),
+        thru=_str(entry.get("thru")),
+        status=str(entry.get("status") or "active").lower(),
+        tournament_id=tournament_id,
+        index=index,
+    )
+
+
+def featured_edge(tournament_id: str, index: int, entry: dict) -> FeaturedEdgeRecord:
+    return FeaturedEdgeRecord(
+        player_id=_str(entry.get("playerId")),
+        player_name=entry.get("playerName") or "",
+        tournament_id=tournament_id,
+        index=index,
+    )
+
+
+def tournament_card(tournament_id: str, data: Any) -> TournamentCardRecord:
+    card = data if isinstance(data, dict) else {}
+    return TournamentCardRecord(
+        tournament_id=tournament_id,
+        name=card.get("name"),
+        season_year=_int(card.get("seasonYear")),
+        start_date=_str(card.get("startDate")),
+        end_date=_str(card.get("endDate")),
+    )
+
+
+# (kind, key) -> (payload, parsed); the payload reference guards against id() reuse
+_parsed: "OrderedDict[Tuple[str, str], Tuple[Any, Any]]" = OrderedDict()
+_counters = {"parsed": 0, "reused": 0}
+
+
+def _memo(kind: str, key: str, data: Any, parse: Callable[[], Any]) -> Any:
+    cached = _parsed.get((kind, key))
+    if cached is not None and cached[0] is data:
+        _parsed.move_to_end((kind, key))
+        _counters["reused"] += 1
+        return cached[1]
+    parsed = parse()
+    _parsed[(kind, key)] = (data, parsed)
+    _parsed.move_to_end((kind, key))
+    while len(_parsed) > settings.stats_cache_max_entries:
+        _parsed.popitem(last=False)
+    _counters["parsed"] += 1
+    return parsed
+
+
+def _rows(data: Any) -> List[dict]:
+    return [e for e in (data if isinstance(data, list) else []) if isinstance(e, dict)]
+
+
+def raw_entry(data: Any, index: Optional[int] = None) -> Any:
+    """Upstream dict behind a record: row *index* of a list payload, or the whole payload."""
+    if index is None:
+        return data
+    rows = _rows(data)
+    return rows[index] if 0 <= index < len(rows) else None
+
+
+def parse_leaderboard(tournament_id: str, data: Any, stale: bool = False) -> List[LeaderboardRow]:
+    rows = _memo(
+        "leaderboard", tournament_id, data,
+        lambda: [leaderboard_row(tournament_id, i, e) for i, e in enumerate(_rows(data))],
+    )
+    return [dataclasses.replace(r, stale=True) for r in rows] if stale else rows
+
+
+def parse_featured_edges(tournament_id: str, data: Any, stale: bool = False) -> List[FeaturedEdgeRecord]:
+    rows = _memo(
+        "featured_edges", tournament_id, data,
+        lambda: [featured_edge(tournament_id, i, e) for i, e in enumerate(_rows(data))],
+    )
+    return [dataclasses.replace(r, stale=True) for r in rows] if stale else rows
+
+
+def parse_tournament_card(tournament_id: str, data: Any, stale: bool = False) -> TournamentCardRecord:
+    card = _memo("tournament_card", tournament_id, data, lambda: tournament_card(tournament_id, data))
+    return dataclasses.replace(card, stale=True) if stale else card
+
+
+def get_parse_stats() -> dict:
+    return {**_counters, "size": len(_parsed)}
@@ -0,0 +1,281 @@
+"""
+Monte Carlo tournament simulator driven by per-golfer projections.
+
+Each simulation draws four integer round scores per golfer around their
+projected score (``projScore`` is the projected 72-hole score to par),
+applies a 36-hole cut (top ``sim_cut_size`` and ties) and ranks the field,
+breaking ties at random. Win, top-5/10/20 and make-cut probabilities and
+the full finish-position distribution are accumulated across runs.
+
+When projections also carry ``winProb``, ``top10Prob`` or ``makeCutProb``,
+each golfer's mean and round spread are first calibrated so the simulated
+probabilities track them: ``sim_calibration_iterations`` pilot simulations
+of ``sim_calibration_runs`` runs each move the mean by the weighted average
+logit miss, and widen the spread of golfers who win more often than their top-10
+rate implies (and narrow it the other way). ``projScore`` is the starting
+point; golfers without one start at the field average.
+
+Runs are split into chunks of ``sim_chunk_size`` so memory stays bounded.
+Every chunk draws from its own child of one ``SeedSequence``, so a given
+seed yields identical results whether chunks run serially or in the
+process pool (used for runs of at least ``sim_process_threshold``).
+Results are cached per (tournament, projection version, runs, seed).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any, List, Optional, Tuple
+
+import numpy as np
+
+from app.core.config import settings
+from app.services import stats_api_client
+from app.utils.singleflight import SingleFlight
+
+logger = logging.getLogger("caddystats.simulator")
+
+ROUNDS = 4
+CUT_AFTER = 2
+_MISSED_CUT_OFFSET = 10_000.0  # sorts missed-cut golfers after everyone who made it
+
+# Projection probability fields calibrated against, with the finish they cover
+# (None: make the cut)
+_TARGETS = (("winProb", 1), ("top10Prob", 10), ("makeCutProb", None))
+_CALIBRATION_STREAM = 0xCA1  # seed stream for pilot runs, independent of chunking
+_LOGIT_STROKES = 2.0 / 1.7  # 72-hole strokes per logit unit, per stroke of round sd
+_SPREAD_LIMITS = (0.5, 2.0)  # calibrated round sd, relative to sim_round_sd
+_MIN_PILOT_WINS = 25  # expected pilot wins before a golfer's spread is fitted
+
+_pool: Optional[ProcessPoolExecutor] = None
+_flight = SingleFlight()
+_results: "OrderedDict[Tuple[str, str, int, int], SimulationResult]" = OrderedDict()
+
+
+@dataclass(frozen=True)
+class SimulationResult:
+    golfer_ids: List[str]
+    version: str
+    runs: int
+    seed: int
+    win: np.ndarray
+    top5: np.ndarray
+    top10: np.ndarray
+    top20: np.ndarray
+    make_cut: np.ndarray
+    position_counts: np.ndarray  # (golfer, finish position) -> runs
+
+    def expected_finish(self) -> np.ndarray:
+        positions = np.arange(1, self.position_counts.shape[1] + 1)
+        return self.position_counts @ positions / self.runs
+
+    def rows(self, include_distribution: bool = False) -> List[dict]:
+        """Per-golfer probabilities, sorted by win probability."""
+        expected = self.expected_finish()
+        order = np.argsort(-self.win, kind="stable")
+        rows = []
+        for i in order:
+            row = {
+                "golferId": self.golfer_ids[i],
+                "winProb": round(float(self.win[i]), 4),
+                "top5Prob": round(float(self.top5[i]), 4),
+                "top10Prob": round(float(self.top10[i]), 4),
+                "top20Prob": round(float(self.top20[i]), 4),
+                "makeCutProb": round(float(self.make_cut[i]), 4),
+                "expectedFinish": round(float(expected[i]), 2),
+            }
+            if include_distribution:
+                row["finishDistribution"] = (self.position_counts[i] / self.runs).round(5).tolist()
+            rows.append(row)
+        return rows
+
+
+def projection_version(projections: Any) -> str:
+    """Content hash of the projection payload, used as its cache version."""
+    canonical = json.dumps(projections, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha1(canonical.encode("utf-8")).hexdigest()[:16]
+
+
+def _number(value: Any) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def _field(projections: Any) -> Tuple[List[str], np.ndarray, np.ndarray]:
+    """(golfer ids, projected scores, (golfer, target) probabilities with NaN where missing)."""
+    rows = [p for p in (projections if isinstance(projections, list) else []) if isinstance(p, dict) and p.get("golferId")]
+    golfer_ids = [str(p["golferId"]) for p in rows]
+    scores = np.array([_number(p.get("projScore")) for p in rows])
+    if scores.size and np.isnan(scores).any():
+        # Unprojected golfers play to the field average
+        fill = float(np.nanmean(scores)) if not np.isnan(scores).all() else 0.0
+        scores = np.where(np.isnan(scores), fill, scores)
+    targets = np.array([[_number(p.get(name)) for name, _k in _TARGETS] for p in rows]).reshape(len(rows), len(_TARGETS))
+    return golfer_ids, scores, targets
+
+
+def _logit(p: np.ndarray) -> np.ndarray:
+    return np.log(p / (1.0 - p))
+
+
+def _calibrate(
+    means: np.ndarray, targets: np.ndarray, seed: int, round_sd: float, cut_size: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Per-golfer (mean, round sd) whose simulated win/top-10/make-cut
+    probabilities track *targets*; unchanged where no golfer has a target.
+    """
+    n = means.size
+    sds = np.full(n, float(round_sd))
+    runs = settings.sim_calibration_runs
+    # Targets the field size can express: a top 10 of 10 golfers, or a cut nobody misses, is certain
+    usable = np.array([k is None and n > cut_size or k is not None and k < n for _name, k in _TARGETS])
+    targets = np.where(usable, targets, np.nan)
+    if settings.sim_calibration_iterations <= 0 or runs <= 0 or np.isnan(targets).all():
+        return means, sds
+
+    eps = 1.0 / runs
+    clipped = np.clip(targets, eps, 1.0 - eps)
+    goal = _logit(clipped)
+    has_goal = ~np.isnan(goal)
+    # Logit misses far in the tails are mostly pilot noise; weight each by its binomial information
+    weight = np.where(has_goal, clipped * (1.0 - clipped), 0.0)
+    top10 = [k for _name, k in _TARGETS].index(10)
+    # Spread is only fitted where the pilot sees enough wins to tell it apart from noise
+    fit_spread = has_goal[:, 0] & has_goal[:, top10] & (np.nan_to_num(targets[:, 0]) * runs >= _MIN_PILOT_WINS)
+    # The same pilot draws every iteration, so successive estimates differ only by the fit
+    pilot_seed = np.random.SeedSequence([seed, _CALIBRATION_STREAM])
+    lo, hi = (limit * round_sd for limit in _SPREAD_LIMITS)
+    means = means.astype(np.float64)
+    for _ in range(settings.sim_calibration_iterations):
+        counts, made = _simulate_chunk(means, runs, pilot_seed, sds, cut_size)
+        simulated = np.column_stack([
+            counts[:, :k].sum(axis=1) / runs if k is not None else made / runs for _name, k in _TARGETS
+        ])
+        miss = np.where(has_goal, goal - _logit(np.clip(simulated, eps, 1.0 - eps)), 0.0)
+        total = weight.sum(axis=1)
+        # A positive miss wants a better (lower) score
+        step = np.where(total > 0, (weight * miss).sum(axis=1) / np.where(total > 0, total, 1.0), 0.0)
+        means = means - 0.8 * _LOGIT_STROKES * sds * np.clip(step, -2.0, 2.0)
+        # Winning more often than the top-10 rate implies calls for a wider spread
+        spread = np.where(fit_spread, miss[:, 0] - miss[:, top10], 0.0)
+        sds = np.clip(sds * np.exp(0.25 * np.clip(spread, -1.0, 1.0)), lo, hi)
+    return means, sds
+
+
+def _simulate_chunk(
+    means: np.ndarray, runs: int, seed: np.random.SeedSequence, round_sd: Any, cut_size: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Simulate *runs* tournaments (*round_sd* per golfer or for all); returns (position counts, make-cut counts)."""
+    rng = np.random.default_rng(seed)
+    n = means.size
+    sds = np.broadcast_to(np.asarray(round_sd, dtype=np.float64), (n,))
+    rounds = np.rint(rng.normal((means / ROUNDS)[:, None], sds[:, None], size=(runs, n, ROUNDS)))
+    halfway = rounds[:, :, :CUT_AFTER].sum(axis=2)
+    total = rounds.sum(axis=2)
+
+    if n > cut_size:
+        cut_line = np.partition(halfway, cut_size - 1, axis=1)[:, cut_size - 1 : cut_size]
+        made = halfway <= cut_line
+    else:
+        made = np.ones_like(halfway, dtype=bool)
+
+    # Integer scores: a tiebreak in [0, 0.5) ranks ties at random without crossing strokes
+    key = np.where(made, total, _MISSED_CUT_OFFSET + halfway) + rng.random((runs, n)) * 0.5
+    order = np.argsort(key, axis=1)
+    positions = np.empty_like(order)
+    positions[np.arange(runs)[:, None], order] = np.arange(n)
+
+    golfer = np.broadcast_to(np.arange(n), (runs, n))
+    counts = np.bincount((golfer * n + positions).ravel(), minlength=n * n).reshape(n, n)
+    return counts, made.sum(axis=0)
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(max_workers=settings.sim_process_workers or None)
+    return _pool
+
+
+def simulate(
+    projections: Any,
+    runs: int,
+    seed: int = 0,
+    use_pool: Optional[bool] = None,
+) -> SimulationResult:
+    """Run *runs* simulated tournaments for a projection payload."""
+    golfer_ids, means, targets = _field(projections)
+    means, sds = _calibrate(means, targets, seed, settings.sim_round_sd, settings.sim_cut_size)
+    n = len(golfer_ids)
+    chunk = max(1, settings.sim_chunk_size)
+    sizes = [min(chunk, runs - start) for start in range(0, runs, chunk)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    args = [(means, size, s, sds, settings.sim_cut_size) for size, s in zip(sizes, seeds)]
+
+    if use_pool is None:
+        use_pool = settings.sim_process_workers > 0 and runs >= settings.sim_process_threshold
+    if use_pool and len(args) > 1:
+        parts = list(_get_pool().map(_simulate_chunk, *zip(*args)))
+    else:
+        parts = [_simulate_chunk(*a) for a in args]
+
+    position_counts = np.zeros((n, n), dtype=np.int64)
+    made = np.zeros(n, dtype=np.int64)
+    for counts, made_cut in parts:
+        position_counts += counts
+        made += made_cut
+
+    cumulative = np.cumsum(position_counts, axis=1) / max(runs, 1)
+
+    def top(k: int) -> np.ndarray:
+        return cumulative[:, min(k, n) - 1] if n else np.empty(0)
+
+    return SimulationResult(
+        golfer_ids=golfer_ids,
+        version=projection_version(projections),
+        runs=runs,
+        seed=seed,
+        win=top(1),
+        top5=top(5),
+        top10=top(10),
+        top20=top(20),
+        make_cut=made / max(runs, 1),
+        position_counts=position_counts,
+    )
+
+
+async def get_simulation(tournament_id: str, runs: Optional[int] = None, seed: int = 0) -> SimulationResult:
+    """Simulate a tournament from its current projections, reusing results per projection version."""
+    runs = min(runs or settings.sim_default_runs, settings.sim_max_runs)
+    projections = await stats_api_client.get_projections(tournament_id)
+    key = (tournament_id, projection_version(projections), runs, seed)
+    cached = _results.get(key)
+    if cached is not None:
+        _results.move_to_end(key)
+        return cached
+
+    async def run() -> SimulationResult:
+        result = await asyncio.to_thread(simulate, projections, runs, seed)
+        _results[key] = result
+        while len(_results) > settings.sim_cache_max_entries:
+            _results.popitem(last=False)
+        return result
+
+    return await _flight.do("sim:" + ":".join(map(str, key)), run)
+
+
+def shutdown() -> None:
+    """Stop the simulation process pool, if one was started."""
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(cancel_futures=True)
+        _pool = None
@@ -0,0 +1,101 @@
+"""
+Minimal async circuit breaker.
+
+closed     – calls pass through; consecutive failures (or calls slower than
+             ``slow_call_threshold``) are counted.
+open       – calls fail fast with :class:`CircuitOpenError` until
+             ``reset_timeout`` has elapsed.
+half_open  – a single probe call is let through; success closes the
+             circuit, failure re-opens it.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Any, Awaitable, Callable, Optional
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling the protected function while the circuit is open."""
+
+
+class CircuitBreaker:
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int,
+        reset_timeout: float,
+        slow_call_threshold: Optional[float] = None,
+        is_failure: Callable[[BaseException], bool] = lambda exc: True,
+    ) -> None:
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.slow_call_threshold = slow_call_threshold
+        self.is_failure = is_failure
+        self.state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._counters = {"calls": 0, "rejected": 0, "failures": 0, "slow_calls": 0, "opened": 0}
+
+    def _allow(self) -> bool:
+        if self.state == CLOSED:
+            return True
+        if self.state == OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+            self.state = HALF_OPEN
+        if self.state == HALF_OPEN and not self._probe_in_flight:
+            self._probe_in_flight = True
+            return True
+        return False
+
+    def _open(self) -> None:
+        if self.state != OPEN:
+            self._counters["opened"] += 1
+        self.state = OPEN
+        self._opened_at = time.monotonic()
+        self._failures = 0
+
+    def record_success(self, elapsed: float) -> None:
+        self._probe_in_flight = False
+        if self.slow_call_threshold is not None and elapsed > self.slow_call_threshold:
+            self._counters["slow_calls"] += 1
+            self.record_failure()
+            return
+        self.state = CLOSED
+        self._failures = 0
+
+    def record_failure(self) -> None:
+        self._probe_in_flight = False
+        self._counters["failures"] += 1
+        if self.state == HALF_OPEN:
+            self._open()
+            return
+        self._failures += 1
+        if self._failures >= self.failure_threshold:
+            self._open()
+
+    async def call(self, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Run *fn* through the breaker; raises CircuitOpenError when open."""
+        self._counters["calls"] += 1
+        if not self._allow():
+            self._counters["rejected"] += 1
+            raise CircuitOpenError(f"circuit '{self.name}' is open")
+        start = time.monotonic()
+        try:
+            result = await fn()
+        except BaseException as exc:
+            if isinstance(exc, Exception) and self.is_failure(exc):
+                self.record_failure()
+            else:
+                self._probe_in_flight = False
+            raise
+        self.record_success(time.monotonic() - start)
+        return result
+
+    def snapshot(self) -> dict:
+        return {"state": self.state, "consecutive_failures": self._failures, **self._counters}
@@ -0,0 +1,49 @@
+"""
+Single-flight coalescing for concurrent identical async calls.
+
+While a call for a key is in flight, further callers for the same key await
+the same task instead of starting their own; its result or exception is
+shared by all of them.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict
+
+
+class SingleFlight:
+    """Deduplicate concurrent async calls by key."""
+
+    def __init__(self) -> None:
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._counters = {"calls": 0, "executions": 0, "coalesced": 0, "errors": 0}
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Run *fn* once for *key*, or join the call already in flight."""
+        self._counters["calls"] += 1
+        task = self._inflight.get(key)
+        if task is None:
+            self._counters["executions"] += 1
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda _t: self._inflight.pop(key, None))
+        else:
+            self._counters["coalesced"] += 1
+        try:
+            # shield: one cancelled caller must not cancel the shared call
+            return await asyncio.shield(task)
+        except Exception:
+            self._counters["errors"] += 1
+            raise
+
+    def in_flight(self) -> int:
+        return len(self._inflight)
+
+    def stats(self) -> dict:
+        c = self._counters
+        return {
+            **c,
+            "in_flight": len(self._inflight),
+            "fan_in_ratio": round(c["calls"] / c["executions"], 4) if c["executions"] else None,
+        }
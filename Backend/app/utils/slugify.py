@@ -7,11 +7,23 @@ import unicodedata
 from typing import Optional
 
 
+# Letters that NFKD does not decompose into an ASCII base
+_TRANSLITERATE = str.maketrans({
+    "ø": "o", "Ø": "O", "æ": "ae", "Æ": "AE", "œ": "oe", "Œ": "OE",
+    "ß": "ss", "ł": "l", "Ł": "L", "đ": "d", "Đ": "D", "þ": "th", "Þ": "Th", "ı": "i",
+})
+
+
+def fold(text: str) -> str:
+    """Lowercase ASCII form of *text* with accents stripped ("Åberg" -> "aberg")."""
+    text = unicodedata.normalize("NFKD", text.translate(_TRANSLITERATE))
+    text = text.encode("ascii", "ignore").decode("ascii")
+    return text.lower()
+
+
 def slugify(text: str) -> str:
     """Return a lowercase, hyphen-separated URL slug for *text*."""
-    text = unicodedata.normalize("NFKD", text)
-    text = text.encode("ascii", "ignore").decode("ascii")
-    text = text.lower()
+    text = fold(text)
     text = re.sub(r"[^\w\s-]", "", text)
     text = re.sub(r"[\s_]+", "-", text)
     text = re.sub(r"-{2,}", "-", text)
@@ -0,0 +1,4 @@
+"""
+Local benchmarking tools for the Stats gateway.
+Not imported by the application.
+"""
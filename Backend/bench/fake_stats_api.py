@@ -0,0 +1,156 @@
+"""
+In-process stand-in for the external Stats API.
+
+Serves synthetic tournament fixtures (or fixtures recorded from the real
+upstream) through an ``httpx`` transport, so the gateway can be exercised
+end to end without network access::
+
+    fake = FakeStatsAPI(latency=0.02, jitter=0.01, error_rate=0.01)
+    await stats_api_client.startup(transport=fake.transport())
+
+Latency, jitter, error rate and field size (rows per payload) are
+configurable; responses carry ETags and honour ``If-None-Match`` like the
+real API. Every request is counted per path.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import random
+from collections import Counter
+from typing import Any, Dict, Iterable, Optional
+
+import httpx
+
+ENDPOINT_PATHS = {
+    "leaderboard": "/tournaments/{tournament_id}/leaderboard",
+    "featured_edges": "/tournaments/{tournament_id}/featured-edges",
+    "tournament_card": "/tournaments/{tournament_id}/card",
+    "projections": "/tournaments/{tournament_id}/projections",
+    "odds": "/tournaments/{tournament_id}/odds",
+}
+
+_BOOKS = ("dk", "fd", "mgm")
+
+
+def synthetic_tournament(tournament_id: str, field_size: int = 156, seed: int = 0) -> Dict[str, Any]:
+    """Upstream path -> payload for one synthetic tournament."""
+    rng = random.Random(f"{seed}:{tournament_id}")
+    players = [(f"{tournament_id}-p{i}", f"Player {i}") for i in range(field_size)]
+    totals = sorted(rng.randint(-18, 10) for _ in players)
+    leaderboard = [
+        {
+            "position": i + 1,
+            "playerId": pid,
+            "playerName": name,
+            "score": str(total) if total else "E",
+            "totalScore": total,
+            "roundScores": [rng.randint(64, 76) for _ in range(2)],
+            "thru": rng.choice(["F", str(rng.randint(1, 17))]),
+            "status": "active",
+        }
+        for i, ((pid, name), total) in enumerate(zip(players, totals))
+    ]
+    weights = [1.0 / (i + 2) for i in range(field_size)]
+    scale = sum(weights)
+    projections = [
+        {
+            "golferId": pid,
+            "tournamentId": tournament_id,
+            "projScore": float(total),
+            "winProb": round(w / scale, 5),
+            "top10Prob": round(min(1.0, 10 * w / scale), 5),
+            "makeCutProb": round(min(1.0, 0.4 + 60 * w / scale), 5),
+        }
+        for (pid, _name), total, w in zip(players, totals, weights)
+    ]
+    odds = [
+        {"golferId": p["golferId"], "book": book, "market": "win",
+         "odds": max(100, int(100 / max(p["winProb"], 1e-4)) - 100)}
+        for p in projections
+        for book in _BOOKS
+    ]
+    featured = [{"playerId": pid, "playerName": name, "edge": round(rng.random() / 10, 4)} for pid, name in players[:10]]
+    card = {"id": tournament_id, "name": f"Tournament {tournament_id}", "seasonYear": 2026,
+            "startDate": "2026-04-09", "endDate": "2026-04-12"}
+    payloads = {
+        "leaderboard": leaderboard,
+        "featured_edges": featured,
+        "tournament_card": card,
+        "projections": projections,
+        "odds": odds,
+    }
+    return {ENDPOINT_PATHS[e].format(tournament_id=tournament_id): p for e, p in payloads.items()}
+
+
+class FakeStatsAPI:
+    def __init__(
+        self,
+        fixtures: Optional[Dict[str, Any]] = None,
+        tournaments: Iterable[str] = ("t1",),
+        field_size: int = 156,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        seed: int = 0,
+    ) -> None:
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self._rng = random.Random(seed)
+        self._bodies: Dict[str, tuple[bytes, str]] = {}
+        self.calls: Counter = Counter()
+        self.not_modified = 0
+        self.errors = 0
+        if fixtures is None:
+            fixtures = {}
+            for tid in tournaments:
+                fixtures.update(synthetic_tournament(tid, field_size, seed))
+        for path, payload in fixtures.items():
+            self.set(path, payload)
+
+    @classmethod
+    def from_file(cls, path: str, **kwargs: Any) -> "FakeStatsAPI":
+        """Load recorded fixtures: a JSON object mapping upstream path -> payload."""
+        with open(path, encoding="utf-8") as fh:
+            return cls(fixtures=json.load(fh), **kwargs)
+
+    def set(self, path: str, payload: Any) -> None:
+        """Serve *payload* at *path* from now on (e.g. to simulate a live update)."""
+        body = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+        self._bodies[path] = (body, '"%s"' % hashlib.sha1(body).hexdigest()[:16])
+
+    @property
+    def total_calls(self) -> int:
+        return sum(self.calls.values())
+
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        self.calls[path] += 1
+        delay = self.latency + (self._rng.uniform(-self.jitter, self.jitter) if self.jitter else 0.0)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if self.error_rate and self._rng.random() < self.error_rate:
+            self.errors += 1
+            return httpx.Response(503, json={"detail": "injected failure"})
+        entry = self._bodies.get(path)
+        if entry is None:
+            return httpx.Response(404, json={"detail": "not found"})
+        body, etag = entry
+        if request.headers.get("if-none-match") == etag:
+            self.not_modified += 1
+            return httpx.Response(304, headers={"ETag": etag})
+        return httpx.Response(200, content=body, headers={"ETag": etag, "Content-Type": "application/json"})
+
+    def transport(self) -> httpx.MockTransport:
+        return httpx.MockTransport(self.handle)
+
+    def stats(self) -> dict:
+        return {
+            "calls": self.total_calls,
+            "not_modified": self.not_modified,
+            "errors": self.errors,
+            "by_path": dict(self.calls),
+        }
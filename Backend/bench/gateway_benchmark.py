@@ -0,0 +1,180 @@
+"""
+Load benchmark for the Stats gateway.
+
+Drives the GraphQL ``leaderboard``, ``featuredEdges`` and
+``tournamentCard`` queries through the real schema and ``stats_api_client``
+against the in-process :class:`FakeStatsAPI`, at a fixed concurrency, and
+reports throughput, latency percentiles and upstream call counts::
+
+    cd Backend
+    python -m bench.gateway_benchmark --requests 5000 --concurrency 50 \\
+        --tournaments 4 --latency 0.03 --jitter 0.01
+
+Run it before and after a caching or pooling change to ``stats_api_client``
+and compare the reports (``--json`` prints a machine-readable one).
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import itertools
+import json
+import time
+from dataclasses import asdict, dataclass
+from typing import List, Optional, Sequence
+
+from bench.fake_stats_api import FakeStatsAPI
+
+QUERIES = {
+    "leaderboard": "query($t: String!) { leaderboard(tournamentId: $t) { position playerName score thru } }",
+    "featured_edges": "query($t: String!) { featuredEdges(tournamentId: $t) { playerName } }",
+    "tournament_card": "query($t: String!) { tournamentCard(tournamentId: $t) { name } }",
+}
+
+
+@dataclass
+class BenchmarkConfig:
+    requests: int = 2000
+    concurrency: int = 32
+    tournaments: int = 4
+    queries: Sequence[str] = tuple(QUERIES)
+    latency: float = 0.02
+    jitter: float = 0.005
+    error_rate: float = 0.0
+    field_size: int = 156
+    cache: bool = True
+    seed: int = 0
+
+
+def _percentile(sorted_values: List[float], pct: float) -> Optional[float]:
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, max(0, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def reset_gateway() -> None:
+    """Drop cached payloads, validators and breaker state so runs start cold."""
+    from app.services import stats_api_client, stats_models
+    from app.services.stats_cache import cache
+
+    cache.clear()
+    stats_api_client._last_good.clear()
+    stats_api_client._validators.clear()
+    stats_api_client._breakers.clear()
+    stats_models._parsed.clear()
+
+
+async def run_benchmark(config: BenchmarkConfig) -> dict:
+    from app.core.config import settings
+    from app.graphql.context import GQLContext
+    from app.graphql.schema import schema
+    from app.services import stats_api_client
+
+    tournament_ids = [f"bench{i}" for i in range(config.tournaments)]
+    fake = FakeStatsAPI(
+        tournaments=tournament_ids,
+        field_size=config.field_size,
+        latency=config.latency,
+        jitter=config.jitter,
+        error_rate=config.error_rate,
+        seed=config.seed,
+    )
+    work = itertools.islice(itertools.cycle(itertools.product(config.queries, tournament_ids)), config.requests)
+    latencies: List[float] = []
+    errors = 0
+
+    async def worker() -> None:
+        nonlocal errors
+        for query, tid in work:
+            started = time.perf_counter()
+            result = await schema.execute(QUERIES[query], variable_values={"t": tid}, context_value=GQLContext())
+            latencies.append(time.perf_counter() - started)
+            if result.errors:
+                errors += 1
+
+    cache_enabled = settings.stats_cache_enabled
+    settings.stats_cache_enabled = config.cache
+    reset_gateway()
+    coalescing_before = stats_api_client.get_coalescing_stats()
+    await stats_api_client.startup(transport=fake.transport())
+    started = time.perf_counter()
+    try:
+        await asyncio.gather(*(worker() for _ in range(config.concurrency)))
+    finally:
+        elapsed = time.perf_counter() - started
+        await stats_api_client.shutdown()
+        settings.stats_cache_enabled = cache_enabled
+    coalescing_after = stats_api_client.get_coalescing_stats()
+
+    latencies.sort()
+    completed = len(latencies)
+    return {
+        "config": {**asdict(config), "queries": list(config.queries)},
+        "completed": completed,
+        "errors": errors,
+        "elapsed_s": round(elapsed, 4),
+        "throughput_rps": round(completed / elapsed, 1) if elapsed else None,
+        "latency_ms": {
+            name: round(value * 1000, 3) if value is not None else None
+            for name, value in (
+                ("p50", _percentile(latencies, 50)),
+                ("p90", _percentile(latencies, 90)),
+                ("p99", _percentile(latencies, 99)),
+                ("max", latencies[-1] if latencies else None),
+            )
+        },
+        "upstream": fake.stats(),
+        "upstream_calls_per_request": round(fake.total_calls / completed, 4) if completed else None,
+        "coalesced": coalescing_after["coalesced"] - coalescing_before["coalesced"],
+    }
+
+
+def _format(report: dict) -> str:
+    lat = report["latency_ms"]
+    up = report["upstream"]
+    return "\n".join([
+        f"requests    {report['completed']} ({report['errors']} errors) in {report['elapsed_s']}s",
+        f"throughput  {report['throughput_rps']} req/s",
+        f"latency ms  p50={lat['p50']} p90={lat['p90']} p99={lat['p99']} max={lat['max']}",
+        f"upstream    {up['calls']} calls ({report['upstream_calls_per_request']}/request), "
+        f"{up['not_modified']} not modified, {up['errors']} injected errors",
+        f"coalesced   {report['coalesced']} calls",
+    ])
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    defaults = BenchmarkConfig()
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=defaults.requests)
+    parser.add_argument("--concurrency", type=int, default=defaults.concurrency)
+    parser.add_argument("--tournaments", type=int, default=defaults.tournaments)
+    parser.add_argument("--queries", default=",".join(defaults.queries), help="comma-separated: " + ",".join(QUERIES))
+    parser.add_argument("--latency", type=float, default=defaults.latency, help="upstream latency (s)")
+    parser.add_argument("--jitter", type=float, default=defaults.jitter, help="+/- latency jitter (s)")
+    parser.add_argument("--error-rate", type=float, default=defaults.error_rate)
+    parser.add_argument("--field-size", type=int, default=defaults.field_size, help="rows per payload")
+    parser.add_argument("--no-cache", action="store_true", help="disable the response cache")
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args(argv)
+
+    config = BenchmarkConfig(
+        requests=args.requests,
+        concurrency=args.concurrency,
+        tournaments=args.tournaments,
+        queries=[q for q in args.queries.split(",") if q in QUERIES],
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        field_size=args.field_size,
+        cache=not args.no_cache,
+        seed=args.seed,
+    )
+    report = asyncio.run(run_benchmark(config))
+    print(json.dumps(report, indent=2) if args.json else _format(report))
+
+
+if __name__ == "__main__":
+    main()
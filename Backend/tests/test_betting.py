@@ -0,0 +1,386 @@
+"""
+Betting analytics tests: edge engine, odds normalization, simulation and projections.
+These run purely in-process on synthetic projections and odds.
+"""
+
+from __future__ import annotations
+
+import json
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from app.services import betting_edge_engine as engine
+from app.services import odds_normalization
+
+PROJECTIONS = [
+    {"golferId": "g1", "winProb": 0.20, "top10Prob": 0.60, "makeCutProb": 0.90},
+    {"golferId": "g2", "winProb": 0.05, "top10Prob": 0.30},
+    {"golferId": "g3", "winProb": 0.01},
+]
+ODDS = [
+    {"golferId": "g1", "book": "dk", "market": "win", "odds": 400},
+    {"golferId": "g1", "book": "fd", "market": "win", "odds": 500},
+    {"golferId": "g1", "book": "dk", "market": "top10", "odds": -150},
+    {"golferId": "g2", "book": "dk", "market": "win", "odds": 2500},
+    {"golferId": "g2", "book": "dk", "market": "make_cut", "odds": -300},  # not projected
+    {"golferId": "g9", "book": "dk", "market": "win", "odds": 1000},  # unknown golfer
+    {"golferId": "g3", "book": "fd", "market": "exacta", "odds": 100},  # unknown market
+]
+
+
+def test_implied_probability_across_formats():
+    american = odds_normalization.implied_probability(np.array([100, 150, -200]))
+    assert np.allclose(american, [0.5, 0.4, 2 / 3])
+    codes = odds_normalization.FORMAT_CODES
+    mixed = odds_normalization.implied_probability(
+        np.array([150, 2.5, odds_normalization.fractional_ratio("3/2")]),
+        np.array([codes["american"], codes["decimal"], codes["fractional"]]),
+    )
+    assert np.allclose(mixed, [0.4, 0.4, 0.4])
+
+
+@pytest.mark.parametrize("method", odds_normalization.METHODS)
+def test_remove_vig_sums_each_market_to_its_target(method):
+    # Two books pricing a 3-runner win market and a 4-runner "top 2"-style market
+    implied = np.array([0.55, 0.30, 0.25, 0.60, 0.35, 0.20, 0.70, 0.65, 0.50, 0.45])
+    groups = np.array([0, 0, 0, 1, 1, 1, 2, 2, 2, 2])
+    targets = np.array([1.0, 1.0, 2.0])
+    fair = odds_normalization.remove_vig(implied, groups, method=method, targets=targets)
+    sums = np.bincount(groups, weights=fair)
+    assert np.allclose(sums, targets, atol=1e-6)
+    # Favourite-longshot ordering is preserved within each market
+    assert fair[0] > fair[1] > fair[2]
+
+
+def test_remove_vig_methods_differ_on_longshots():
+    implied = np.array([0.70, 0.25, 0.10])
+    groups = np.zeros(3, dtype=np.int64)
+    fair = {m: odds_normalization.remove_vig(implied, groups, method=m) for m in odds_normalization.METHODS}
+    assert np.allclose(fair["multiplicative"], implied / implied.sum())
+    assert np.allclose(fair["additive"], implied - 0.05 / 3)
+    # Power and Shin take more margin off longshots than multiplicative
+    assert fair["power"][2] < fair["multiplicative"][2]
+    assert fair["shin"][2] < fair["multiplicative"][2]
+
+
+def test_remove_vig_leaves_untargeted_groups_alone():
+    implied = np.array([0.6, 0.5, 0.8])
+    fair = odds_normalization.remove_vig(implied, np.array([0, 0, 1]), targets=np.array([1.0, np.nan]))
+    assert np.allclose(fair, [0.6 / 1.1, 0.5 / 1.1, 0.8])
+    with pytest.raises(ValueError):
+        odds_normalization.remove_vig(implied, np.array([0, 0, 1]), method="bogus")
+
+
+def test_consensus_averages_across_books():
+    probs = np.array([0.2, 0.3, np.nan, 0.5])
+    keys = np.array([0, 0, 1, 1])
+    assert np.allclose(odds_normalization.consensus(probs, keys), [0.25, 0.25, 0.5, 0.5])
+
+
+def test_edge_board_matches_row_by_row_join():
+    board = engine.EdgeBoard(PROJECTIONS, ODDS)
+    rows = board.query()
+    expected = {
+        ("g1", "dk", "win"): 0.20 - 100 / 500,
+        ("g1", "fd", "win"): 0.20 - 100 / 600,
+        ("g1", "dk", "top10"): 0.60 - 150 / 250,
+        ("g2", "dk", "win"): 0.05 - 100 / 2600,
+    }
+    got = {(r["golferId"], r["sportsbook"], r["marketType"]): r["edge"] for r in rows}
+    assert got.keys() == expected.keys()
+    for key, edge in expected.items():
+        assert got[key] == pytest.approx(edge, abs=1e-4)
+    assert [r["edge"] for r in rows] == sorted((r["edge"] for r in rows), reverse=True)
+
+    # dk's win book (g1 + g2) is de-vigged to sum to 1; consensus averages dk and fd
+    no_vig = {(r["golferId"], r["sportsbook"], r["marketType"]): r["noVigProbability"] for r in rows}
+    assert no_vig[("g1", "dk", "win")] + no_vig[("g2", "dk", "win")] == pytest.approx(1.0, abs=1e-3)
+    g1_win = [r["consensusProbability"] for r in rows if r["golferId"] == "g1" and r["marketType"] == "win"]
+    assert g1_win[0] == g1_win[1] == pytest.approx((no_vig[("g1", "dk", "win")] + 1.0) / 2, abs=1e-3)
+
+
+def test_unparseable_prices_are_nan_and_dropped_from_the_board():
+    ratio = odds_normalization.fractional_ratio
+    assert ratio("5/2") == 2.5 and ratio("4") == 4.0 and ratio("evens") == 1.0
+    assert all(np.isnan(ratio(text)) for text in ("5/0", "5/", "/2", "five/2"))
+    assert np.isnan(odds_normalization.price_of({"odds": "n/a"})[0])
+
+    bad = [
+        {"golferId": "g1", "book": "dk", "market": "win", "odds": "5/0", "oddsFormat": "fractional"},
+        {"golferId": "g2", "book": "fd", "market": "win", "odds": "off"},
+    ]
+    assert engine.EdgeBoard(PROJECTIONS, ODDS + bad).query() == engine.EdgeBoard(PROJECTIONS, ODDS).query()
+
+
+def test_edge_board_filters_and_top_n():
+    board = engine.EdgeBoard(PROJECTIONS, ODDS)
+    assert {r["sportsbook"] for r in board.query(books=["fd"])} == {"fd"}
+    assert {r["marketType"] for r in board.query(markets=["top10"])} == {"top10"}
+    assert all(r["edge"] >= 0.01 for r in board.query(min_edge=0.01))
+    top = board.query(top=2)
+    assert len(top) == 2 and top[0]["edge"] >= top[1]["edge"]
+    assert top == board.query()[:2]
+
+
+def test_edge_board_is_cached_until_inputs_change():
+    engine._boards.clear()
+    first = engine.build_board("t1", PROJECTIONS, ODDS)
+    assert engine.build_board("t1", PROJECTIONS, ODDS) is first
+    assert engine.build_board("t1", PROJECTIONS, list(ODDS)) is not first
+
+
+def test_edge_board_cache_is_bounded(monkeypatch):
+    monkeypatch.setattr(engine.settings, "betting_board_cache_max_entries", 2)
+    engine._boards.clear()
+    first = engine.build_board("t1", PROJECTIONS, ODDS)
+    engine.build_board("t2", PROJECTIONS, ODDS)
+    assert engine.build_board("t1", PROJECTIONS, ODDS) is first  # t1 becomes most recent
+    engine.build_board("t3", PROJECTIONS, ODDS)
+    assert list(engine._boards) == ["t1", "t3"]
+
+
+def test_betting_edges_endpoint():
+    from app.main import app
+    from app.services.live_store import live_store
+
+    live_store.put("projections", "be1", PROJECTIONS)
+    live_store.put("odds", "be1", ODDS)
+    try:
+        response = TestClient(app).get("/api/betting-edges/be1", params={"top": 1, "markets": "win"})
+    finally:
+        live_store.discard("be1")
+    assert response.status_code == 200
+    body = response.json()
+    assert body["tournament_id"] == "be1"
+    assert [(r["golferId"], r["sportsbook"]) for r in body["data"]] == [("g1", "fd")]
+
+
+FIELD = [{"golferId": f"s{i}", "projScore": -12.0 + i} for i in range(80)]
+
+
+def test_simulation_probabilities_are_consistent():
+    from app.services import tournament_simulator as sim
+
+    result = sim.simulate(FIELD, runs=3000, seed=7)
+    assert result.win.sum() == pytest.approx(1.0)
+    assert result.top10.sum() == pytest.approx(10.0)
+    assert np.all(result.win <= result.top5) and np.all(result.top10 <= result.top20)
+    # Better projections win more often; 65 and ties make the cut each run
+    assert result.win[0] > result.win[40] and result.make_cut[0] > result.make_cut[-1]
+    assert 65 <= result.make_cut.sum() < 80
+    assert np.all(result.position_counts.sum(axis=1) == 3000)
+    rows = result.rows(include_distribution=True)
+    assert rows[0]["golferId"] == "s0" and len(rows[0]["finishDistribution"]) == 80
+
+
+def test_simulation_is_deterministic_across_chunking_and_pool(monkeypatch):
+    from app.services import tournament_simulator as sim
+
+    monkeypatch.setattr(sim.settings, "sim_chunk_size", 500)
+    serial = sim.simulate(FIELD, runs=2000, seed=3, use_pool=False)
+    try:
+        pooled = sim.simulate(FIELD, runs=2000, seed=3, use_pool=True)
+    finally:
+        sim.shutdown()
+    assert np.array_equal(serial.position_counts, pooled.position_counts)
+    assert not np.array_equal(serial.position_counts, sim.simulate(FIELD, runs=2000, seed=4).position_counts)
+
+
+def test_simulation_calibrates_to_projected_probabilities():
+    from app.services import tournament_simulator as sim
+
+    truth = sim.simulate(FIELD, runs=10000, seed=11)
+    # projScore is off by up to 3 strokes; the probabilities carry the real picture
+    projections = [
+        {
+            "golferId": p["golferId"],
+            "projScore": p["projScore"] + 3.0 * np.sin(i),
+            "winProb": float(truth.win[i]),
+            "top10Prob": float(truth.top10[i]),
+            "makeCutProb": float(truth.make_cut[i]),
+        }
+        for i, p in enumerate(FIELD)
+    ]
+    result = sim.simulate(projections, runs=10000, seed=5)
+    for simulated, target in ((result.win, truth.win), (result.top10, truth.top10), (result.make_cut, truth.make_cut)):
+        assert np.abs(simulated - target).max() < 0.05
+
+    uncalibrated = sim.simulate([{k: p[k] for k in ("golferId", "projScore")} for p in projections], runs=10000, seed=5)
+    assert np.abs(uncalibrated.make_cut - truth.make_cut).max() > 0.1
+
+
+def test_simulation_endpoint_caches_per_projection_version():
+    from app.main import app
+    from app.services import tournament_simulator as sim
+    from app.services.live_store import live_store
+
+    sim._results.clear()
+    live_store.put("projections", "sim1", FIELD[:10])
+    try:
+        client = TestClient(app)
+        first = client.get("/api/simulations/sim1", params={"runs": 500, "seed": 1}).json()
+        assert len(sim._results) == 1
+        assert client.get("/api/simulations/sim1", params={"runs": 500, "seed": 1}).json() == first
+        assert len(sim._results) == 1
+        live_store.put("projections", "sim1", FIELD[:12])
+        second = client.get("/api/simulations/sim1", params={"runs": 500, "seed": 1}).json()
+    finally:
+        live_store.discard("sim1")
+    assert second["version"] != first["version"] and len(second["data"]) == 12
+    assert first["data"][0]["golferId"] == "s0"
+
+
+def test_projections_endpoint_streams_sorted_projected_rows():
+    from app.main import app
+    from app.services.live_store import live_store
+
+    live_store.put("projections", "pr1", PROJECTIONS)
+    try:
+        client = TestClient(app)
+        full = client.get("/api/projections/pr1")
+        top = client.get("/api/projections/pr1", params={"fields": "golferId,top10Prob", "sort": "-top10Prob", "limit": 2})
+        ndjson = client.get("/api/projections/pr1", params={"sort": "winProb"}, headers={"Accept": "application/x-ndjson"})
+    finally:
+        live_store.discard("pr1")
+    assert full.json() == PROJECTIONS
+    assert top.json() == [{"golferId": "g1", "top10Prob": 0.60}, {"golferId": "g2", "top10Prob": 0.30}]
+    assert ndjson.headers["content-type"].startswith("application/x-ndjson")
+    assert [json.loads(line)["golferId"] for line in ndjson.text.splitlines()] == ["g3", "g2", "g1"]
+
+
+def test_select_projections_puts_missing_values_last():
+    from app.services.stat_service import select_projections
+
+    assert [r["golferId"] for r in select_projections(PROJECTIONS, sort="-top10Prob")] == ["g1", "g2", "g3"]
+    assert [r["golferId"] for r in select_projections(PROJECTIONS, sort="makeCutProb")] == ["g1", "g2", "g3"]
+    assert select_projections(PROJECTIONS, fields=["golferId"], limit=1) == [{"golferId": "g1"}]
+
+
+def _odds_tick(odds_g1, odds_g2=2500):
+    return [
+        {"golferId": "g1", "book": "dk", "market": "win", "odds": odds_g1},
+        {"golferId": "g2", "book": "dk", "market": "win", "odds": odds_g2},
+    ]
+
+
+def test_odds_history_buckets_and_movement_since_open():
+    from app.services.odds_history import OddsHistory
+
+    history = OddsHistory(batch_size=3, flush_interval=1e9, raw_retention=600, five_minute_retention=3600)
+    base = 1_700_000_100.0  # 100s into a 5-minute bucket
+    assert history.record("o1", _odds_tick(400), at=base) == 2
+    assert history.record("o1", _odds_tick(400), at=base + 10) == 0  # nothing moved
+    history.record("o1", _odds_tick(300), at=base + 60)
+    history.record("o1", _odds_tick(500), at=base + 120)
+    history.record("o1", _odds_tick(350), at=base + 400)  # next 5-minute bucket
+
+    buckets = history.sparkline("o1", "g1", "dk", "win", resolution="5m")
+    assert [b["ticks"] for b in buckets] == [3, 1]
+    first = buckets[0]
+    assert (first["oddsOpen"], first["oddsClose"]) == (400.0, 500.0)
+    assert first["high"] == pytest.approx(0.25) and first["low"] == pytest.approx(1 / 6, abs=1e-5)
+    assert len(history.sparkline("o1", "g1", "dk", "win", resolution="1h")) == 1
+    assert [t["odds"] for t in history.sparkline("o1", "g1", "dk", "win", resolution="raw")] == [400, 300, 500, 350]
+
+    moves = history.movement("o1")
+    assert [(m["golferId"], m["openOdds"], m["odds"]) for m in moves] == [("g1", 400.0, 350.0), ("g2", 2500.0, 2500.0)]
+    assert moves[0]["probabilityChange"] == pytest.approx(100 / 450 - 0.2, abs=1e-5)
+
+    # Retention: raw ticks and 5-minute buckets age out, hourly buckets stay
+    history.compact(now=base + 8000)
+    assert history.sparkline("o1", "g1", "dk", "win", resolution="raw") == []
+    assert history.sparkline("o1", "g1", "dk", "win", resolution="5m") == []
+    assert len(history.sparkline("o1", "g1", "dk", "win", resolution="1h")) == 1
+    assert history.movement("o1")[0]["openOdds"] == 400.0
+
+
+def test_odds_history_forgets_least_recently_recorded_tournaments():
+    from app.services.odds_history import OddsHistory
+
+    history = OddsHistory(batch_size=1, max_tournaments=2)
+    for i, tid in enumerate(["a", "b", "a", "c"]):
+        history.record(tid, _odds_tick(400 + i), at=1_700_000_000.0 + i)
+    assert history.tracked_since("b") is None and history.movement("b") == []
+    assert history.tracked_since("a") == 1_700_000_000.0 and history.tracked_since("c") is not None
+    assert history.stats()["evicted"] == 1 and set(history.stats()["tournaments"]) == {"a", "c"}
+
+
+def test_odds_endpoints_serve_movement_and_sparklines(monkeypatch):
+    from app.api import odds as odds_api
+    from app.main import app
+    from app.services.odds_history import OddsHistory
+
+    history = OddsHistory(batch_size=1000)
+    history.record("o2", _odds_tick(400), at=1_700_000_000.0)
+    history.record("o2", _odds_tick(200), at=1_700_000_030.0)
+    monkeypatch.setattr(odds_api, "odds_history", history)
+    client = TestClient(app)
+
+    movement = client.get("/api/odds/o2/movement", params={"market": "win", "limit": 1}).json()
+    assert [(m["golferId"], m["odds"]) for m in movement["data"]] == [("g1", 200.0)]
+    assert movement["tracked_since"] == 1_700_000_000.0
+    spark = client.get("/api/odds/o2/sparkline", params={"golferId": "g1", "book": "dk"}).json()
+    assert [(p["oddsOpen"], p["oddsClose"]) for p in spark["data"]] == [(400.0, 200.0)]
+
+
+@pytest.mark.asyncio
+async def test_live_poller_feeds_odds_history_on_every_poll(monkeypatch):
+    import httpx
+
+    from app.services import stats_api_client
+    from app.services.live_poller import LivePoller
+    from app.services.live_store import live_store
+    from app.services.odds_history import OddsHistory
+
+    prices = iter([400, 400, 300])
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/odds"):
+            return httpx.Response(200, json=_odds_tick(next(prices)))
+        return httpx.Response(200, json=[])
+
+    history = OddsHistory(batch_size=1)
+    monkeypatch.setattr(stats_api_client, "odds_history", history)
+    monkeypatch.setattr(stats_api_client.settings, "stats_api_conditional_requests", False)
+    await stats_api_client.startup(transport=httpx.MockTransport(handler))
+    poller = LivePoller(live_store, min_interval=5, max_interval=20)
+    poller.track("o3")
+    try:
+        for _ in range(3):
+            await poller.poll_once("o3")
+    finally:
+        poller.untrack("o3")
+        await stats_api_client.shutdown()
+    assert history.tracked_since("o3") is not None
+    assert [(m["golferId"], m["openOdds"], m["odds"]) for m in history.movement("o3", market="win")][0] == ("g1", 400.0, 300.0)
+
+
+@pytest.mark.asyncio
+async def test_odds_side_effects_never_fail_the_fetch(monkeypatch):
+    import httpx
+
+    from app.services import stats_api_client
+    from app.services.odds_history import OddsHistory
+
+    history = OddsHistory(batch_size=1)
+    bad = [
+        {"golferId": "g1", "book": "dk", "market": "win", "odds": "5/0", "oddsFormat": "fractional"},
+        {"golferId": "g2", "book": "dk", "market": "win", "odds": "off"},
+    ]
+    assert history.record("o4", bad + _odds_tick(400)[:1], at=1_700_000_000.0) == 1
+    assert [m["golferId"] for m in history.movement("o4")] == ["g1"]
+
+    class _Broken:
+        def record(self, tournament_id, data):
+            raise RuntimeError("boom")
+
+    payload = _odds_tick(400)
+    monkeypatch.setattr(stats_api_client, "odds_history", _Broken())
+    monkeypatch.setattr(stats_api_client.settings, "stats_api_conditional_requests", False)
+    await stats_api_client.startup(transport=httpx.MockTransport(lambda request: httpx.Response(200, json=payload)))
+    try:
+        assert await stats_api_client.refresh("odds", "o4") == payload
+    finally:
+        await stats_api_client.shutdown()
@@ -0,0 +1,441 @@
+"""
+Content GraphQL tests.
+
+The ``website_content`` schema is created in an in-memory SQLite database
+(attached under the schema name; JSONB/TSVECTOR columns compile to
+JSON/TEXT) so resolvers and loaders run real SQL without Postgres.
+"""
+
+from __future__ import annotations
+
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.graphql.context import GQLContext
+from app.graphql.schema import schema
+from app.models import website_content as orm
+
+
+@compiles(JSONB, "sqlite")
+def _jsonb_sqlite(type_, compiler, **kw):
+    return "JSON"
+
+
+@compiles(TSVECTOR, "sqlite")
+def _tsvector_sqlite(type_, compiler, **kw):
+    return "TEXT"
+
+
+class _Statements(list):
+    def selects(self, table: str | None = None) -> list:
+        return [s for s in self if s.lstrip().upper().startswith("SELECT") and (table is None or table in s)]
+
+
+def _seed(db, posts: int = 20) -> None:
+    perms = [orm.Permission(key=k, name=k) for k in ("post:create", "post:edit", "post:publish")]
+    role = orm.Role(key="editor", name="Editor")
+    db.add_all([*perms, role])
+    db.flush()
+    db.add_all([orm.RolePermission(role_id=role.id, permission_id=p.id) for p in perms])
+    authors = [orm.User(email=f"a{i}@example.com", password_hash="x", display_name=f"Author {i}") for i in range(2)]
+    db.add_all(authors)
+    db.flush()
+    db.add_all([orm.UserRole(user_id=a.id, role_id=role.id) for a in authors])
+    tags = [orm.Tag(slug=f"tag-{i}", name=f"Tag {i}") for i in range(3)]
+    category = orm.Category(slug="majors", name="Majors")
+    seo = orm.SEO(title="SEO title")
+    db.add_all([*tags, category, seo])
+    db.flush()
+    start = datetime(2026, 1, 1)
+    for i in range(posts):
+        post = orm.Post(
+            author_id=authors[i % 2].id,
+            seo_id=seo.id if i == 0 else None,
+            slug=f"post-{i}",
+            title=f"Post {i}",
+            content_jsonb={"blocks": [{"type": "paragraph", "text": "x" * 200}]},
+            status="published",
+            published_at=start + timedelta(hours=i % 5) if i % 3 else None,
+            created_at=start + timedelta(hours=i),
+            updated_at=start + timedelta(hours=i),
+        )
+        db.add(post)
+        db.flush()
+        db.add_all([orm.PostTag(post_id=post.id, tag_id=t.id) for t in tags])
+        db.add(orm.PostCategory(post_id=post.id, category_id=category.id))
+        db.add_all([
+            orm.Comment(post_id=post.id, author_id=authors[(i + 1) % 2].id, body="Nice"),
+            orm.Comment(post_id=post.id, author_id=None, body="Removed", is_deleted=True),
+        ])
+    db.commit()
+
+
+@pytest.fixture
+def content_db(monkeypatch):
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+
+    @event.listens_for(engine, "connect")
+    def _attach(dbapi_conn, _record):
+        dbapi_conn.execute("ATTACH DATABASE ':memory:' AS website_content")
+
+    orm.Base.metadata.create_all(engine)
+    factory = sessionmaker(bind=engine, autoflush=False, future=True)
+    with factory() as db:
+        _seed(db)
+
+    statements = _Statements()
+    with factory() as db:
+        statements.tag_ids = [t.id for t in db.query(orm.Tag)]
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    from app.graphql import loaders, mutations, pagination, queries
+
+    for module in (loaders, queries, mutations, pagination):
+        monkeypatch.setattr(module, "SessionLocal", factory)
+    yield statements
+    engine.dispose()
+
+
+POSTS_WITH_RELATIONSHIPS = """
+{
+  posts(first: 20) { edges { node {
+    title
+    author { displayName roles { key permissions { key } } }
+    seo { title }
+    tags { slug }
+    categories { slug }
+    comments { body author { displayName } }
+  } } }
+}
+"""
+
+
+@pytest.mark.asyncio
+async def test_post_relationships_load_with_one_query_per_relationship(content_db):
+    result = await schema.execute(POSTS_WITH_RELATIONSHIPS, context_value=GQLContext())
+    assert result.errors is None
+    posts = [e["node"] for e in result.data["posts"]["edges"]]
+    assert len(posts) == 20
+    assert all([t["slug"] for t in p["tags"]] == ["tag-0", "tag-1", "tag-2"] for p in posts)
+    assert all(p["categories"] == [{"slug": "majors"}] for p in posts)
+    assert all(len(p["comments"]) == 1 and p["comments"][0]["author"]["displayName"] for p in posts)
+    assert [p["seo"] for p in posts if p["seo"]] == [{"title": "SEO title"}]
+    assert {p["author"]["displayName"] for p in posts} == {"Author 0", "Author 1"}
+    assert posts[0]["author"]["roles"][0]["permissions"] == [
+        {"key": "post:create"}, {"key": "post:edit"}, {"key": "post:publish"},
+    ]
+
+    # posts + users + user roles + role permissions + seo + tags + categories + comments
+    assert len(content_db.selects()) == 8
+    assert len(content_db.selects("FROM website_content.users")) == 1
+
+
+@pytest.mark.asyncio
+async def test_unselected_relationships_are_not_loaded(content_db):
+    result = await schema.execute("{ posts(first: 5) { edges { node { title slug } } } }", context_value=GQLContext())
+    assert result.errors is None and len(result.data["posts"]["edges"]) == 5
+    assert len(content_db.selects()) == 1
+
+
+@pytest.mark.asyncio
+async def test_card_queries_select_only_requested_columns(content_db):
+    query = """
+    query Cards { posts(first: 3) { edges { node { ...Card } } } }
+    fragment Card on Post { title slug author { displayName } }
+    """
+    result = await schema.execute(query, context_value=GQLContext())
+    assert result.errors is None
+    assert result.data["posts"]["edges"][0]["node"] == {"title": "Post 19", "slug": "post-19", "author": {"displayName": "Author 1"}}
+    posts_sql = content_db.selects("FROM website_content.posts")[0]
+    select_list = posts_sql.split("FROM")[0]
+    assert "content_jsonb" not in select_list and "excerpt" not in select_list
+    assert "posts.author_id" in select_list and "posts.title" in select_list
+
+
+@pytest.mark.asyncio
+async def test_single_post_loads_body_only_when_selected(content_db):
+    result = await schema.execute('{ post(slug: "post-3") { title contentJsonb } }', context_value=GQLContext())
+    assert result.errors is None and result.data["post"]["contentJsonb"]["blocks"]
+    assert "content_jsonb" in content_db.selects("FROM website_content.posts")[0].split("FROM")[0]
+
+
+def test_planner_maps_fields_to_columns():
+    from app.graphql.planner import columns_for
+
+    assert columns_for(orm.Post, {"title", "author", "tags", "resolved_content", "__typename"}) == [
+        "author_id", "content_jsonb", "id", "title", "updated_at",
+    ]
+    assert columns_for(orm.Template, {"name", "seo"}) == ["id", "name", "seo_id"]
+
+
+def _walk_pages(args: str, first: int = 7):
+    import asyncio
+
+    nodes, after, pages = [], None, 0
+    while True:
+        cursor = f', after: "{after}"' if after else ""
+        query = f"{{ posts(first: {first}{args}{cursor}) {{ edges {{ node {{ slug publishedAt }} }} pageInfo {{ hasNextPage endCursor }} }} }}"
+        result = asyncio.run(schema.execute(query, context_value=GQLContext()))
+        assert result.errors is None, result.errors
+        conn = result.data["posts"]
+        nodes += [e["node"] for e in conn["edges"]]
+        pages += 1
+        if not conn["pageInfo"]["hasNextPage"]:
+            return nodes, pages
+        after = conn["pageInfo"]["endCursor"]
+
+
+def test_keyset_pagination_walks_every_sort_without_gaps_or_duplicates(content_db):
+    newest, pages = _walk_pages("")
+    assert pages == 3 and [n["slug"] for n in newest] == [f"post-{i}" for i in reversed(range(20))]
+
+    by_title, _ = _walk_pages(', sort: {field: "TITLE", direction: "ASC"}')
+    assert [n["slug"] for n in by_title] == sorted((f"post-{i}" for i in range(20)), key=lambda s: f"Post {s[5:]}")
+
+    # published_at has ties and NULLs: NULLs come last, ties break on id, nothing repeats
+    for direction in ("DESC", "ASC"):
+        rows, _ = _walk_pages(f', sort: {{field: "PUBLISHED_AT", direction: "{direction}"}}', first=4)
+        assert len({n["slug"] for n in rows}) == 20
+        published = [n["publishedAt"] for n in rows]
+        assert published[-7:] == [None] * 7 and None not in published[:13]
+        assert published[:13] == sorted(published[:13], reverse=direction == "DESC")
+
+
+def test_keyset_order_by_adds_nulls_last_only_for_nullable_keys(content_db):
+    def order_by(sort: str) -> str:
+        content_db.clear()
+        _walk_pages(sort)
+        statement = content_db.selects("posts")[0]
+        return statement[statement.upper().index("ORDER BY"):].split("LIMIT")[0].strip()
+
+    assert order_by("") == "ORDER BY website_content.posts.created_at DESC, website_content.posts.id DESC"
+    assert "NULLS" not in order_by(', sort: {field: "TITLE", direction: "ASC"}')
+    assert order_by(', sort: {field: "PUBLISHED_AT"}') == (
+        "ORDER BY website_content.posts.published_at DESC NULLS LAST, website_content.posts.id DESC"
+    )
+
+
+def test_estimate_rows_reads_the_postgres_plan(monkeypatch):
+    import json
+
+    from sqlalchemy.dialects import postgresql
+    from sqlalchemy.orm import Query
+
+    from app.graphql import pagination
+
+    executed = []
+
+    class _Connection:
+        def exec_driver_sql(self, sql, params):
+            executed.append((sql, params))
+            return type("Result", (), {"scalar": lambda self: json.dumps([{"Plan": {"Plan Rows": 1234}}])})()
+
+    class _Session:
+        def get_bind(self):
+            return type("Bind", (), {"dialect": postgresql.dialect()})()
+
+        def connection(self):
+            return _Connection()
+
+        def close(self):
+            pass
+
+    monkeypatch.setattr(pagination, "SessionLocal", _Session)
+    query = Query(orm.Post).filter(orm.Post.is_deleted.is_(False), orm.Post.title == "Post 1")
+    assert pagination.estimate_rows(query) == 1234
+    (sql, params), = executed
+    assert sql.startswith("EXPLAIN (FORMAT JSON) SELECT") and "website_content.posts.title = %(title_1)s" in sql
+    assert params == {"title_1": "Post 1"}
+
+
+@pytest.mark.asyncio
+async def test_pagination_rejects_foreign_cursors_and_estimates_without_count(content_db):
+    from app.graphql.pagination import make_cursor, read_cursor
+
+    result = await schema.execute(
+        "{ posts(first: 2) { totalCount pageInfo { endCursor hasPreviousPage } } }", context_value=GQLContext()
+    )
+    assert result.errors is None
+    assert result.data["posts"]["totalCount"] is None  # planner estimates are Postgres-only
+    assert result.data["posts"]["pageInfo"]["hasPreviousPage"] is False
+    assert not [s for s in content_db if "count(" in s.lower()]
+
+    cursor = result.data["posts"]["pageInfo"]["endCursor"]
+    bad = await schema.execute(
+        f'{{ posts(after: "{cursor}", sort: {{field: "TITLE"}}) {{ edges {{ cursor }} }} }}', context_value=GQLContext()
+    )
+    assert bad.errors and "Invalid cursor" in bad.errors[0].message
+    row_id = uuid.UUID(int=1)
+    assert read_cursor(make_cursor("title", "A|B", row_id), "title", orm.Post.title) == ("A|B", row_id)
+
+
+@pytest.mark.asyncio
+async def test_tag_filter_does_not_duplicate_posts(content_db):
+    tag_ids = [str(t) for t in content_db.tag_ids]
+    result = await schema.execute(
+        "query($tags: [UUID!]) { posts(first: 100, filter: {tagIds: $tags}) { edges { node { slug } } } }",
+        variable_values={"tags": tag_ids},
+        context_value=GQLContext(),
+    )
+    assert result.errors is None
+    slugs = [e["node"]["slug"] for e in result.data["posts"]["edges"]]
+    assert len(slugs) == len(set(slugs)) == 20
+
+
+@pytest.fixture
+def apq(monkeypatch):
+    from app.graphql import persisted_queries
+    from app.graphql.persisted_queries import DocumentCache, PersistedQueries
+
+    cache = DocumentCache(max_entries=2)
+    extension = next(e for e in schema.extensions if isinstance(e, PersistedQueries))
+    monkeypatch.setattr(extension, "cache", cache)
+    parses = []
+    real_parse = persisted_queries.parse
+    monkeypatch.setattr(persisted_queries, "parse", lambda q: parses.append(q) or real_parse(q))
+    cache.parses = parses
+    return cache
+
+
+def _persisted(query: str) -> dict:
+    from app.graphql.persisted_queries import query_hash
+
+    return {"persistedQuery": {"version": 1, "sha256Hash": query_hash(query)}}
+
+
+@pytest.mark.asyncio
+async def test_automatic_persisted_query_registers_on_miss_and_skips_parsing(content_db, apq):
+    query = "query Cards { posts(first: 2) { edges { node { slug } } } }"
+
+    miss = await schema.execute(None, operation_extensions=_persisted(query), context_value=GQLContext())
+    assert miss.errors[0].message == "PersistedQueryNotFound"
+    assert miss.errors[0].extensions == {"code": "PERSISTED_QUERY_NOT_FOUND"}
+
+    registered = await schema.execute(query, operation_extensions=_persisted(query), context_value=GQLContext())
+    assert registered.errors is None and len(registered.data["posts"]["edges"]) == 2
+
+    for _ in range(3):
+        hit = await schema.execute(None, operation_extensions=_persisted(query), context_value=GQLContext())
+        assert hit.data == registered.data
+    assert apq.parses == [query]
+    assert apq.stats()["hits"] == 3 and apq.stats()["registered"] == 1
+
+    mismatch = await schema.execute("{ posts { edges { cursor } } }", operation_extensions=_persisted(query))
+    assert mismatch.errors[0].extensions == {"code": "BAD_REQUEST"}
+
+
+@pytest.mark.asyncio
+async def test_document_cache_keeps_invalid_queries_out_and_is_bounded(content_db, apq):
+    invalid = "{ posts { edges { node { nope } } } }"
+    for _ in range(2):
+        result = await schema.execute(invalid, operation_extensions=_persisted(invalid))
+        assert result.errors and "nope" in result.errors[0].message
+    assert apq.stats()["documents"] == 0 and apq.stats()["registered"] == 0
+
+    for first in (1, 2, 3):
+        assert (await schema.execute(f"{{ posts(first: {first}) {{ edges {{ cursor }} }} }}")).errors is None
+    assert apq.stats()["documents"] == 2
+
+
+def test_persisted_only_mode_runs_manifest_operations_over_http(content_db, apq, tmp_path):
+    import json
+
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+    from app.graphql.persisted_queries import query_hash
+
+    allowed = "{ posts(first: 1) { edges { node { slug } } } }"
+    manifest = tmp_path / "persisted.json"
+    manifest.write_text(json.dumps({query_hash(allowed): allowed}))
+    apq.manifest_path, apq.persisted_only = str(manifest), True
+    client = TestClient(app)
+
+    response = client.get(
+        "/graphql", params={"extensions": json.dumps(_persisted(allowed))}, headers={"accept": "application/json"}
+    )
+    assert response.status_code == 200
+    assert response.json()["data"]["posts"]["edges"] == [{"node": {"slug": "post-19"}}]
+    assert client.post("/graphql", json={"query": allowed}).json()["data"]["posts"]
+
+    other = "{ posts(first: 100) { edges { node { slug } } } }"
+    for body in ({"query": other}, {"query": other, "extensions": _persisted(other)}):
+        errors = client.post("/graphql", json=body).json()["errors"]
+        assert errors[0]["extensions"]["code"] == "PERSISTED_QUERY_NOT_ALLOWED"
+
+
+PATHOLOGICAL = "{ posts(first: 100) { edges { node { author { roles { permissions { key } } } comments { body } } } } }"
+
+
+@pytest.mark.asyncio
+async def test_query_cost_is_reported_and_expensive_operations_never_execute(content_db):
+    ok = await schema.execute(POSTS_WITH_RELATIONSHIPS, context_value=GQLContext())
+    assert ok.errors is None
+    assert ok.extensions["cost"] == {"requestedQueryCost": 561, "maximumAvailable": 1000, "depth": 7, "maximumDepth": 12}
+
+    content_db.clear()
+    rejected = await schema.execute(PATHOLOGICAL, context_value=GQLContext())
+    assert rejected.data is None
+    assert rejected.errors[0].extensions == {"code": "QUERY_TOO_EXPENSIVE"}
+    assert rejected.extensions["cost"]["requestedQueryCost"] == 1501
+    assert content_db.selects() == []
+
+    # the same shape at a small page size fits the budget
+    small = await schema.execute(
+        "query($n: Int!) { posts(first: $n) { edges { node { author { roles { permissions { key } } } comments { body } } } } }",
+        variable_values={"n": 5},
+        context_value=GQLContext(),
+    )
+    assert small.errors is None and small.extensions["cost"]["requestedQueryCost"] == 76
+
+
+def test_query_cost_weights_stats_fields_and_limits_depth():
+    from graphql import parse
+
+    from app.graphql.cost import CostAnalyzer, QueryCost
+
+    analyzer = CostAnalyzer(schema._schema, stats_field_cost=20)
+    stats = '{ a: leaderboard(tournamentId: "t") { position } b: tournamentCard(tournamentId: "t") { name } }'
+    assert analyzer.analyze(parse(stats)).cost == 40
+    # resolvedContent is a JSON scalar but still hydrates stat embeds per post
+    assert analyzer.analyze(parse("{ posts(first: 50) { edges { node { title } } } }")).cost == 101
+    assert analyzer.analyze(parse("{ posts(first: 50) { edges { node { resolvedContent } } } }")).cost == 1 + 50 * 22
+    fragment = "query Q { ...Root } fragment Root on Query { posts(first: 3) { edges { node { seo { title } } } } }"
+    assert analyzer.analyze(parse(fragment)).cost == 1 + 3 * 3
+    introspection = analyzer.analyze(parse("{ __schema { types { fields { type { ofType { name } } } } } }"))
+    assert (introspection.depth, introspection.introspection_depth) == (0, 6)
+
+    import asyncio
+
+    import strawberry
+
+    from app.graphql.queries import Query
+
+    shallow = strawberry.Schema(query=Query, extensions=[QueryCost(max_depth=3)])
+    result = asyncio.run(shallow.execute("{ posts { edges { node { title } } } }"))
+    assert result.errors[0].message == "Query depth 4 exceeds the maximum of 3"
+    assert result.errors[0].extensions == {"code": "QUERY_TOO_DEEP"}
+
+
+@pytest.mark.asyncio
+async def test_introspection_is_free_but_depth_limited():
+    from graphql import get_introspection_query
+
+    standard = await schema.execute(get_introspection_query(), context_value=GQLContext())
+    assert standard.errors is None and standard.extensions["cost"]["requestedQueryCost"] == 0
+
+    nested = "{ __schema { types { fields { type { " + "ofType { " * 20 + "name" + " }" * 24 + " }"
+    result = await schema.execute(nested, context_value=GQLContext())
+    assert result.data is None
+    assert result.errors[0].message == "Introspection depth 25 exceeds the maximum of 20"
+    assert result.errors[0].extensions == {"code": "QUERY_TOO_DEEP"}
@@ -0,0 +1,874 @@
+"""
+Stats API gateway tests.
+
+The upstream Stats API is replaced by an in-process ``httpx.MockTransport``
+so these tests run without network access.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from app.services import stats_api_client
+from app.services.stats_cache import LocalBackend, StatsCache, cache
+
+
+@pytest.fixture(autouse=True)
+def _reset_gateway_state():
+    cache.clear()
+    stats_api_client._breakers.clear()
+    stats_api_client._last_good.clear()
+    stats_api_client._validators.clear()
+    yield
+    cache.clear()
+    stats_api_client._breakers.clear()
+    stats_api_client._last_good.clear()
+    stats_api_client._validators.clear()
+
+
+def _upstream(calls: list):
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        if request.url.path.endswith("/leaderboard"):
+            return httpx.Response(200, json=[{"position": 1, "playerName": "A. Golfer", "score": "-5"}])
+        if request.url.path.endswith("/card"):
+            return httpx.Response(200, json={"name": "The Open"})
+        return httpx.Response(404)
+    return httpx.MockTransport(handler)
+
+
+@pytest.mark.asyncio
+async def test_shared_client_is_reused_across_calls():
+    calls: list = []
+    await stats_api_client.startup(transport=_upstream(calls))
+    try:
+        client = stats_api_client._get_client()
+        assert await stats_api_client.get_leaderboard("t1")
+        assert await stats_api_client.get_tournament_card("t1") == {"name": "The Open"}
+        assert stats_api_client._get_client() is client
+        assert [r.url.path for r in calls] == ["/tournaments/t1/leaderboard", "/tournaments/t1/card"]
+    finally:
+        await stats_api_client.shutdown()
+    assert stats_api_client._client is None
+
+
+@pytest.mark.asyncio
+async def test_per_endpoint_timeouts_come_from_settings():
+    from app.core.config import settings
+
+    calls: list = []
+    await stats_api_client.startup(transport=_upstream(calls))
+    try:
+        await stats_api_client.get_leaderboard("t1")
+        await stats_api_client.get_tournament_card("t1")
+    finally:
+        await stats_api_client.shutdown()
+    assert calls[0].extensions["timeout"]["read"] == settings.stats_api_leaderboard_timeout
+    assert calls[1].extensions["timeout"]["read"] == settings.stats_api_tournament_card_timeout
+
+
+@pytest.mark.asyncio
+async def test_http_errors_are_raised():
+    await stats_api_client.startup(transport=_upstream([]))
+    try:
+        with pytest.raises(httpx.HTTPStatusError):
+            await stats_api_client.get_featured_edges("t1")
+    finally:
+        await stats_api_client.shutdown()
+
+
+def test_gateway_metrics_endpoint_reports_pool():
+    from app.main import app
+
+    with TestClient(app) as client:
+        response = client.get("/api/stats-gateway/metrics")
+    assert response.status_code == 200
+    pool = response.json()["pool"]
+    assert {"requests", "connections_opened", "reuse_ratio", "open_connections"} <= set(pool)
+
+
+@pytest.mark.asyncio
+async def test_cache_serves_fresh_entries_without_upstream_call():
+    calls: list = []
+    await stats_api_client.startup(transport=_upstream(calls))
+    try:
+        first = await stats_api_client.get_leaderboard("t1")
+        second = await stats_api_client.get_leaderboard("t1")
+    finally:
+        await stats_api_client.shutdown()
+    assert first == second
+    assert len(calls) == 1
+    assert cache.stats()["hits"] >= 1
+
+
+@pytest.mark.asyncio
+async def test_stale_entry_is_served_and_refreshed_in_background(monkeypatch):
+    local = StatsCache(max_entries=8, max_stale=60)
+    monkeypatch.setattr(StatsCache, "ttl_for", staticmethod(lambda endpoint: 5.0))
+    versions = iter(["v1", "v2"])
+
+    async def fetch():
+        return next(versions)
+
+    assert await local.get_or_fetch("k", "leaderboard", fetch) == "v1"
+    local._entries["k"].stored_at -= 10  # age the entry past its TTL
+    assert await local.get_or_fetch("k", "leaderboard", fetch) == "v1"
+    await asyncio.gather(*local._refreshing.values())
+    assert await local.get_or_fetch("k", "leaderboard", fetch) == "v2"
+    assert local.stats()["stale_hits"] == 1
+    assert local.stats()["refreshes"] == 1
+
+
+@pytest.mark.asyncio
+async def test_cache_evicts_least_recently_used(monkeypatch):
+    local = StatsCache(max_entries=2, max_stale=0)
+    monkeypatch.setattr(StatsCache, "ttl_for", staticmethod(lambda endpoint: 60.0))
+
+    async def fetch():
+        return "x"
+
+    for key in ("a", "b", "a", "c"):
+        await local.get_or_fetch(key, "leaderboard", fetch)
+    assert list(local._entries) == ["a", "c"]
+    assert local.stats()["evictions"] == 1
+
+
+@pytest.mark.asyncio
+async def test_shared_backend_is_consulted_on_local_miss(monkeypatch):
+    shared = LocalBackend()
+    writer = StatsCache(max_entries=8, max_stale=0, backend=shared)
+    reader = StatsCache(max_entries=8, max_stale=0, backend=shared)
+    monkeypatch.setattr(StatsCache, "ttl_for", staticmethod(lambda endpoint: 60.0))
+
+    async def fetch():
+        return {"n": 1}
+
+    async def fail():
+        raise AssertionError("upstream should not be called")
+
+    await writer.get_or_fetch("k", "leaderboard", fetch)
+    assert await reader.get_or_fetch("k", "leaderboard", fail) == {"n": 1}
+    assert reader.stats()["shared_hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_requests_are_coalesced():
+    calls: list = []
+    release = asyncio.Event()
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        await release.wait()
+        return httpx.Response(200, json=[{"position": 1}])
+
+    await stats_api_client.startup(transport=httpx.MockTransport(handler))
+    try:
+        pending = [asyncio.ensure_future(stats_api_client._get("/tournaments/t9/leaderboard")) for _ in range(20)]
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*pending)
+    finally:
+        await stats_api_client.shutdown()
+    assert len(calls) == 1
+    assert all(r == [{"position": 1}] for r in results)
+
+
+@pytest.mark.asyncio
+async def test_coalesced_callers_share_upstream_errors():
+    from app.utils.singleflight import SingleFlight
+
+    flight = SingleFlight()
+    release = asyncio.Event()
+
+    async def boom():
+        await release.wait()
+        raise RuntimeError("upstream down")
+
+    pending = [asyncio.ensure_future(flight.do("k", boom)) for _ in range(5)]
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*pending, return_exceptions=True)
+    assert all(isinstance(r, RuntimeError) for r in results)
+    stats = flight.stats()
+    assert stats["executions"] == 1
+    assert stats["coalesced"] == 4
+    assert stats["fan_in_ratio"] == 5.0
+    assert flight.in_flight() == 0
+
+
+@pytest.mark.asyncio
+async def test_circuit_breaker_opens_and_half_opens(monkeypatch):
+    from app.utils import circuit_breaker as cb
+
+    now = [1000.0]
+    monkeypatch.setattr(cb.time, "monotonic", lambda: now[0])
+    breaker = cb.CircuitBreaker("t", failure_threshold=2, reset_timeout=30)
+
+    async def boom():
+        raise RuntimeError("down")
+
+    async def ok():
+        return "ok"
+
+    for _ in range(2):
+        with pytest.raises(RuntimeError):
+            await breaker.call(boom)
+    assert breaker.state == cb.OPEN
+    with pytest.raises(cb.CircuitOpenError):
+        await breaker.call(ok)
+    now[0] += 31
+    assert await breaker.call(ok) == "ok"
+    assert breaker.state == cb.CLOSED
+
+
+@pytest.mark.asyncio
+async def test_open_circuit_serves_last_known_good(monkeypatch):
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "stats_cache_enabled", False)
+    monkeypatch.setattr(settings, "stats_breaker_failure_threshold", 1)
+    healthy = [True]
+    calls: list = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        if healthy[0]:
+            return httpx.Response(200, json=[{"position": 1, "playerName": "A. Golfer"}])
+        return httpx.Response(503)
+
+    await stats_api_client.startup(transport=httpx.MockTransport(handler))
+    try:
+        fresh = await stats_api_client.fetch("leaderboard", "t1")
+        assert fresh.stale is False
+        healthy[0] = False
+        degraded = await stats_api_client.fetch("leaderboard", "t1")
+        assert degraded.stale is True
+        assert degraded.data == fresh.data
+        # Circuit is now open: served from last-known-good without an upstream call
+        upstream_calls = len(calls)
+        assert (await stats_api_client.fetch("leaderboard", "t1")).stale is True
+        assert len(calls) == upstream_calls
+        assert stats_api_client.get_breaker_stats()["leaderboard"]["state"] == "open"
+    finally:
+        await stats_api_client.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_client_errors_do_not_trip_the_breaker(monkeypatch):
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "stats_breaker_failure_threshold", 1)
+    await stats_api_client.startup(transport=_upstream([]))
+    try:
+        for _ in range(3):
+            with pytest.raises(httpx.HTTPStatusError):
+                await stats_api_client.get_featured_edges("t1")
+    finally:
+        await stats_api_client.shutdown()
+    assert stats_api_client.get_breaker_stats()["featured_edges"]["state"] == "closed"
+
+
+@pytest.mark.asyncio
+async def test_live_poller_keeps_data_hot_and_adapts_interval():
+    from app.services.live_poller import LivePoller
+    from app.services.live_store import live_store
+
+    calls: list = []
+    await stats_api_client.startup(transport=_upstream(calls))
+    poller = LivePoller(live_store, min_interval=5, max_interval=20, backoff=2)
+    poller.track("t1")
+    try:
+        assert await poller.poll_once("t1") is True
+        assert await poller.poll_once("t1") is False  # unchanged -> back off
+        report = poller.freshness()["tournaments"]["t1"]
+        assert report["interval_s"] == 10
+        assert report["errors"] == 2  # featured-edges 404s on every poll
+        assert report["age_s"]["leaderboard"] is not None
+
+        upstream_calls = len(calls)
+        result = await stats_api_client.fetch("leaderboard", "t1")
+        assert result.data[0]["playerName"] == "A. Golfer"
+        assert len(calls) == upstream_calls
+    finally:
+        poller.untrack("t1")
+        await stats_api_client.shutdown()
+    assert live_store.get("leaderboard", "t1") is None
+
+
+def test_leaderboard_hub_diffs_once_for_all_subscribers():
+    from app.services.leaderboard_hub import LeaderboardHub
+
+    hub = LeaderboardHub()
+    a = hub.subscribe("t1")
+    b = hub.subscribe("t1")
+    board = [
+        {"playerId": "p1", "playerName": "A", "position": 1, "score": "-5", "thru": "12"},
+        {"playerId": "p2", "playerName": "B", "position": 2, "score": "-4", "thru": "11"},
+    ]
+    first = hub.publish("t1", board)
+    assert first.full and len(first.changed) == 2
+
+    moved = [dict(board[0], thru="13"), dict(board[1])]
+    assert hub.publish("t1", moved).changed[0].thru == "13"
+    assert hub.publish("t1", moved) is None  # unchanged board is not broadcast
+
+    update_a = [a.get_nowait(), a.get_nowait()]
+    update_b = [b.get_nowait(), b.get_nowait()]
+    assert update_a[1] is update_b[1]
+    assert [c.player_key for c in update_a[1].changed] == ["p1"]
+
+    dropped = hub.publish("t1", [board[1]])
+    assert dropped.removed == ["p1"]
+
+
+@pytest.mark.asyncio
+async def test_leaderboard_subscription_streams_snapshot_then_diffs():
+    from app.graphql.schema import schema
+    from app.services.leaderboard_hub import hub
+
+    await stats_api_client.startup(transport=_upstream([]))
+    try:
+        stream = await schema.subscribe(
+            'subscription { leaderboardUpdates(tournamentId: "sub1") '
+            "{ version full changed { playerKey score } removed } }"
+        )
+        first = await stream.__anext__()
+        assert first.errors is None
+        assert first.data["leaderboardUpdates"]["full"] is True
+        assert first.data["leaderboardUpdates"]["changed"] == [{"playerKey": "A. Golfer", "score": "-5"}]
+
+        hub.publish("sub1", [{"playerName": "A. Golfer", "position": 1, "score": "-6"}])
+        second = await stream.__anext__()
+        assert second.data["leaderboardUpdates"]["full"] is False
+        assert second.data["leaderboardUpdates"]["changed"] == [{"playerKey": "A. Golfer", "score": "-6"}]
+        await stream.aclose()
+    finally:
+        await stats_api_client.shutdown()
+    assert hub.subscriber_count("sub1") == 0
+
+
+def test_leaderboard_delta_uses_ring_buffer():
+    from app.services.leaderboard_hub import LeaderboardHub
+
+    hub = LeaderboardHub(history_size=2)
+    v1 = [{"playerId": "p1", "position": 1, "score": "-5"}, {"playerId": "p2", "position": 2, "score": "-3"}]
+    v2 = [dict(v1[0], score="-6"), v1[1]]
+    v3 = [dict(v2[0]), dict(v1[1], position=1)]
+    hub.publish("t1", v1)
+    etag1 = hub.current_etag("t1")
+    hub.publish("t1", v2)
+    etag2 = hub.current_etag("t1")
+
+    assert hub.delta_since("t1", etag2).not_modified is True
+    delta = hub.delta_since("t1", etag1)
+    assert not delta.full and [c.player_key for c in delta.changed] == ["p1"]
+
+    hub.publish("t1", v3)  # etag1 ages out of the two-slot ring
+    assert hub.delta_since("t1", etag1).full is True
+    assert [c.player_key for c in hub.delta_since("t1", etag2).changed] == ["p2"]
+
+
+def test_leaderboard_hub_forgets_least_recent_idle_tournaments():
+    from app.services.leaderboard_hub import LeaderboardHub
+
+    hub = LeaderboardHub(max_tournaments=2)
+    board = [{"playerId": "p1", "position": 1, "score": "-5"}]
+    queue = hub.subscribe("t1")
+    for tid in ("t1", "t2", "t3", "t4"):
+        hub.publish(tid, board)
+    # t1 has a subscriber and survives; t2 is the oldest idle board
+    assert [tid for tid in ("t1", "t2", "t3", "t4") if hub.has_board(tid)] == ["t1", "t4"]
+    assert hub.delta_since("t2", None) is None and hub.stats()["evicted"] == 2
+
+    hub.unsubscribe("t1", queue)
+    hub.publish("t2", board)
+    assert not hub.has_board("t1") and hub.has_board("t2")
+
+
+def test_leaderboard_delta_endpoint_honours_etags():
+    from app.main import app
+    from app.services.live_store import live_store
+
+    live_store.put("leaderboard", "d1", [{"playerId": "p1", "playerName": "A", "position": 1, "score": "-5"}])
+    try:
+        client = TestClient(app)
+        first = client.get("/api/leaderboard/d1/delta")
+        assert first.status_code == 200
+        assert first.json()["full"] is True
+        etag = first.headers["etag"]
+
+        again = client.get("/api/leaderboard/d1/delta", headers={"If-None-Match": etag})
+        assert again.status_code == 304
+        for header in (f"W/{etag}", f'"stale", {etag}', "*"):
+            assert client.get("/api/leaderboard/d1/delta", headers={"If-None-Match": header}).status_code == 304
+
+        live_store.put("leaderboard", "d1", [{"playerId": "p1", "playerName": "A", "position": 1, "score": "-6"}])
+        changed = client.get("/api/leaderboard/d1/delta", params={"since": etag.strip('"')})
+        assert changed.json()["changed"] == [
+            {"player_key": "p1", "player_name": "A", "position": 1, "score": "-6", "thru": None}
+        ]
+        weak = client.get("/api/leaderboard/d1/delta", headers={"If-None-Match": f'"stale", W/{etag}'})
+        assert weak.status_code == 200 and weak.json()["full"] is False
+    finally:
+        live_store.discard("d1")
+
+
+
+def _boards(n: int) -> list:
+    field = [{"playerId": f"p{i}", "playerName": f"Player {i}", "position": i + 1, "score": "E"} for i in range(40)]
+    boards = []
+    for step in range(n):
+        field = [dict(row) for row in field]
+        field[step % 40]["score"] = str(-step)
+        boards.append(field)
+    return boards
+
+
+@pytest.mark.asyncio
+async def test_leaderboard_archive_replays_from_compressed_blocks(tmp_path):
+    from app.services.leaderboard_archive import LeaderboardArchive
+
+    archive = LeaderboardArchive(str(tmp_path), block_records=4)
+    boards = _boards(10)
+    for i, board in enumerate(boards):
+        assert await archive.record("t1", board, at=100.0 + i) is True
+    assert await archive.record("t1", [dict(r) for r in boards[-1]], at=120.0) is False  # unchanged
+    assert archive.stats()["blocks_written"] == 2 and archive.stats()["pending"] == {"t1": 2}
+    raw = sum(len(json.dumps(b)) for b in boards[:8])
+    assert archive.stats()["bytes_written"] < raw / 10
+
+    await archive.close()
+    reopened = LeaderboardArchive(str(tmp_path), block_records=4)
+    assert await reopened.board_at("t1", 99.0) is None
+    assert await reopened.board_at("t1", 105.5) == (105.0, boards[5])
+    assert await reopened.board_at("t1", 500.0) == (109.0, boards[9])
+    assert reopened.stats()["blocks_read"] == 2  # only the blocks covering the two instants
+
+    changes = list(reopened.iter_changes("t1", 102.0, 106.0))
+    assert changes[0]["full"] is True and changes[0]["changed"] == boards[2]
+    assert [c["ts"] for c in changes[1:]] == [103.0, 104.0, 105.0, 106.0]
+    assert all(len(c["changed"]) == 1 and not c["removed"] for c in changes[1:])
+
+
+@pytest.mark.asyncio
+async def test_leaderboard_archive_flushes_a_board_that_stopped_moving(tmp_path):
+    from app.services.leaderboard_archive import LeaderboardArchive
+
+    archive = LeaderboardArchive(str(tmp_path), block_records=60, flush_interval=300.0)
+    board = _boards(1)[0]
+    assert await archive.record("t1", board, at=100.0) is True
+    assert await archive.record("t1", [dict(r) for r in board], at=200.0) is False
+    assert archive.stats()["blocks_written"] == 0
+    assert await archive.record("t1", [dict(r) for r in board], at=400.0) is False  # unchanged, but due
+    assert archive.stats()["blocks_written"] == 1 and archive.stats()["pending"] == {}
+    assert await LeaderboardArchive(str(tmp_path)).board_at("t1", 450.0) == (100.0, board)
+
+
+@pytest.mark.asyncio
+async def test_leaderboard_archive_workers_share_a_directory_off_loop(tmp_path, monkeypatch):
+    import threading
+
+    from app.services.leaderboard_archive import LeaderboardArchive
+
+    boards = _boards(6)
+    first = LeaderboardArchive(str(tmp_path), block_records=2)
+    second = LeaderboardArchive(str(tmp_path), block_records=2)
+    assert await second.board_at("t1", 500.0) is None  # second worker caches an empty index
+
+    writers = []
+    original = LeaderboardArchive._write_block
+    monkeypatch.setattr(
+        LeaderboardArchive, "_write_block",
+        lambda self, *a: writers.append(threading.current_thread()) or original(self, *a),
+    )
+    for i in (0, 1):
+        await first.record("t1", boards[i], at=100.0 + i)
+    for i in (2, 3):
+        await second.record("t1", boards[i], at=100.0 + i)
+    for i in (4, 5):
+        await first.record("t1", boards[i], at=100.0 + i)
+    assert writers and threading.main_thread() not in writers
+
+    # Each worker sees the blocks the other appended, at distinct offsets
+    assert await second.board_at("t1", 100.5) == (100.0, boards[0])
+    assert await first.board_at("t1", 103.0) == (103.0, boards[3])
+    assert await second.board_at("t1", 500.0) == (105.0, boards[5])
+    index = (tmp_path / "t_t1" / "index.jsonl").read_text().splitlines()
+    assert len({tuple(json.loads(line)[2:4]) for line in index}) == 3
+
+
+@pytest.mark.asyncio
+async def test_leaderboard_history_endpoints(tmp_path, monkeypatch):
+    from app.api import leaderboard as leaderboard_api
+    from app.main import app
+    from app.services.leaderboard_archive import LeaderboardArchive
+
+    archive = LeaderboardArchive(str(tmp_path), block_records=2)
+    boards = _boards(3)
+    for i, board in enumerate(boards):
+        await archive.record("h1", board, at=1_700_000_000.0 + i)
+    monkeypatch.setattr(leaderboard_api, "archive", archive)
+    client = TestClient(app)
+
+    at = client.get("/api/leaderboard/h1/history", params={"at": "2023-11-14T22:13:21Z"})
+    assert at.status_code == 200 and at.json()["data"] == boards[1]
+    assert client.get("/api/leaderboard/h1/history", params={"at": 1_600_000_000}).status_code == 404
+
+    stream = client.get("/api/leaderboard/h1/history/changes", params={"start": 1_700_000_000, "end": 1_700_000_002})
+    assert stream.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in stream.text.splitlines()]
+    assert [line["full"] for line in lines] == [True, False, False]
+    assert lines[2]["changed"] == [boards[2][2]]
+
+_CARDS_QUERY = """
+{
+  a: tournamentCard(tournamentId: "t1") { name }
+  b: tournamentCard(tournamentId: "t2") { name }
+  c: tournamentCard(tournamentId: "t1") { name }
+}
+"""
+
+
+@pytest.mark.asyncio
+async def test_tournament_cards_are_batched_per_operation(monkeypatch):
+    from app.core.config import settings
+    from app.graphql.context import GQLContext
+    from app.graphql.schema import schema
+
+    monkeypatch.setattr(settings, "stats_cache_enabled", False)
+    calls: list = []
+    await stats_api_client.startup(transport=_upstream(calls))
+    try:
+        result = await schema.execute(_CARDS_QUERY, context_value=GQLContext())
+    finally:
+        await stats_api_client.shutdown()
+    assert result.errors is None
+    assert result.data["a"] == result.data["c"] == {"name": "The Open"}
+    assert sorted(r.url.path for r in calls) == ["/tournaments/t1/card", "/tournaments/t2/card"]
+
+
+@pytest.mark.asyncio
+async def test_tournament_cards_use_batch_endpoint_when_configured(monkeypatch):
+    from app.core.config import settings
+    from app.graphql.context import GQLContext
+    from app.graphql.schema import schema
+
+    monkeypatch.setattr(settings, "stats_api_batch_cards_path", "/tournaments/cards?ids={ids}")
+    calls: list = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        ids = request.url.params["ids"].split(",")
+        return httpx.Response(200, json={tid: {"name": f"Event {tid}"} for tid in ids})
+
+    await stats_api_client.startup(transport=httpx.MockTransport(handler))
+    try:
+        result = await schema.execute(_CARDS_QUERY, context_value=GQLContext())
+        cards = await stats_api_client.get_tournament_cards(["t2", "t1"])
+    finally:
+        await stats_api_client.shutdown()
+    assert result.data["b"] == {"name": "Event t2"}
+    assert len(calls) == 1  # second lookup is served from the cache
+    assert cards == [{"name": "Event t2"}, {"name": "Event t1"}]
+
+
+@pytest.mark.asyncio
+async def test_batch_cards_quote_ids_and_bound_last_good(monkeypatch):
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "stats_api_batch_cards_path", "/tournaments/cards?ids={ids}")
+    monkeypatch.setattr(settings, "stats_cache_enabled", False)
+    monkeypatch.setattr(settings, "stats_cache_max_entries", 2)
+    monkeypatch.setattr(stats_api_client, "_last_good", stats_api_client.OrderedDict())
+    calls: list = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        ids = request.url.params["ids"].split(",")
+        return httpx.Response(200, json={tid: {"name": tid} for tid in ids})
+
+    await stats_api_client.startup(transport=httpx.MockTransport(handler))
+    try:
+        results = await stats_api_client._fetch_cards_batch(["a&b=1", "c/d", "e,f"])
+    finally:
+        await stats_api_client.shutdown()
+    assert calls[0].url.query == b"ids=a%26b%3D1,c%2Fd,e%2Cf"
+    assert results["a&b=1"].data == {"name": "a&b=1"}
+    assert len(stats_api_client._last_good) == 2
+
+
+@pytest.mark.asyncio
+async def test_stat_embeds_are_fetched_once_per_source_and_cached():
+    from app.services import embed_service
+
+    calls: list = []
+    content = [
+        {"type": "paragraph", "html": "<p>Intro</p>"},
+        {"type": "stat_embed", "endpoint": "leaderboard", "tournamentId": "t1"},
+        {"type": "columns", "children": [
+            {"type": "stat_embed", "endpoint": "leaderboard", "tournamentId": "t1", "playerId": "A. Golfer"},
+            {"type": "stat_embed", "endpoint": "tournament_card", "tournamentId": "t1"},
+            {"type": "stat_embed", "endpoint": "featured_edges", "tournamentId": "t1"},
+        ]},
+    ]
+    await stats_api_client.startup(transport=_upstream(calls))
+    try:
+        resolved = await embed_service.resolve_embeds(content, cache_key="post:1:v1")
+        again = await embed_service.resolve_embeds(content, cache_key="post:1:v1")
+    finally:
+        await stats_api_client.shutdown()
+        embed_service._resolved.clear()
+
+    assert again is resolved
+    assert len(calls) == 3  # leaderboard, card, featured-edges: one request each
+    assert "data" not in content[1]  # input left untouched
+    assert resolved[1]["data"][0]["playerName"] == "A. Golfer"
+    children = resolved[2]["children"]
+    assert len(children[0]["data"]) == 1
+    assert children[1]["data"] == {"name": "The Open"}
+    assert children[2]["error"] == "unavailable"
+
+
+@pytest.mark.asyncio
+async def test_conditional_requests_reuse_parsed_body_on_304(monkeypatch):
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "stats_cache_enabled", False)
+    seen_headers: list = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen_headers.append(request.headers.get("if-none-match"))
+        if request.headers.get("if-none-match") == '"v1"':
+            return httpx.Response(304, headers={"ETag": '"v1"'})
+        return httpx.Response(200, json=[{"position": 1}], headers={"ETag": '"v1"'})
+
+    before = stats_api_client.get_conditional_stats()
+    await stats_api_client.startup(transport=httpx.MockTransport(handler))
+    try:
+        first = await stats_api_client.get_leaderboard("t1")
+        second = await stats_api_client.get_leaderboard("t1")
+    finally:
+        await stats_api_client.shutdown()
+    after = stats_api_client.get_conditional_stats()
+    assert seen_headers == [None, '"v1"']
+    assert second is first
+    assert after["responses_304"] == before["responses_304"] + 1
+    assert after["bytes_saved"] > before["bytes_saved"]
+
+
+@pytest.mark.asyncio
+async def test_leaderboard_is_parsed_once_into_typed_records():
+    from app.graphql.context import GQLContext
+    from app.graphql.schema import schema
+    from app.services import stats_models
+    from app.services.live_store import live_store
+
+    board = [
+        {"position": "T2", "playerId": "p1", "playerName": "A", "score": "-5",
+         "roundScores": [68, 71], "thru": "F", "status": "ACTIVE"},
+        {"position": 80, "playerId": "p2", "playerName": "B", "score": "E", "status": "cut"},
+    ]
+    live_store.put("leaderboard", "m1", board)
+    query = '{ leaderboard(tournamentId: "m1") { position playerId totalScore roundScores thru status } }'
+    try:
+        first = await schema.execute(query, context_value=GQLContext())
+        again = await schema.execute(query, context_value=GQLContext())
+        with_raw = await schema.execute('{ leaderboard(tournamentId: "m1") { raw } }', context_value=GQLContext())
+    finally:
+        live_store.discard("m1")
+
+    assert first.errors is None and again.data == first.data
+    assert first.data["leaderboard"] == [
+        {"position": 2, "playerId": "p1", "totalScore": -5, "roundScores": [68, 71], "thru": "F", "status": "active"},
+        {"position": 80, "playerId": "p2", "totalScore": 0, "roundScores": [], "thru": None, "status": "cut"},
+    ]
+    assert with_raw.data["leaderboard"][0]["raw"] == board[0]
+    rows = stats_models.parse_leaderboard("m1", board)
+    assert stats_models.parse_leaderboard("m1", board) is rows
+    assert stats_models.parse_leaderboard("m1", board, stale=True)[0].stale is True
+    assert not hasattr(rows[0], "__dict__")
+    assert "raw" not in stats_models.LeaderboardRow.__slots__
+    assert stats_models.raw_entry(board, rows[1].index) is board[1]
+
+
+@pytest.mark.asyncio
+async def test_fake_stats_api_serves_fixtures_with_etags_and_errors():
+    from bench.fake_stats_api import FakeStatsAPI
+
+    fake = FakeStatsAPI(tournaments=["f1"], field_size=20)
+    async with httpx.AsyncClient(transport=fake.transport(), base_url="http://stats") as client:
+        first = await client.get("/tournaments/f1/leaderboard")
+        assert first.status_code == 200 and len(first.json()) == 20
+        again = await client.get("/tournaments/f1/leaderboard", headers={"If-None-Match": first.headers["etag"]})
+        assert again.status_code == 304
+        assert (await client.get("/tournaments/nope/card")).status_code == 404
+
+    failing = FakeStatsAPI(tournaments=["f1"], field_size=5, error_rate=1.0)
+    async with httpx.AsyncClient(transport=failing.transport(), base_url="http://stats") as client:
+        assert (await client.get("/tournaments/f1/card")).status_code == 503
+    assert fake.stats()["calls"] == 3 and fake.stats()["not_modified"] == 1 and failing.stats()["errors"] == 1
+
+
+@pytest.mark.asyncio
+async def test_gateway_benchmark_reports_throughput_and_upstream_calls():
+    from bench.gateway_benchmark import BenchmarkConfig, run_benchmark
+
+    report = await run_benchmark(
+        BenchmarkConfig(requests=60, concurrency=6, tournaments=2, latency=0.0, jitter=0.0, field_size=10)
+    )
+    assert report["completed"] == 60 and report["errors"] == 0
+    assert report["latency_ms"]["p50"] <= report["latency_ms"]["p99"] <= report["latency_ms"]["max"]
+    # 3 queries x 2 tournaments, each fetched once and then served from cache
+    assert report["upstream"]["calls"] == 6
+
+
+GOLFERS = [
+    {"id": "1", "name": "Scottie Scheffler", "country": "USA", "owgrRank": 1},
+    {"id": "2", "name": "Ludvig Åberg", "country": "SWE", "owgrRank": 4},
+    {"id": "3", "name": "Xander Schauffele", "country": "USA", "owgrRank": 2},
+    {"id": "4", "name": "Nicolai Højgaard", "country": "DEN", "owgrRank": 40},
+    {"id": "5", "name": "Rasmus Højgaard", "country": "DEN", "owgrRank": 35},
+    {"id": "6", "name": "Amateur Player", "country": "USA"},
+]
+
+
+def test_golfer_index_prefix_fuzzy_and_filters():
+    from app.services.golfer_directory import GolferIndex
+
+    index = GolferIndex(GOLFERS)
+    ids = lambda rows: [g["id"] for g in rows]  # noqa: E731
+    assert ids(index.search("sch")) == ["1", "3"]  # prefix of surname, by OWGR
+    assert ids(index.search("aberg")) == ["2"]  # accent-insensitive
+    assert ids(index.search("hoj", country="den")) == ["5", "4"]
+    assert ids(index.search("rasmus hoj")) == ["5"]
+    assert ids(index.search("schefler")) == ["1"]  # trigram fuzzy match
+    assert ids(index.search(owgr_min=2, owgr_max=35)) == ["3", "2", "5"]
+    assert ids(index.search(country="USA")) == ["1", "3", "6"]  # unranked last
+    assert index.search("zzzz") == []
+
+
+@pytest.mark.asyncio
+async def test_golfer_directory_swaps_index_and_serves_searches_without_upstream_calls(monkeypatch):
+    from app.services.golfer_directory import GolferDirectory
+
+    calls: list = []
+
+    async def fake_golfers():
+        calls.append(1)
+        return GOLFERS if len(calls) == 1 else GOLFERS[:2]
+
+    monkeypatch.setattr(stats_api_client, "get_golfers", fake_golfers)
+    directory = GolferDirectory(refresh_interval=3600)
+    first = await asyncio.gather(*(directory.search("s") for _ in range(5)))
+    assert all(r == first[0] for r in first) and len(calls) == 1
+    old = directory.index
+    await directory.refresh()
+    assert directory.index is not old and len(directory.index) == 2
+    assert [g["id"] for g in await directory.search("s")] == ["1"]
+    assert len(calls) == 2
+
+
+PNG = b"\x89PNG\r\n\x1a\n" + b"\x00" * 600
+
+
+def _headshot_origin(calls: list):
+    async def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+        await asyncio.sleep(0.01)
+        if request.url.path == "/h/p1.png":
+            return httpx.Response(200, content=PNG, headers={"Content-Type": "image/png"})
+        return httpx.Response(404)
+    return httpx.MockTransport(handler)
+
+
+def test_headshot_proxy_fetches_once_and_serves_with_etag(tmp_path, monkeypatch):
+    from app.api import headshots as headshots_api
+    from app.main import app
+    from app.services.headshot_cache import HeadshotCache
+
+    calls: list = []
+    cache_ = HeadshotCache(root=str(tmp_path), source_url="https://origin.test/h/{golfer_id}.png",
+                           max_bytes=10_000, sizes=[48, 96])
+    monkeypatch.setattr(headshots_api, "headshots", cache_)
+    client = TestClient(app)
+    asyncio.run(cache_.startup(transport=_headshot_origin(calls)))
+
+    first = client.get("/api/headshots/p1")
+    assert first.status_code == 200 and first.content == PNG
+    assert first.headers["content-type"] == "image/png"
+    assert "max-age=" in first.headers["cache-control"]
+    etag = first.headers["etag"]
+    assert client.get("/api/headshots/p1").content == PNG
+    assert client.get("/api/headshots/p1", headers={"If-None-Match": etag}).status_code == 304
+    assert client.get("/api/headshots/p1?w=60").status_code == 200
+    assert calls == ["/h/p1.png"]
+    assert client.get("/api/headshots/nobody").status_code == 404
+    assert client.get("/api/headshots/..%2Fetc").status_code == 404
+    stats = cache_.stats()
+    assert stats["fetches"] == 2 and stats["hits"] >= 1 and stats["bytes"] <= 10_000
+
+
+@pytest.mark.asyncio
+async def test_headshot_cache_coalesces_misses_and_evicts_by_byte_budget(tmp_path):
+    from app.services.headshot_cache import HeadshotCache
+
+    calls: list = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+        await asyncio.sleep(0.01)
+        return httpx.Response(200, content=PNG + request.url.path.encode(), headers={"Content-Type": "image/png"})
+
+    cache_ = HeadshotCache(root=str(tmp_path), source_url="https://origin.test/{golfer_id}", max_bytes=1500, sizes=[])
+    await cache_.startup(transport=httpx.MockTransport(handler))
+    try:
+        shots = await asyncio.gather(*(cache_.get("a") for _ in range(5)))
+        assert len({s.etag for s in shots}) == 1 and calls == ["/a"]
+        await cache_.get("b")
+        await cache_.get("a")  # a is now most recently used
+        await cache_.get("c")  # over budget: b is evicted
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["a-orig", "c-orig"]
+        assert cache_.stats()["evictions"] == 1
+
+        # A new process picks up the files already on disk
+        reloaded = HeadshotCache(root=str(tmp_path), source_url="https://origin.test/{golfer_id}", max_bytes=1500, sizes=[])
+        await reloaded.startup(transport=httpx.MockTransport(handler))
+        assert (await reloaded.get("c")).etag == cache_.etag("c")
+        assert calls == ["/a", "/b", "/c"]
+        await reloaded.shutdown()
+    finally:
+        await cache_.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_headshot_resizing_snaps_to_configured_widths(tmp_path):
+    import io
+
+    from PIL import Image
+
+    from app.services.headshot_cache import HeadshotCache, resize
+
+    buf = io.BytesIO()
+    Image.new("RGB", (400, 500), "red").save(buf, format="JPEG")
+    small = resize(buf.getvalue(), 96)
+    assert Image.open(io.BytesIO(small)).size == (96, 120)
+    assert resize(small, 192) is None
+    cache_ = HeadshotCache(root=str(tmp_path), source_url="", max_bytes=1, sizes=[48, 96, 192])
+    assert [cache_.width_for(w) for w in (None, 10, 48, 50, 500)] == [None, 48, 48, 96, None]
+
+    # The proxy stores the resized variant next to the original
+    cache_ = HeadshotCache(root=str(tmp_path), source_url="https://origin.test/{golfer_id}", max_bytes=10**6, sizes=[96])
+    origin = httpx.MockTransport(lambda request: httpx.Response(200, content=buf.getvalue(), headers={"content-type": "image/jpeg"}))
+    await cache_.startup(transport=origin)
+    try:
+        variant = await cache_.get("g1", 90)
+    finally:
+        await cache_.shutdown()
+    assert Image.open(io.BytesIO(variant.body)).size == (96, 120)
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["g1-96", "g1-orig"]
+    assert cache_.stats()["resized"] == 1
@@ -0,0 +1,35 @@
+-- =========================
+-- Keyset pagination indexes
+-- =========================
+-- List resolvers page by (sort key, id) with a row comparison against the
+-- previous page's last row (see Backend/app/graphql/pagination.py). Each
+-- supported sort gets a composite btree so pages are an index range scan at
+-- any depth. NOT NULL sort keys are ordered without a NULLS clause, so
+-- descending pages use a backward scan of the same index. published_at is
+-- nullable and sorts NULLS LAST in both directions; a backward scan would
+-- put NULLs first, so it has one index per direction.
+
+-- Posts (lists always filter is_deleted = FALSE)
+CREATE INDEX IF NOT EXISTS idx_posts_keyset_created_at ON website_content.posts(created_at, id) WHERE is_deleted = FALSE;
+CREATE INDEX IF NOT EXISTS idx_posts_keyset_updated_at ON website_content.posts(updated_at, id) WHERE is_deleted = FALSE;
+CREATE INDEX IF NOT EXISTS idx_posts_keyset_published_at ON website_content.posts(published_at, id) WHERE is_deleted = FALSE;
+CREATE INDEX IF NOT EXISTS idx_posts_keyset_published_at_desc ON website_content.posts(published_at DESC NULLS LAST, id DESC) WHERE is_deleted = FALSE;
+CREATE INDEX IF NOT EXISTS idx_posts_keyset_title ON website_content.posts(title, id) WHERE is_deleted = FALSE;
+
+-- Pages
+CREATE INDEX IF NOT EXISTS idx_pages_keyset_created_at ON website_content.pages(created_at, id) WHERE is_deleted = FALSE;
+CREATE INDEX IF NOT EXISTS idx_pages_keyset_updated_at ON website_content.pages(updated_at, id) WHERE is_deleted = FALSE;
+CREATE INDEX IF NOT EXISTS idx_pages_keyset_published_at ON website_content.pages(published_at, id) WHERE is_deleted = FALSE;
+CREATE INDEX IF NOT EXISTS idx_pages_keyset_published_at_desc ON website_content.pages(published_at DESC NULLS LAST, id DESC) WHERE is_deleted = FALSE;
+CREATE INDEX IF NOT EXISTS idx_pages_keyset_title ON website_content.pages(title, id) WHERE is_deleted = FALSE;
+
+-- Templates
+CREATE INDEX IF NOT EXISTS idx_templates_keyset_created_at ON website_content.templates(created_at, id);
+CREATE INDEX IF NOT EXISTS idx_templates_keyset_updated_at ON website_content.templates(updated_at, id);
+CREATE INDEX IF NOT EXISTS idx_templates_keyset_name ON website_content.templates(name, id);
+
+-- Products
+CREATE INDEX IF NOT EXISTS idx_products_keyset_created_at ON website_content.products(created_at, id);
+CREATE INDEX IF NOT EXISTS idx_products_keyset_updated_at ON website_content.products(updated_at, id);
+CREATE INDEX IF NOT EXISTS idx_products_keyset_name ON website_content.products(name, id);
+CREATE INDEX IF NOT EXISTS idx_products_keyset_price_cents ON website_content.products(price_cents, id);